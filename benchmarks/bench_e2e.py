@@ -0,0 +1,252 @@
+"""
+End-to-end audits of synthetic repositories, offline.
+
+    python benchmarks/bench_e2e.py --commits 10 1000 100000 --pages 50
+    python benchmarks/bench_e2e.py --commits 1000 --save-baseline
+    python benchmarks/bench_e2e.py --commits 1000 --threshold 0.2
+
+Each scenario builds a local git repo (git fast-import) and a PDF report, then runs
+forensic_app through audit_repository `--runs` times against the same scratch caches:
+run 1 is cold (empty mirror, AST, PDF and ledger caches), later runs are warm. The result
+store is pointed at the scratch directory and never serves a run, so every run executes
+the whole graph. Before any scenario runs, an incremental audit after a one-file change is
+asserted equal (evidences and opinions) to a cold audit of the same HEAD.
+Per run it reports total latency, wall time per graph node, peak RSS of this process
+and of git children, and, with --trace-alloc, tracemalloc allocations per node.
+
+Every run is appended to benchmarks/results/history.json. --save-baseline stores the
+runs as the baseline; otherwise they are compared against it, and any total or node
+time slower than the baseline by more than --threshold is reported as a regression
+(exit status 1).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+RESULTS = ROOT / "benchmarks" / "results"
+
+CACHE_ENV = {
+    "FORENSIC_MIRROR_DIR": "mirrors",
+    "FORENSIC_AST_CACHE_DIR": "ast",
+    "FORENSIC_PDF_CACHE_DIR": "pdf",
+    "FORENSIC_LEDGER_DIR": "ledgers",
+    "FORENSIC_RESULT_DB": "results.db",
+}
+# Node timings below this many milliseconds are too noisy to call a regression.
+NOISE_FLOOR_MS = 5.0
+
+def peak_rss_mb() -> Dict[str, float]:
+    """ru_maxrss is KiB on Linux and bytes on macOS; both are process-lifetime high-water marks."""
+    scale = 1 if sys.platform == "darwin" else 1024
+    self_ = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    return {"self": round(self_ / 2**20, 1), "children": round(children / 2**20, 1)}
+
+def git_version() -> str:
+    try:
+        return subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return "unknown"
+
+def run_scenario(args, tmp: str, commits: int) -> List[Dict[str, Any]]:
+    from synthetic import write_synthetic_pdf, write_synthetic_repo
+    from src.core.graph import forensic_app
+    from src.core.instrumentation import summarize_timings
+    from src.core.runner import audit_repository
+
+    scenario = f"commits={commits},files={args.files},file_size={args.file_size},pages={args.pages}"
+    base = os.path.join(tmp, f"c{commits}")
+    started = time.perf_counter()
+    repo = write_synthetic_repo(os.path.join(base, "repo"), commits, args.files, args.file_size, seed=args.seed)
+    pdf = write_synthetic_pdf(os.path.join(base, "report.pdf"), args.pages, seed=args.seed) if args.pages else None
+    print(f"🧪 {scenario}: fixtures built in {time.perf_counter() - started:.2f}s")
+
+    # Fresh caches per scenario: the first run is cold, the rest replay them warm.
+    for var, name in CACHE_ENV.items():
+        os.environ[var] = os.path.join(base, "cache", name)
+    _reset_cache_singletons()
+
+    runs = []
+    for n in range(1, args.runs + 1):
+        if args.trace_alloc:
+            tracemalloc.start()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext():
+            final_state = audit_repository(repo, pdf, app=forensic_app)
+        total_s = time.perf_counter() - started
+        if args.trace_alloc:
+            tracemalloc.stop()
+        runs.append({
+            "scenario": scenario,
+            "run": "cold" if n == 1 else "warm",
+            "iteration": n,
+            "total_s": round(total_s, 4),
+            "nodes": summarize_timings(final_state.get("node_timings", [])),
+            "peak_rss_mb": peak_rss_mb(),
+            "score": final_state.get("aggregated_score"),
+        })
+    return runs
+
+def assert_incremental_matches_cold(args, tmp: str) -> Dict[str, Any]:
+    """
+    The incremental audit's contract: its final state is what a cold audit of the same HEAD
+    returns. Audits a synthetic repository, commits one new module, re-audits HEAD
+    incrementally, then audits that HEAD cold (FORENSIC_INCREMENTAL=0, empty caches) and
+    asserts that evidences and opinions are equal.
+    """
+    from synthetic import commit_synthetic_file, synthetic_module, write_synthetic_pdf, write_synthetic_repo
+    from src.core.graph import forensic_app
+    from src.core.progress import to_jsonable
+    from src.core.runner import audit_repository
+
+    base = os.path.join(tmp, "equivalence")
+    repo = write_synthetic_repo(os.path.join(base, "repo"), min(args.commits), args.files, args.file_size, seed=args.seed)
+    pdf = write_synthetic_pdf(os.path.join(base, "report.pdf"), args.pages, seed=args.seed) if args.pages else None
+
+    def audit(caches: str) -> Dict[str, Any]:
+        for var, name in CACHE_ENV.items():
+            os.environ[var] = os.path.join(base, caches, name)
+        _reset_cache_singletons()
+        with contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext():
+            return audit_repository(repo, pdf, app=forensic_app)
+
+    audit("warm")
+    last = int(subprocess.run(["git", "-C", repo, "log", "-1", "--format=%ct"], capture_output=True, text=True).stdout)
+    # A new blob (the only AST cache miss) that sorts ahead of most modules and carries a
+    # model and a reducer, so any order that depends on what was cached shows up in the findings.
+    added = synthetic_module(4 * args.files, args.file_size)  # index % 4 == 0: a 'state' module
+    commit_synthetic_file(repo, "src/pkg_0/added_state.py", added, last + 3600)
+    incremental = audit("warm")
+    os.environ["FORENSIC_INCREMENTAL"] = "0"
+    try:
+        cold = audit("cold")
+    finally:
+        del os.environ["FORENSIC_INCREMENTAL"]
+
+    assert incremental["reuse"]["mode"] == "incremental", f"second audit was not incremental: {incremental['reuse']}"
+    for key in ("evidences", "opinions"):
+        now, ref = to_jsonable(incremental[key]), to_jsonable(cold[key])
+        assert now == ref, f"incremental {key} differ from a cold audit of the same HEAD:\n{now}\n!=\n{ref}"
+    print(f"✅ Incremental audit after a one-file change equals a cold audit of {incremental['reuse']['head'][:10]} "
+          f"({incremental['reuse']['criteria_reused']} criteria and {incremental['reuse']['judges_reused']} judges reused)")
+    return incremental["reuse"]
+
+def _reset_cache_singletons():
+    """The process-wide caches read their directories from the environment when built."""
+    from src.core import incremental
+    from src.infrastructure import clone_cache, result_store
+    from src.utils import pdf_cache
+    clone_cache.mirror_cache.__init__()
+    incremental.ledger_store.__init__()
+    pdf_cache.pdf_cache.__init__()
+    result_store.result_store.close()
+    result_store.result_store.__init__()
+
+def print_run(run: Dict[str, Any]):
+    rss = run["peak_rss_mb"]
+    print(f"   {run['run']:>4} #{run['iteration']}: {run['total_s']:.3f}s total, "
+          f"peak RSS {rss['self']} MiB (git children {rss['children']} MiB), score {run['score']}")
+    for node, stats in sorted(run["nodes"].items(), key=lambda kv: -kv[1]["wall_ms"]):
+        alloc = ""
+        if "alloc_kb" in stats:
+            alloc = f" {stats['alloc_kb']:>10.1f} KiB alloc {stats['traced_peak_kb']:>10.1f} KiB traced peak"
+        print(f"      {node:<18} {stats['wall_ms']:>10.1f} ms wall {stats['cpu_ms']:>10.1f} ms cpu{alloc}")
+
+def compare(runs: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    regressions = []
+    for run in runs:
+        key = f"{run['scenario']}|{run['run']}"
+        ref = baseline.get("runs", {}).get(key)
+        if not ref:
+            continue
+        checks = [("total", run["total_s"] * 1000, ref["total_s"] * 1000)]
+        checks += [(node, stats["wall_ms"], ref["nodes"].get(node, {}).get("wall_ms"))
+                   for node, stats in run["nodes"].items()]
+        for label, now, before in checks:
+            if before is None or now - before < NOISE_FLOOR_MS:
+                continue
+            if now > before * (1 + threshold):
+                regressions.append(f"{key} {label}: {before:.1f} ms -> {now:.1f} ms (+{100 * (now / before - 1):.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--file-size", type=int, default=2000, help="approximate bytes per Python file")
+    parser.add_argument("--pages", type=int, default=50, help="PDF pages (0 audits without a report)")
+    parser.add_argument("--runs", type=int, default=2, help="audits per scenario; run 1 is cold")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-alloc", action="store_true", help="tracemalloc allocations per node (slower)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown flagged as a regression")
+    parser.add_argument("--baseline", default=str(RESULTS / "baseline.json"))
+    parser.add_argument("--history", default=str(RESULTS / "history.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="keep the swarm's own console output")
+    args = parser.parse_args()
+
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="bench_e2e_") as tmp:
+        # Node spans still go through the default exporter, just not into the user's cache.
+        os.environ["FORENSIC_TRACE_DIR"] = os.path.join(tmp, "traces")
+        # Every run must execute the graph: a stored result would replay an earlier run's node timings.
+        os.environ["FORENSIC_RESULT_CACHE"] = "0"
+        assert_incremental_matches_cold(args, tmp)
+        for commits in args.commits:
+            for run in run_scenario(args, tmp, commits):
+                print_run(run)
+                runs.append(run)
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git": git_version(),
+        "trace_alloc": args.trace_alloc,
+        "runs": runs,
+    }
+    history_path = Path(args.history)
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    history = json.loads(history_path.read_text()) if history_path.exists() else []
+    history.append(record)
+    history_path.write_text(json.dumps(history, indent=2))
+    print(f"📝 Appended {len(runs)} runs to {history_path}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        keyed = {f"{run['scenario']}|{run['run']}": run for run in runs}
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps({**record, "runs": keyed}, indent=2))
+        print(f"📌 Baseline saved to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print("ℹ️  No baseline yet; rerun with --save-baseline to record one.")
+        return
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("trace_alloc") != args.trace_alloc:
+        print("⚠️  Baseline and this run differ in --trace-alloc; tracemalloc slows every node.")
+    regressions = compare(runs, baseline, args.threshold)
+    if regressions:
+        print(f"🚨 {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+    print(f"✅ No regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+if __name__ == "__main__":
+    main()
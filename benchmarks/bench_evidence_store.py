@@ -0,0 +1,91 @@
+"""
+Evidence ledger merges under detective fan-out.
+
+    python benchmarks/bench_evidence_store.py --findings 10000 50000
+
+Three detectives file `findings` records in batches, then the aggregator re-files the
+whole ledger, as detective_node used to.
+  legacy - pydantic models dumped to dicts, dict.copy() + list.extend merges
+  store  - slotted records in the versioned EvidenceStore with (agent, criterion) upserts
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pydantic import BaseModel
+from src.core.state import merge_evidences
+from src.core.evidence_store import EvidenceStore
+
+AGENTS = ("repo_agent", "doc_agent", "vision_agent")
+
+class LegacyEvidence(BaseModel):
+    found: bool
+    criterion: str
+    rationale: str
+    metadata: Dict[str, Any] = {}
+
+def legacy_merge(existing: Dict[str, List[Any]], new: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+    merged = (existing or {}).copy()
+    for key, val in new.items():
+        if key in merged:
+            merged[key].extend(val)
+        else:
+            merged[key] = val
+    return merged
+
+def batches(findings: int, batch: int, legacy: bool):
+    for start in range(0, findings, batch):
+        agent = AGENTS[(start // batch) % len(AGENTS)]
+        items = []
+        for i in range(start, min(start + batch, findings)):
+            fields = {"found": i % 3 != 0, "criterion": f"criterion_{i}", "rationale": f"VERIFIED: synthetic finding {i}.",
+                      "metadata": {"line": i}}
+            items.append(LegacyEvidence(**fields).model_dump() if legacy else fields)
+        yield {agent: items}
+
+def run(findings: int, batch: int, legacy: bool, trace: bool):
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    ledger = {} if legacy else EvidenceStore()
+    first_version = None
+    for update in batches(findings, batch, legacy):
+        ledger = legacy_merge(ledger, update) if legacy else merge_evidences(ledger, update)
+        if first_version is None:
+            first_version = ledger
+            first_count = sum(len(v) for v in first_version.values())
+    # Aggregator pass: the old detective_node re-filed every finding.
+    refiled = {agent: list(ledger.get(agent, [])) for agent in AGENTS}
+    ledger = legacy_merge(ledger, refiled) if legacy else merge_evidences(ledger, refiled)
+    elapsed = time.perf_counter() - started
+    current = peak = 0
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    records = sum(len(v) for v in ledger.values())
+    aliased = sum(len(v) for v in first_version.values()) != first_count
+    return elapsed, current, peak, records, aliased
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--findings", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'findings':>9} {'variant':>7} {'seconds':>8} {'held MiB':>9} {'peak MiB':>9} {'records':>8} {'aliased':>8}")
+    for findings in args.findings:
+        for name, legacy in (("legacy", True), ("store", False)):
+            # Timed without tracemalloc, whose per-allocation hook would dominate the merge cost.
+            elapsed, _, _, records, aliased = run(findings, args.batch, legacy, trace=False)
+            _, current, peak, _, _ = run(findings, args.batch, legacy, trace=True)
+            print(f"{findings:>9} {name:>7} {elapsed:>8.3f} {current / 2**20:>9.1f} {peak / 2**20:>9.1f} "
+                  f"{records:>8} {str(aliased):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Judge-phase cost as the evidence ledger grows.
+
+    python benchmarks/bench_judges.py --findings 10 100 1000 5000
+
+  legacy - the three judges' original str(finding).lower() substring scans
+  index  - build_feature_index once (aggregator) ...
+  judges - ... then prosecutor, defense and tech lead reading the index
+"""
+import argparse
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.core.features import build_feature_index
+from src.agents.judges.prosecutor import prosecutor
+from src.agents.judges.defense import defense_node
+from src.agents.judges.Tech_lead import tech_lead_node
+from synthetic import timed
+
+def synthetic_evidences(extra: int):
+    """The four real repo findings plus `extra` filler findings spread across agents."""
+    repo = [
+        {"found": True, "criterion": "git", "rationale": "VERIFIED: Captured 42 commits.",
+         "metadata": {"total_commits": 42, "active_days": 9, "bulk_upload": False}},
+        {"found": True, "criterion": "state", "rationale": "VERIFIED: AST Scan confirmed 'BaseModel'.",
+         "metadata": {"models": ["src/core/state.py:Evidence"], "reducers": ["src/core/state.py:opinions=operator.add"]}},
+        {"found": True, "criterion": "graph", "rationale": "VERIFIED: 'StateGraph' builder detected.",
+         "metadata": {"graph_files": ["src/core/graph.py"], "nodes": ["a", "b"], "edges": 2}},
+        {"found": True, "criterion": "security", "rationale": "VERIFIED: Code uses tempfile.TemporaryDirectory().",
+         "metadata": {"sandbox_files": ["src/core/runner.py"], "try_blocks": 12}},
+    ]
+    filler = [{"found": i % 2 == 0, "criterion": f"check_{i}", "rationale": f"Synthetic finding {i} " + "x" * 200,
+               "metadata": {"path": f"src/module_{i}.py", "line": i}} for i in range(extra)]
+    return {
+        "repo_agent": repo + filler[: extra // 2],
+        "doc_agent": [{"found": True, "goal": "Theoretical Depth", "rationale": "VERIFIED"}] + filler[extra // 2:],
+        "vision_agent": [{"found": True, "goal": "Graph Orchestration", "rationale": "VERIFIED: Parallel Fan-Out confirmed."}],
+    }
+
+def legacy_scans(evidences):
+    """The substring checks the judges used to run on every call."""
+    repo, vision, docs = evidences["repo_agent"], evidences["vision_agent"], evidences["doc_agent"]
+    return (
+        any("pydantic" in str(f).lower() or "basemodel" in str(f).lower() for f in repo),
+        any("parallel" in str(f).lower() or "fan-out" in str(f).lower() for f in vision),
+        any(f.get("found") for f in docs),
+        any("ast" in str(f).lower() or "parsing" in str(f).lower() for f in repo),
+        any("dictionary" in str(f).lower() and "basemodel" not in str(f).lower() for f in repo),
+        any("temp_dir" in str(f).lower() or "tempfile" in str(f).lower() for f in repo),
+        any("try" in str(f).lower() or "except" in str(f).lower() for f in repo),
+        # Worst case: a check that never matches walks and stringifies the whole ledger.
+        any("bulk-upload-marker" in str(f).lower() for f in repo + docs),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--findings", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'findings':>9} {'legacy ms':>10} {'index ms':>9} {'judges ms':>10}")
+    for extra in args.findings:
+        evidences = synthetic_evidences(extra)
+        state = {"evidences": evidences, "features": build_feature_index(evidences)}
+
+        def run_judges():
+            with contextlib.redirect_stdout(io.StringIO()):
+                prosecutor(state)
+                defense_node(state)
+                tech_lead_node(state)
+
+        legacy = timed(lambda: legacy_scans(evidences), args.repeat)
+        index = timed(lambda: build_feature_index(evidences), args.repeat)
+        judges = timed(run_judges, args.repeat)
+        print(f"{extra + 6:>9} {legacy * 1000:>10.2f} {index * 1000:>9.2f} {judges * 1000:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Streaming chunker vs the original semantic_pdf_ingestion.
+
+    python benchmarks/bench_pdf_chunker.py --pages 250 500 1000
+
+For each document size it reports wall time and tracemalloc peak for:
+  legacy  - pypdf extraction, full_text += per page, current_chunk += per section
+  cold    - iter_pdf_chunks with an empty PDF cache (includes extraction)
+  warm    - iter_pdf_chunks served from the PDF cache
+Chunks are consumed one at a time, as a streaming caller would.
+
+Before timing, every document is chunked both ways and the chunks are asserted equal, one
+for one (both read the same pypdf page text). The legacy loop also appends an empty chunk
+whenever a section alone fills chunk_size (and one at the very start); the streaming chunker
+never yields empty chunks, so those are the only entries left out of the comparison.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+def legacy_semantic_pdf_ingestion(pdf_path: str, chunk_size: int = 1500):
+    """The pre-streaming implementation, kept verbatim for comparison."""
+    from pypdf import PdfReader
+    reader = PdfReader(pdf_path)
+    full_text = ""
+    for page in reader.pages:
+        full_text += page.extract_text() + "\n"
+    raw_chunks = full_text.split("\n\n")
+    chunks = []
+    current_chunk = ""
+    for section in raw_chunks:
+        if len(current_chunk) + len(section) < chunk_size:
+            current_chunk += section + "\n\n"
+        else:
+            chunks.append(current_chunk.strip())
+            current_chunk = section + "\n\n"
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+def assert_same_chunks(pdf_path: str, chunk_size: int):
+    """The streaming chunker must reproduce the legacy chunks exactly, less its empty ones."""
+    from src.utils.pdf_engine import semantic_pdf_ingestion
+    legacy = [chunk for chunk in legacy_semantic_pdf_ingestion(pdf_path, chunk_size) if chunk]
+    streamed = semantic_pdf_ingestion(pdf_path, chunk_size)
+    for index, (old, new) in enumerate(zip(legacy, streamed)):
+        assert old == new, f"chunk {index} differs: {old[:80]!r} != {new[:80]!r}"
+    assert len(legacy) == len(streamed), f"{len(legacy)} legacy chunks vs {len(streamed)} streamed"
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--chunk-size", type=int, default=1500)
+    parser.add_argument("--overlap", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_pdf_") as tmp:
+        os.environ["FORENSIC_PDF_CACHE_DIR"] = os.path.join(tmp, "cache")
+        from synthetic import write_synthetic_pdf
+        from src.utils.pdf_cache import pdf_cache
+        from src.utils.pdf_engine import iter_pdf_chunks
+        import pypdf  # keep the one-time import out of the first measurement
+
+        def stream(path):
+            return lambda: sum(1 for _ in iter_pdf_chunks(path, chunk_size=args.chunk_size, overlap=args.overlap))
+
+        print(f"{'pages':>6} {'variant':>8} {'seconds':>9} {'ms/page':>8} {'peak KiB':>9} {'chunks':>7}")
+        for pages in args.pages:
+            pdf = write_synthetic_pdf(os.path.join(tmp, f"doc_{pages}.pdf"), pages)
+            if args.overlap == 0:
+                assert_same_chunks(pdf, args.chunk_size)
+                shutil.rmtree(pdf_cache.root, ignore_errors=True)  # the timed 'cold' run starts empty
+            variants = [
+                ("legacy", lambda: len(legacy_semantic_pdf_ingestion(pdf, args.chunk_size))),
+                ("cold", stream(pdf)),
+                ("warm", stream(pdf)),
+            ]
+            for name, fn in variants:
+                elapsed, peak, count = measure(fn)
+                print(f"{pages:>6} {name:>8} {elapsed:>9.3f} {1000 * elapsed / pages:>8.3f} {peak // 1024:>9} {count:>7}")
+
+if __name__ == "__main__":
+    main()
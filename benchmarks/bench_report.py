@@ -0,0 +1,186 @@
+"""
+Report rendering cost as the opinion ledger grows.
+
+    python benchmarks/bench_report.py --opinions 100 1000 5000 20000
+
+  legacy - main.generate_professional_markdown as it was before ReportModel (kept verbatim
+           below): every ledger row and recommendation re-filters the whole opinion list,
+           and the report is built by repeated `md +=`
+  new    - the same job today, state in, Markdown out: render(state, "md")
+  group  - of which ReportModel: opinions and findings grouped by criterion in one pass
+  md / html / json - rendering the grouped model
+  write  - all three formats streamed to disk and renamed into place
+Both Markdown paths get the same state, node timings included, so `legacy` and `new` are
+like for like.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.core.evidence_store import EvidenceStore, Opinion, OpinionStore
+from src.core.instrumentation import summarize_timings
+from src.utils.formatters import RENDERERS, ReportModel, render, with_format, write_report
+from synthetic import timed
+
+CRITERIA = ["Git Forensic", "State Rigor", "Graph Orchestration", "Documentation", "General", "Theoretical Depth"]
+JUDGES = ["Prosecutor", "Defense", "TechLead"]
+NODES = ["context_builder", "dispatcher", "repo_detective", "docs_detective", "vision_detective", "aggregator",
+         "prosecutor", "defense", "tech_lead", "chief_justice", "report_generator"]
+
+def synthetic_state(opinions: int, seed: int = 0):
+    """`opinions` judicial opinions spread over the rubric's criteria, plus one finding per three opinions."""
+    rng = random.Random(seed)
+    ops = [Opinion(JUDGES[i % 3], rng.choice(CRITERIA), rng.uniform(0, 5),
+                   f"[{i}] " + rng.choice(["VERIFIED: reducers present.", "CHARGE: no sandboxing.", "0 commits seen."])
+                   + " " + "x" * 120, f"statute_{i}") for i in range(opinions)]
+    findings = [{"found": i % 2 == 0, "criterion": f"{rng.choice(CRITERIA)}:{i}", "rationale": "r" * 80}
+                for i in range(opinions // 3)]
+    timings = [{"node": node, "wall_ms": rng.uniform(1, 900), "cpu_ms": rng.uniform(1, 500), "rss_growth_kb": rng.uniform(0, 4096),
+                "evidences_in": i, "evidences_out": 1, "opinions_out": 0} for i, node in enumerate(NODES)]
+    return {"repo_url": "https://github.com/example/target", "pdf_path": "report.pdf", "aggregated_score": 3.4,
+            "global_verdict": "PASS", "commit_count": 42, "opinions": OpinionStore(ops), "node_timings": timings,
+            "evidences": EvidenceStore({"repo_agent": findings, "doc_agent": [{"found": True, "goal": "Docs", "rationale": "ok"}]})}
+
+# --- The renderer before ReportModel, verbatim from main.py and src/core/instrumentation.py
+# (only the two function names are prefixed with 'legacy_'). ---
+def legacy_timing_appendix(timings: Iterable[Dict[str, Any]]) -> str:
+    """Markdown table of a run's node timings, slowest first, for the end of the audit report."""
+    summary = summarize_timings(timings)
+    if not summary:
+        return ""
+    md = "## ⏱️ Appendix: Node Timings\n\n"
+    md += "| Node | Calls | Wall (ms) | CPU (ms) | Peak RSS growth (KiB) | Evidence in → out | Opinions out |\n"
+    md += "| :--- | ---: | ---: | ---: | ---: | :---: | ---: |\n"
+    for node, stats in sorted(summary.items(), key=lambda kv: -kv[1]["wall_ms"]):
+        md += (f"| {node} | {stats['calls']} | {stats['wall_ms']:.1f} | {stats['cpu_ms']:.1f} | "
+               f"{stats['rss_growth_kb']:.0f} | {stats['evidences_in']} → {stats['evidences_out']} | "
+               f"{stats['opinions_out']} |\n")
+    total = sum(stats["wall_ms"] for stats in summary.values())
+    md += f"\n*Node wall times sum to {total:.1f} ms; parallel nodes overlap, so the audit itself took less.*\n\n"
+    return md
+
+def legacy_markdown(state: Dict[str, Any]) -> str:
+    """
+    Automaton Auditor - Final Audit Report
+    Final Standard: Sovereign Swarm v2.0 (2026)
+    """
+    score = state.get("aggregated_score", 0.0)
+    # Pulling dynamic links from state (injected from .env)
+    repo_url = state.get("repo_url", "Internal Source")
+    pdf_link = state.get("pdf_path", "#") 
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    opinions = state.get("opinions", [])
+    evidences = state.get("evidences", {})
+
+    md = f"# Automaton Auditor - Final Audit Report\n\n"
+    md += f"**Generated:** {timestamp} | **Overall Score:** {score:.2f} / 5.00\n\n"
+    
+    # --- 1. EXECUTIVE SUMMARY ---
+    md += "## 1. Executive Summary\n"
+    md += f"Audit of **[{repo_url.split('/')[-1]}]({repo_url})**. Forensic scan confirms 51 commits and AST state-tracking.\n\n"
+    
+    md += "### 📍 Forensic Artifacts\n"
+    md += f"* **Source Code:** [GitHub Repository]({repo_url})\n"
+    
+    # Dynamic Doc Status check
+    has_docs = evidences.get("doc_agent") and any(f.get("found") for f in evidences.get("doc_agent", []))
+    if has_docs:
+        md += f"* **Design Document:** [Verified PDF Artifact]({pdf_link})\n"
+        md += "* **Status:** ✅ **Verified against Intent**\n\n"
+    else:
+        md += f"* **Design Document:** ❌ [Missing/Pending]({pdf_link})\n"
+        md += "* **Status:** ⚠️ **Documentation Gap Detected**\n\n"
+
+    # --- 2. 10-POINT CRITERION BREAKDOWN ---
+    md += "## 2. 🏛️ 10-Point Forensic Ledger\n\n"
+    
+    rubric_map = [
+        ("Git Forensic", "1. Engineering Chronology", "RepoAgent"),
+        ("Git Forensic", "2. Iterative Narrative", "RepoAgent"),
+        ("State Rigor", "3. State Management", "RepoAgent/AST"),
+        ("State Rigor", "4. Reducer Logic", "RepoAgent/AST"),
+        ("Graph Orchestration", "5. Graph Connectivity", "VisionAgent"),
+        ("Graph Orchestration", "6. Parallel Execution", "VisionAgent"),
+        ("Documentation", "7. Technical Depth", "DocAgent"),
+        ("Documentation", "8. Design Alignment", "DocAgent"),
+        ("General", "9. Security Hygiene", "TechLead"),
+        ("General", "10. Swarm Resilience", "TechLead")
+    ]
+
+    for i, (internal_key, display_name, source_agent) in enumerate(rubric_map, 1):
+        crit_ops = [op for op in opinions if getattr(op, 'criterion', '') == internal_key]
+        
+        # TechLead Fallback for Security/Resilience
+        if not crit_ops and internal_key == "General":
+            crit_ops = [op for op in opinions if getattr(op, 'criterion', '') == "General"]
+
+        scores = [getattr(op, 'score', 0.0) for op in crit_ops]
+        avg_item_score = sum(scores) / len(scores) if scores else 0.0
+        status_emoji = "✅" if avg_item_score >= 3.5 else "⚠️" if avg_item_score >= 2.0 else "❌"
+
+        md += f"### {display_name} [Source: {source_agent}]\n"
+        md += f"**Item Score:** `{avg_item_score:.1f}/5` | **Status:** {status_emoji}\n\n"
+        
+        md += "| Judge | Dialectical Argument & Actionable Advice |\n"
+        md += "| :--- | :--- |\n"
+        for op in crit_ops:
+            md += f"| {getattr(op, 'judge', 'Judge')} | {getattr(op, 'argument', 'N/A')} |\n"
+        md += "\n---\n"
+
+    # --- 3. STRATEGIC RECOMMENDATIONS ---
+    md += "## 🚀 3. Strategic Recommendations for Score Elevation\n"
+    recs = []
+    
+    actual_commits = state.get("commit_count", 0)
+    if any("0 commits" in getattr(op, 'argument', '') for op in opinions) and actual_commits > 22:
+        recs.append(f"**Data Pipeline Audit:** Prosecutor missed the **{actual_commits}** commits. Check state reducer.")
+    
+    if any("sandboxing" in getattr(op, 'argument', '').lower() for op in opinions):
+        recs.append("**Mandatory Sandboxing:** Ensure environment variables point to ephemeral directories.")
+
+    if not has_docs:
+        recs.append(f"**Documentation Linkage:** Ensure `TARGET_PDF_LINK` in .env is a valid, reachable URL.")
+
+    for idx, rec in enumerate(recs, 1):
+        md += f"{idx}. {rec}\n"
+
+    # --- 4. TIMING APPENDIX ---
+    appendix = legacy_timing_appendix(state.get("node_timings", []))
+    if appendix:
+        md += "\n---\n" + appendix
+
+    md += "\n---\n*Generated by Gemini Sovereign Swarm v2.0 - Judicial Grade*"
+    return md
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--opinions", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'opinions':>9} {'legacy ms':>10} {'new ms':>8} {'group ms':>9} {'md ms':>8} {'html ms':>8} {'json ms':>8} "
+          f"{'write ms':>9} {'md KiB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "report.md")
+        for count in args.opinions:
+            state = synthetic_state(count)
+            model = ReportModel(state)
+            renders = {fmt: timed(lambda: "".join(renderer(model)), args.repeat) for fmt, renderer in RENDERERS.items()}
+            legacy = timed(lambda: legacy_markdown(state), args.repeat)
+            new = timed(lambda: render(state, "md"), args.repeat)
+            group = timed(lambda: ReportModel(state), args.repeat)
+            write = timed(lambda: [write_report(model, with_format(target, fmt), fmt) for fmt in RENDERERS], args.repeat)
+            size = os.path.getsize(target) / 1024
+            print(f"{count:>9} {legacy * 1000:>10.2f} {new * 1000:>8.2f} {group * 1000:>9.2f} {renders['md'] * 1000:>8.2f} "
+                  f"{renders['html'] * 1000:>8.2f} {renders['json'] * 1000:>8.2f} {write * 1000:>9.2f} {size:>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Cold-start import time for the entry points and every graph node module.
+
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --top 10 --budget-ms 750
+
+Each target is imported in a fresh interpreter (`--repeat` times, median reported), so
+nothing is shared through sys.modules. 'graph compile' also builds forensic_app, which is
+the one-off cost the first audit in a process pays. --top prints the heaviest modules
+from `python -X importtime` for each target. With --budget-ms, the entry points (main,
+server, graph) must import under the budget or the script exits 1.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = [
+    ("main", "import main"),
+    ("server", "import server"),
+    ("graph", "import src.core.graph"),
+]
+NODE_MODULES = [
+    ("context_builder", "import src.core.context_builder"),
+    ("dispatcher", "import src.core.dispatcher"),
+    ("repo_detective", "import src.agents.detectives.repo"),
+    ("docs_detective", "import src.agents.detectives.docs"),
+    ("vision_detective", "import src.agents.detectives.vision"),
+    ("aggregator", "import src.nodes.detective"),
+    ("prosecutor", "import src.agents.judges.prosecutor"),
+    ("defense", "import src.agents.judges.defense"),
+    ("tech_lead", "import src.agents.judges.tech_lead"),
+    ("chief_justice", "import src.agents.justice.chief_justice"),
+    ("graph compile", "from src.core.graph import get_forensic_app; get_forensic_app()"),
+]
+
+PROBE = (
+    "import sys, time; sys.path[:0] = [{root!r}, {frontend!r}]; "
+    "t = time.perf_counter(); {stmt}; print(repr(time.perf_counter() - t))"
+)
+
+def run(stmt: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    code = PROBE.format(root=str(ROOT), frontend=str(ROOT / "frontend"), stmt=stmt)
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, capture_output=True, text=True)
+
+def measure(stmt: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        proc = run(stmt)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{stmt!r} failed:\n{proc.stderr.strip()}")
+        samples.append(float(proc.stdout.strip().splitlines()[-1]) * 1000)
+    return statistics.median(samples)
+
+def heaviest(stmt: str, top: int) -> List[Tuple[int, str]]:
+    """Modules by cumulative import time (microseconds), as reported by -X importtime."""
+    rows = []
+    for line in run(stmt, importtime=True).stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="show the N heaviest imports per target")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail when an entry point imports slower")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'target':>18} {'median ms':>10}")
+    for group, targets in (("entry points", ENTRY_POINTS), ("node modules", NODE_MODULES)):
+        print(f"--- {group}")
+        for name, stmt in targets:
+            ms = measure(stmt, args.repeat)
+            print(f"{name:>18} {ms:>10.1f}")
+            if args.budget_ms is not None and group == "entry points" and ms > args.budget_ms:
+                over_budget.append(f"{name}: {ms:.1f} ms > {args.budget_ms:.0f} ms")
+            for cumulative, module in heaviest(stmt, args.top):
+                print(f"{'':>18} {cumulative / 1000:>10.1f}  {module}")
+
+    if over_budget:
+        print("🚨 Over the startup budget: " + "; ".join(over_budget))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Synthetic fixtures for the benchmarks, and the best-of-N timer they share.
+Nothing here touches the network or needs a PDF library: documents are written by hand
+and repositories are streamed through `git fast-import`.
+"""
+import os
+import random
+import subprocess
+import time
+from typing import Callable, List
+
+WORDS = ("swarm detective judge evidence state graph reducer rubric audit sandbox parallel "
+         "synthesis orchestration chronology forensic verdict node edge commit ledger").split()
+THEORY = ["Metacognition", "Dialectical Synthesis", "Fan-In", "State Synchronization"]
+PATHS = ["src/core/state.py", "src/core/graph.py", "src/agents/detectives/repo.py", "src/tools/ghost_module.py"]
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def synthetic_page_lines(page_no: int, lines: int = 40, seed: int = 0) -> List[str]:
+    rng = random.Random(seed * 100003 + page_no)
+    out = []
+    for i in range(lines):
+        words = [rng.choice(WORDS) for _ in range(12)]
+        if i % 9 == 0:
+            words.insert(rng.randrange(len(words)), rng.choice(THEORY))
+        if i % 13 == 0:
+            words.insert(rng.randrange(len(words)), rng.choice(PATHS))
+        out.append(" ".join(words).capitalize() + ".")
+    return out
+
+def write_synthetic_pdf(path: str, pages: int, lines_per_page: int = 40, seed: int = 0) -> str:
+    """
+    Minimal valid PDF 1.4: one Helvetica content stream per page, written page by page.
+    Object layout: 1 catalog, 2 page tree, 3 font, then (page, content) pairs.
+    """
+    offsets = {}
+    with open(path, "wb") as f:
+        def obj(num: int, body: bytes):
+            offsets[num] = f.tell()
+            f.write(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        for page_no in range(pages):
+            page_id, content_id = 4 + 2 * page_no, 5 + 2 * page_no
+            ops = ["BT", "/F1 9 Tf", "11 TL", "40 760 Td"]
+            for line in synthetic_page_lines(page_no, lines_per_page, seed):
+                ops.append(f"({_escape(line)}) Tj T*")
+            ops.append("ET")
+            stream = "\n".join(ops).encode("latin-1")
+            obj(content_id, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+            obj(page_id, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                         b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids = b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(pages))
+        obj(2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages)
+
+        xref_at = f.tell()
+        size = 4 + 2 * pages
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for num in range(1, size):
+            f.write(b"%010d 00000 n \n" % offsets[num])
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_at))
+    return path
+
+MODULE_KINDS = ("state", "graph", "tools", "plain")
+
+def synthetic_module(index: int, size: int) -> str:
+    """A Python module of roughly `size` bytes carrying the structures the detectives look for."""
+    kind = MODULE_KINDS[index % len(MODULE_KINDS)]
+    if kind == "state":
+        head = ("import operator\nfrom typing import Annotated, List\nfrom pydantic import BaseModel\n\n"
+                f"class Finding{index}(BaseModel):\n    found: bool\n    rationale: str\n\n"
+                f"class State{index}(BaseModel):\n    items: Annotated[List[str], operator.add]\n\n")
+    elif kind == "graph":
+        head = ("from langgraph.graph import StateGraph, END\n\n"
+                f"builder = StateGraph(dict)\nbuilder.add_node('scan_{index}', lambda s: s)\n"
+                f"builder.add_node('judge_{index}', lambda s: s)\nbuilder.add_edge('scan_{index}', 'judge_{index}')\n"
+                f"builder.add_edge('judge_{index}', END)\n\n")
+    elif kind == "tools":
+        head = ("import tempfile\n\n"
+                f"def sandbox_{index}(work):\n    with tempfile.TemporaryDirectory() as tmp:\n"
+                "        try:\n            return work(tmp)\n        except OSError:\n            return None\n\n")
+    else:
+        head = f"VALUE_{index} = {index}\n\n"
+    lines = [head]
+    total, k = len(head), 0
+    while total < size:
+        line = f"def helper_{index}_{k}(x):\n    return x + {k}\n\n"
+        lines.append(line)
+        total += len(line)
+        k += 1
+    return "".join(lines)
+
+def write_synthetic_repo(path: str, commits: int, files: int = 50, file_size: int = 2000, seed: int = 0) -> str:
+    """
+    Builds a local git repository through `git fast-import`, so even 100k commits take seconds.
+    The first commit adds every file; each later commit edits one to three of them.
+    Commits are spaced minutes to days apart, so the history reads as iterative work.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    subprocess.run(["git", "init", "-q", path], check=True)
+    proc = subprocess.Popen(["git", "-C", path, "fast-import", "--quiet"], stdin=subprocess.PIPE)
+    out = proc.stdin
+
+    def data(payload: bytes):
+        out.write(b"data %d\n" % len(payload))
+        out.write(payload)
+        out.write(b"\n")
+
+    paths = [f"src/pkg_{i % 10}/module_{i}.py" for i in range(files)]
+    contents = {p: synthetic_module(i, file_size) for i, p in enumerate(paths)}
+    timestamp = 1735689600  # 2025-01-01
+    for n in range(1, commits + 1):
+        timestamp += rng.randint(600, 172800)
+        author = f"Dev {rng.randint(1, 5)} <dev{rng.randint(1, 5)}@example.com> {timestamp} +0000"
+        out.write(b"commit refs/heads/main\nmark :%d\n" % n)
+        out.write(f"author {author}\ncommitter {author}\n".encode())
+        data(f"Commit {n}: iterate on the swarm".encode())
+        if n > 1:
+            out.write(b"from :%d\n" % (n - 1))
+        touched = paths if n == 1 else rng.sample(paths, min(len(paths), rng.randint(1, 3)))
+        for p in touched:
+            if n > 1:
+                contents[p] += f"# revision {n}\n"
+            out.write(f"M 100644 inline {p}\n".encode())
+            data(contents[p].encode())
+    out.close()
+    if proc.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+    subprocess.run(["git", "-C", path, "symbolic-ref", "HEAD", "refs/heads/main"], check=True)
+    subprocess.run(["git", "-C", path, "reset", "-q", "--hard"], check=True)
+    return path
+
+def commit_synthetic_file(repo: str, rel_path: str, content: str, timestamp: int) -> str:
+    """Adds (or overwrites) one file in a repository built by write_synthetic_repo and commits it."""
+    target = os.path.join(repo, rel_path.replace("/", os.sep))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(content)
+    env = {**os.environ, "GIT_AUTHOR_NAME": "Dev 1", "GIT_AUTHOR_EMAIL": "dev1@example.com",
+           "GIT_COMMITTER_NAME": "Dev 1", "GIT_COMMITTER_EMAIL": "dev1@example.com",
+           "GIT_AUTHOR_DATE": f"{timestamp} +0000", "GIT_COMMITTER_DATE": f"{timestamp} +0000"}
+    subprocess.run(["git", "-C", repo, "add", rel_path], check=True)
+    subprocess.run(["git", "-C", repo, "commit", "-q", "-m", f"Add {rel_path}"], check=True, env=env)
+    return subprocess.run(["git", "-C", repo, "rev-parse", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Best wall time of `repeat` calls to fn, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
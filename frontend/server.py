@@ -1,7 +1,5 @@
 import os
 import sys
-import uvicorn
-import tkinter as tk
 import tempfile
 import shutil
 import stat
@@ -9,11 +7,14 @@ import warnings
 import gc
 import time
 from pathlib import Path
-from tkinter import filedialog
-from fastapi import FastAPI, Request, Form, BackgroundTasks
-from fastapi.responses import HTMLResponse
+import threading
+import asyncio
+from contextlib import contextmanager
+import json
+from typing import Dict, Any, Optional
+from fastapi import FastAPI, Request, Form, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from jinja2 import Template
-from git import Repo  
 from pydantic import BaseModel
 
 # --- 1. CRITICAL: ROOT PATH INJECTION ---
@@ -31,25 +32,55 @@ os.environ["PYTHONPATH"] = project_root
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
 warnings.filterwarnings("ignore", category=SyntaxWarning)
 
-# --- 3. ENGINE INVOCATION (With Fallback) ---
-forensic_app = None
+# --- 3. ENGINE INVOCATION (Lazy, With Fallback) ---
+# Only the loader is imported here; LangGraph and the nodes load when the first audit runs.
 try:
     # Attempt to import from graph.py (LangGraph standard)
-    from src.core.graph import forensic_app
-    print("✅ System: Forensic Swarm Engine [Graph] initialized.")
+    from src.core.graph import GRAPH_VARIANTS, get_graph
+    print("✅ System: Forensic Swarm Engine [Graph] registered (variants compile on first use).")
 except ImportError:
     try:
         # Fallback to engine.py
-        from src.core.engine import forensic_app
+        from src.core import engine
+        GRAPH_VARIANTS = ("full",)
+        def get_graph(variant: str = "full"):
+            return engine.forensic_app
         print("✅ System: Forensic Swarm Engine [Engine] initialized.")
     except ImportError as e:
         print(f"❌ CRITICAL: Swarm Engine not found in src.core.graph or src.core.engine.")
         print(f"DEBUG: Search Path: {project_root}")
         sys.exit(1)
 
+from src.infrastructure.clone_cache import mirror_cache
+from src.infrastructure.snapshot import snapshot_local
+from src.infrastructure.jobs import AuditJob, AuditJobManager, QueueFullError
+from src.core.progress import to_jsonable
+from src.infrastructure.result_store import result_store
+from src.core.instrumentation import node_metrics
+from src.utils.formatters import render
+from src.infrastructure.observability import tracer
+from src.core.runner import audit_target, rejudge_evidence
+from src.utils.pdf_cache import pdf_cache
+from src.core.rubric_registry import RubricError, get_rubric, rubric_registry
+
 # --- 4. APP INITIALIZATION ---
 app = FastAPI(title="🛡️ SwarmAuditor v3.0 Emerald Suite")
 
+class AuditRequest(BaseModel):
+    repo_path: str
+    doc_path: Optional[str] = None
+    rubric_type: str = "forensic"
+    model_choice: str = "gpt-4o-mini"
+    # 'full', 'evidence' (detectives + aggregator) or 'rejudge' (judges over `evidences`)
+    variant: str = "full"
+    evidences: Optional[Dict[str, Any]] = None
+    # Rubric id from audit/rubrics/ (or 'constitution'); FORENSIC_RUBRIC when omitted
+    rubric_id: Optional[str] = None
+    # Local paths: also audit uncommitted and untracked files, not just the committed HEAD
+    include_dirty: bool = os.getenv("FORENSIC_SNAPSHOT_DIRTY", "0") == "1"
+    # Re-audit even when the result store already holds this commit under this rubric
+    refresh: bool = False
+
 # --- UTILITY: ROBUST CLEANUP PROTOCOL ---
 def robust_rmtree(path):
     """Securely reclaim disk space by handling Windows Read-Only Git files."""
@@ -152,7 +183,16 @@ HTML_TEMPLATE = """
         </aside>
 
         <section class="w-3/4 p-12 overflow-y-auto bg-slate-50">
-            {% if not results %}
+            {% if job_id %}
+            <div id="job-panel" class="max-w-5xl mx-auto">
+                <div class="h-full flex flex-col items-center justify-center text-emerald-900 py-24">
+                    <div class="text-8xl mb-6">⏳</div>
+                    <h3 class="text-2xl font-black uppercase tracking-widest">Swarm Deployed</h3>
+                    <p id="job-status" class="mt-4 text-sm font-bold opacity-70">Job {{ job_id }}: queued</p>
+                    <ul id="job-feed" class="trace-box mt-8 w-full space-y-1"></ul>
+                </div>
+            </div>
+            {% elif not results %}
             <div class="h-full flex flex-col items-center justify-center opacity-30 text-emerald-900">
                 <div class="text-8xl mb-6">🏛️</div>
                 <h3 class="text-2xl font-black uppercase tracking-widest">Awaiting Forensic Data</h3>
@@ -169,6 +209,31 @@ HTML_TEMPLATE = """
             const data = await response.json();
             if(data.path) document.getElementById('doc_path').value = data.path;
         }
+
+        {% if job_id %}
+        async function showReport(jobId) {
+            const report = await fetch(`/api/audits/${jobId}/report`);
+            document.getElementById('job-panel').innerHTML = await report.text();
+        }
+        function followJob(jobId) {
+            const feed = new EventSource(`/api/audits/${jobId}/events`);
+            const status = document.getElementById('job-status');
+            const log = document.getElementById('job-feed');
+            feed.addEventListener('node', (msg) => {
+                const e = JSON.parse(msg.data);
+                const found = Object.values(e.evidences || {}).flat().length;
+                const rulings = (e.opinions || []).length;
+                const item = document.createElement('li');
+                item.innerText = `✔ ${e.node} — ${e.elapsed_ms} ms` + (found ? ` · ${found} findings` : '') + (rulings ? ` · ${rulings} rulings` : '');
+                log.appendChild(item);
+                status.innerText = `Job ${jobId}: ${e.node} finished at ${(e.t_ms / 1000).toFixed(2)}s`;
+            });
+            const finish = () => { feed.close(); showReport(jobId); };
+            feed.addEventListener('done', finish);
+            feed.addEventListener('failed', finish);
+        }
+        followJob('{{ job_id }}');
+        {% endif %}
     </script>
 </body>
 </html>
@@ -176,114 +241,261 @@ HTML_TEMPLATE = """
 
 @app.get("/", response_class=HTMLResponse)
 async def welcome():
-    return Template(HTML_TEMPLATE).render(results=False)
+    return Template(HTML_TEMPLATE).render(results=False, job_id=None)
 
 @app.get("/browse-file")
 async def browse_file():
+    # Desktop-only picker: tkinter is loaded on demand so headless servers never import it
+    import tkinter as tk
+    from tkinter import filedialog
     root = tk.Tk(); root.withdraw(); root.attributes('-topmost', True)
     path = filedialog.askopenfilename(); root.destroy()
     return {"path": path}
 
+def clean_target(repo_path: str) -> str:
+    repo_path_clean = repo_path.strip()
+    # Security: Only strip dots if it's a local path, not a URL
+    if not repo_path_clean.startswith("http") and repo_path_clean.startswith("."):
+        repo_path_clean = repo_path_clean.lstrip("./\\")
+    return repo_path_clean
+
+def _is_remote(target: str) -> bool:
+    return target.startswith(("http", "git@"))
+
+def prepare_workspace(repo_path: str, temp_workspace: str, include_dirty: bool = False) -> str:
+    """
+    Materializes the audit target into the sandbox and returns the cleaned target label.
+    Local paths are snapshotted (committed HEAD, plus uncommitted files when include_dirty).
+    """
+    repo_path_clean = clean_target(repo_path)
+    if _is_remote(repo_path_clean):
+        print(f"📡 Remote Clone: {repo_path_clean}")
+        # Shared mirror cache: full history, but repeat audits only fetch new commits
+        mirror_cache.checkout(repo_path_clean, temp_workspace)
+    else:
+        print(f"📂 Local Scan: {repo_path_clean}")
+        snapshot_local(repo_path_clean, temp_workspace, include_dirty=include_dirty)
+    return repo_path_clean
+
+@contextmanager
+def _job_workspace(job: AuditJob, repo_path: str, include_dirty: bool = False):
+    """Yields (workspace, 1): a clone or snapshot of the target in a sandbox reclaimed afterwards."""
+    temp_workspace = tempfile.mkdtemp(prefix="swarm_audit_")
+    try:
+        job.publish({"event": "workspace", "status": "preparing"})
+        prepare_workspace(repo_path, temp_workspace, include_dirty=include_dirty)
+        yield temp_workspace, 1
+    finally:
+        try:
+            robust_rmtree(temp_workspace)
+        except Exception:
+            # Windows can hold git handles briefly; retry off the worker thread.
+            threading.Thread(target=forensic_cleanup_task, args=(temp_workspace,), daemon=True).start()
+
+def execute_audit(job: AuditJob, repo_path: str, doc_path: str = None, rubric_type: str = "forensic",
+                  model_choice: str = "gpt-4o-mini", variant: str = "full",
+                  evidences: Optional[Dict[str, Any]] = None, rubric_id: Optional[str] = None,
+                  include_dirty: bool = False, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Worker-side audit: clone/copy, stream the swarm, return the final state.
+    Runs on the job pool, never on the event loop; per-node progress goes to job.events.
+    variant='evidence' stops after the aggregator; 'rejudge' skips the workspace entirely
+    and runs the judges over the supplied evidences.
+    """
+    if variant == "rejudge":
+        state = rejudge_evidence(evidences or {}, repo_path, app=get_graph("rejudge"),
+                                 progress=job.publish, job_id=job.job_id)
+        return {"state": state, "target": repo_path, "reuse": None}
+
+    target = clean_target(repo_path)
+    # --- ENGINE INVOCATION (The Core Swarm, streamed node by node) ---
+    # A dirty snapshot is not described by its HEAD, so it is neither looked up nor stored.
+    res = audit_target(target, lambda: _job_workspace(job, repo_path, include_dirty=include_dirty),
+                       pdf_path=doc_path or "HEURISTIC_MODE", app=get_graph(variant), variant=variant,
+                       rubric_id=rubric_id, refresh=refresh, storable=_is_remote(target) or not include_dirty,
+                       progress=job.publish, job_id=job.job_id)
+    return {"state": res, "target": target, "reuse": res.get("reuse"), "stored": res.get("result_store")}
+
+def render_results(res: Dict[str, Any], repo_path_clean: str) -> str:
+    """Builds the Emerald results payload from a final swarm state."""
+    return render(res, "html", target=repo_path_clean)
+
+def _error_block(message: str) -> str:
+    return f"<div style='color:red; font-family:sans-serif; padding:20px;'><b>Swarm Critical Error:</b> {message}</div>"
+
+# --- AUDIT JOB POOL (Bounded, off the event loop) ---
+job_manager = AuditJobManager(
+    execute_audit,
+    max_workers=int(os.getenv("AUDIT_WORKERS", "2")),
+    max_queue=int(os.getenv("AUDIT_QUEUE_LIMIT", "16")),
+)
+
 @app.post("/audit", response_class=HTMLResponse)
 async def run_audit(
-    background_tasks: BackgroundTasks,
     repo_path: str = Form(...), 
     doc_path: str = Form(None), 
     rubric_type: str = Form("forensic"),
     model_choice: str = Form("gpt-4o-mini")
 ):
-    temp_workspace = tempfile.mkdtemp(prefix="swarm_audit_")
-    
+    """Form entry point: enqueues the audit and returns a page that polls for the verdict."""
     try:
-        # --- 1. CLONING & PREP (Fixed Path Logic) ---
-        repo_path_clean = repo_path.strip()
-        
-        # Security: Only strip dots if it's a local path, not a URL
-        if not repo_path_clean.startswith("http") and repo_path_clean.startswith("."):
-            repo_path_clean = repo_path_clean.lstrip("./\\")
-
-        if repo_path_clean.startswith(("http", "git@")):
-            print(f"📡 Remote Clone: {repo_path_clean}")
-            # depth=100 ensures we get your 51 commits for the forensic scan
-            repo = Repo.clone_from(repo_path_clean, temp_workspace, depth=100)
-            repo.close() 
-        else:
-            print(f"📂 Local Scan: {repo_path_clean}")
-            shutil.copytree(repo_path_clean, temp_workspace, dirs_exist_ok=True)
-
-        # --- 2. ENGINE INVOCATION (The Core Swarm) ---
-        # Note: We use forensic_app which was initialized at the top of server.py
-        res = forensic_app.invoke({
-            "repo_url": repo_path_clean,
-            "workspace_path": temp_workspace,
-            "pdf_path": doc_path if doc_path else "HEURISTIC_MODE",
-            "evidences": {}, 
-            "opinions": [],
-            "aggregated_score": 0.0
-        })
-        
-        # --- 3. DATA EXTRACTION (Hybrid Pydantic/Dict Support) ---
-        avg = res.get("aggregated_score", 0.0)
-        verdict = res.get("global_verdict", "PENDING ADJUDICATION")
-        opinions = res.get("opinions", [])
-        evidence_vault = res.get("evidences", {})
-
-        # --- 4. DYNAMIC UI GENERATION: HEADER ---
-        emerald_header = f"""
-        <div class="emerald-header" style="text-align: center; padding: 60px 20px; background: #064e3b; color: white; border-radius: 12px; margin-bottom: 40px;">
-            <h1 style="font-size: 72px; font-weight: 900; margin: 0; color: #10b981;">{avg:.2f} <span style="font-size: 24px; opacity: 0.6; color: white;">/ 5.0</span></h1>
-            <p style="font-size: 18px; font-weight: 700; text-transform: uppercase; letter-spacing: 6px; margin-top: 20px;">VERDICT: {verdict}</p>
-            <p style="font-size: 14px; opacity: 0.8; margin-top: 10px;">Forensic Target: {repo_path_clean}</p>
-        </div>
-        """
-
-        # --- 5. OPINION AGGREGATOR (The 'AttributeError: get' Fix) ---
-        def get_opinion_block(role_name, display_title, color, emoji):
-            match_data = None
-            for op in opinions:
-                # Convert Pydantic to Dict if necessary
-                op_dict = op.model_dump() if hasattr(op, 'model_dump') else (op.__dict__ if hasattr(op, '__dict__') else op)
-                
-                # Identify the judge/role
-                judge_name = str(op_dict.get("judge", op_dict.get("role", ""))).upper()
-                if role_name.upper() in judge_name:
-                    match_data = op_dict
-                    break
-            
-            score = match_data.get("score", "0.0") if match_data else "N/A"
-            arg = match_data.get("argument", "Waiting for judicial filing...") if match_data else f"The {role_name} did not file a brief."
-            
-            return f"""
-            <div style="background: {color}10; border: 2px solid {color}; padding: 35px; border-radius: 16px; position: relative; margin-bottom: 20px;">
-                <div style="position: absolute; top: -18px; right: 25px; background: {color}; color: white; padding: 6px 18px; border-radius: 20px; font-weight: 900; font-size: 14px;">{emoji} {role_name.upper()}: {score}/5.0</div>
-                <h4 style="font-size: 14px; text-transform: uppercase; color: {color}; letter-spacing: 2px; font-weight: 800; margin-bottom: 12px;">{display_title}</h4>
-                <p style="font-size: 16px; line-height: 1.8; color: #064e3b; margin: 0;">{arg}</p>
-            </div>
-            """
-
-        judicial_table = f"""
-        <h3 class="text-3xl font-black uppercase text-emerald-900 mb-10 mt-16">⚖️ The Digital Courtroom: Deliberations</h3>
-        <div style="display: flex; flex-direction: column; gap: 10px; margin-bottom: 60px;">
-            {get_opinion_block("Defense", "Plea: Structural Integrity", "#059669", "🛡️")}
-            {get_opinion_block("TechLead", "Ruling: Engineering Standards", "#334155", "💻")}
-            {get_opinion_block("Prosecutor", "Charge: Forensic Breach", "#dc2626", "🔥")}
-        </div>
-        """
-
-        # --- 6. STATUTES & EVIDENCE (Re-using your existing criteria logic) ---
-        # Note: 'human_registry' should be defined here or globally
-        criteria_report = ""
-        # ... (Insert your criteria loop here, using evidence_vault) ...
-
-        background_tasks.add_task(forensic_cleanup_task, temp_workspace)
-        final_payload = emerald_header + judicial_table + criteria_report
-        return Template(HTML_TEMPLATE).render(results=True, key_findings=final_payload)
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        background_tasks.add_task(forensic_cleanup_task, temp_workspace)
-        return HTMLResponse(content=f"<div style='color:red; font-family:sans-serif; padding:20px;'><b>Swarm Critical Error:</b> {str(e)}</div>", status_code=500)
+        job = job_manager.submit(repo_path=repo_path, doc_path=doc_path, rubric_type=rubric_type, model_choice=model_choice)
+    except QueueFullError as e:
+        return HTMLResponse(content=_error_block(str(e)), status_code=429)
+    return Template(HTML_TEMPLATE).render(results=False, job_id=job.job_id)
+
+@app.post("/api/audits", status_code=202)
+async def submit_audit(request: AuditRequest):
+    if request.variant not in GRAPH_VARIANTS:
+        raise HTTPException(status_code=422, detail=f"Unknown variant '{request.variant}' (expected one of {', '.join(GRAPH_VARIANTS)})")
+    if request.variant == "rejudge" and not request.evidences:
+        raise HTTPException(status_code=422, detail="The 'rejudge' variant needs 'evidences'.")
+    try:
+        get_rubric(request.rubric_id)
+    except RubricError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _enqueue(**request.model_dump())
+
+def _enqueue(**params):
+    try:
+        job = job_manager.submit(**params)
+    except QueueFullError as e:
+        return JSONResponse({"detail": str(e), **job_manager.stats()}, status_code=429)
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"/api/audits/{job.job_id}",
+        "result_url": f"/api/audits/{job.job_id}/result",
+    }
+
+@app.post("/api/audits/{job_id}/rejudge", status_code=202)
+async def rejudge_audit(job_id: str):
+    """Re-convenes the judges over a finished audit's evidence: no clone, no detectives."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown audit job {job_id}")
+    if job.status != "done":
+        return JSONResponse({"job_id": job_id, "status": job.status}, status_code=409)
+    return _enqueue(repo_path=job.result["target"], variant="rejudge",
+                    evidences=to_jsonable(job.result["state"].get("evidences", {})))
+
+@app.get("/api/audits/{job_id}")
+async def audit_status(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown audit job {job_id}")
+    return job.to_dict()
+
+@app.get("/api/audits/{job_id}/result")
+async def audit_result(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown audit job {job_id}")
+    if job.status == "failed":
+        return JSONResponse({"job_id": job_id, "status": job.status, "error": job.error}, status_code=500)
+    if job.status != "done":
+        return JSONResponse({"job_id": job_id, "status": job.status}, status_code=409)
+    state = job.result["state"]
+    return {
+        "job_id": job_id,
+        "status": job.status,
+        "target": job.result["target"],
+        "aggregated_score": state.get("aggregated_score", 0.0),
+        "global_verdict": state.get("global_verdict"),
+        "reuse": job.result.get("reuse"),
+        "result_store": job.result.get("stored"),
+        "evidences": to_jsonable(state.get("evidences", {})),
+        "opinions": to_jsonable(state.get("opinions", [])),
+    }
+
+@app.get("/api/audits/{job_id}/report", response_class=HTMLResponse)
+async def audit_report(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        return HTMLResponse(content=_error_block(f"Unknown audit job {job_id}"), status_code=404)
+    if job.status == "failed":
+        return HTMLResponse(content=_error_block(job.error), status_code=500)
+    if job.status != "done":
+        return HTMLResponse(content=f"<p>Audit {job_id} is {job.status}.</p>", status_code=409)
+    return HTMLResponse(content=render_results(job.result["state"], job.result["target"]))
+
+@app.get("/api/audits/{job_id}/events")
+async def audit_events(job_id: str, request: Request):
+    """Server-Sent Events: one 'node' event per finished graph node, then 'done' or 'failed'."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown audit job {job_id}")
+    last_id = request.headers.get("last-event-id")
+    cursor = int(last_id) + 1 if last_id and last_id.isdigit() else 0
+
+    async def event_source():
+        nonlocal cursor
+        while True:
+            while cursor < len(job.events):
+                event = job.events[cursor]
+                yield f"id: {cursor}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+                cursor += 1
+            if job.finished and cursor >= len(job.events):
+                final = {"job_id": job.job_id, "status": job.status, "error": job.error}
+                yield f"event: {job.status}\ndata: {json.dumps(final)}\n\n"
+                return
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(event_source(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# --- AUDIT HISTORY (Result store) ---
+@app.get("/api/results")
+async def audit_history(repo_url: Optional[str] = None, limit: int = 50, since: Optional[float] = None,
+                        rubric_id: Optional[str] = None):
+    """Stored audits of one repository, newest first; without repo_url, every audited repository."""
+    if not repo_url:
+        return {"repositories": await asyncio.to_thread(result_store.repositories)}
+    rows = await asyncio.to_thread(result_store.history, clean_target(repo_url), min(max(limit, 1), 1000), since, rubric_id)
+    return {"repo_url": repo_url, "audits": rows}
+
+@app.get("/api/results/{audit_id}")
+async def stored_audit(audit_id: int):
+    """One stored final state: score, verdict, evidences, opinions and node timings."""
+    state = await asyncio.to_thread(result_store.get, audit_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Unknown stored audit {audit_id}")
+    return state
+
+@app.get("/api/results/{audit_id}/report", response_class=HTMLResponse)
+async def stored_audit_report(audit_id: int):
+    state = await asyncio.to_thread(result_store.get, audit_id)
+    if state is None:
+        return HTMLResponse(content=_error_block(f"Unknown stored audit {audit_id}"), status_code=404)
+    return HTMLResponse(content=render_results(state, state.get("repo_url", "")))
+
+@app.get("/api/stats")
+async def audit_stats():
+    return {**job_manager.stats(), "pdf_cache": pdf_cache.stats(), "tracing": tracer.stats(),
+            "rubrics": rubric_registry.stats(), "results": result_store.stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition: per-node histograms from the instrumented graph, plus the job pool."""
+    stats = job_manager.stats()
+    lines = node_metrics.render()
+    gauges = (
+        ("swarm_audit_queue_depth", "gauge", "Audits waiting for a worker.", stats["queue_depth"]),
+        ("swarm_audit_in_flight", "gauge", "Audits currently running.", stats["in_flight"]),
+        ("swarm_audit_workers", "gauge", "Size of the audit worker pool.", stats["workers"]),
+    )
+    for name, kind, help_text, value in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    lines += ["# HELP swarm_audits_total Audits by outcome.", "# TYPE swarm_audits_total counter"]
+    lines += [f'swarm_audits_total{{outcome="{outcome}"}} {stats[outcome]}' for outcome in ("completed", "failed", "rejected")]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.on_event("shutdown")
+def shutdown_job_pool():
+    job_manager.shutdown(wait=False)
+    tracer.close()
     
 if __name__ == "__main__":
     import uvicorn
@@ -1,10 +1,10 @@
+import argparse
+import json
 import os
 import shutil
 import stat
-import subprocess
-import tempfile
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 import sys
 from dotenv import load_dotenv
 
@@ -13,7 +13,10 @@ load_dotenv()
 
 # Ensure the project root is in the path for internal imports
 sys.path.append(os.getcwd())
-from src.core.graph import forensic_app
+from src.core.runner import audit_repository, rejudge_evidence
+from src.core.batch import run_batch
+from src.utils.formatters import RENDERERS, build_report, render, with_format, write_report
+from src.core.progress import to_jsonable
 
 def remove_readonly(func, path, _):
     """Protocol A.1: File System Rigor. Clears read-only git artifacts."""
@@ -23,94 +26,21 @@ def remove_readonly(func, path, _):
 def generate_professional_markdown(state: Dict[str, Any]) -> str:
     """
     Automaton Auditor - Final Audit Report
-    Final Standard: Sovereign Swarm v2.0 (2026)
+    Final Standard: Sovereign Swarm v2.0 (2026); rendered by src/utils/formatters.py.
     """
-    score = state.get("aggregated_score", 0.0)
-    # Pulling dynamic links from state (injected from .env)
-    repo_url = state.get("repo_url", "Internal Source")
-    pdf_link = state.get("pdf_path", "#") 
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    opinions = state.get("opinions", [])
-    evidences = state.get("evidences", {})
-
-    md = f"# Automaton Auditor - Final Audit Report\n\n"
-    md += f"**Generated:** {timestamp} | **Overall Score:** {score:.2f} / 5.00\n\n"
-    
-    # --- 1. EXECUTIVE SUMMARY ---
-    md += "## 1. Executive Summary\n"
-    md += f"Audit of **[{repo_url.split('/')[-1]}]({repo_url})**. Forensic scan confirms 51 commits and AST state-tracking.\n\n"
-    
-    md += "### 📍 Forensic Artifacts\n"
-    md += f"* **Source Code:** [GitHub Repository]({repo_url})\n"
-    
-    # Dynamic Doc Status check
-    has_docs = evidences.get("doc_agent") and any(f.get("found") for f in evidences.get("doc_agent", []))
-    if has_docs:
-        md += f"* **Design Document:** [Verified PDF Artifact]({pdf_link})\n"
-        md += "* **Status:** ✅ **Verified against Intent**\n\n"
-    else:
-        md += f"* **Design Document:** ❌ [Missing/Pending]({pdf_link})\n"
-        md += "* **Status:** ⚠️ **Documentation Gap Detected**\n\n"
-
-    # --- 2. 10-POINT CRITERION BREAKDOWN ---
-    md += "## 2. 🏛️ 10-Point Forensic Ledger\n\n"
-    
-    rubric_map = [
-        ("Git Forensic", "1. Engineering Chronology", "RepoAgent"),
-        ("Git Forensic", "2. Iterative Narrative", "RepoAgent"),
-        ("State Rigor", "3. State Management", "RepoAgent/AST"),
-        ("State Rigor", "4. Reducer Logic", "RepoAgent/AST"),
-        ("Graph Orchestration", "5. Graph Connectivity", "VisionAgent"),
-        ("Graph Orchestration", "6. Parallel Execution", "VisionAgent"),
-        ("Documentation", "7. Technical Depth", "DocAgent"),
-        ("Documentation", "8. Design Alignment", "DocAgent"),
-        ("General", "9. Security Hygiene", "TechLead"),
-        ("General", "10. Swarm Resilience", "TechLead")
-    ]
-
-    for i, (internal_key, display_name, source_agent) in enumerate(rubric_map, 1):
-        crit_ops = [op for op in opinions if getattr(op, 'criterion', '') == internal_key]
-        
-        # TechLead Fallback for Security/Resilience
-        if not crit_ops and internal_key == "General":
-            crit_ops = [op for op in opinions if getattr(op, 'criterion', '') == "General"]
-
-        scores = [getattr(op, 'score', 0.0) for op in crit_ops]
-        avg_item_score = sum(scores) / len(scores) if scores else 0.0
-        status_emoji = "✅" if avg_item_score >= 3.5 else "⚠️" if avg_item_score >= 2.0 else "❌"
-
-        md += f"### {display_name} [Source: {source_agent}]\n"
-        md += f"**Item Score:** `{avg_item_score:.1f}/5` | **Status:** {status_emoji}\n\n"
-        
-        md += "| Judge | Dialectical Argument & Actionable Advice |\n"
-        md += "| :--- | :--- |\n"
-        for op in crit_ops:
-            md += f"| {getattr(op, 'judge', 'Judge')} | {getattr(op, 'argument', 'N/A')} |\n"
-        md += "\n---\n"
-
-    # --- 3. STRATEGIC RECOMMENDATIONS ---
-    md += "## 🚀 3. Strategic Recommendations for Score Elevation\n"
-    recs = []
-    
-    actual_commits = state.get("commit_count", 0)
-    if any("0 commits" in getattr(op, 'argument', '') for op in opinions) and actual_commits > 22:
-        recs.append(f"**Data Pipeline Audit:** Prosecutor missed the **{actual_commits}** commits. Check state reducer.")
-    
-    if any("sandboxing" in getattr(op, 'argument', '').lower() for op in opinions):
-        recs.append("**Mandatory Sandboxing:** Ensure environment variables point to ephemeral directories.")
-
-    if not has_docs:
-        recs.append(f"**Documentation Linkage:** Ensure `TARGET_PDF_LINK` in .env is a valid, reachable URL.")
-
-    for idx, rec in enumerate(recs, 1):
-        md += f"{idx}. {rec}\n"
-
-    md += "\n---\n*Generated by Gemini Sovereign Swarm v2.0 - Judicial Grade*"
-    return md
-
-def run_audit():
+    return render(state, "md")
+
+def write_reports(state: Dict[str, Any], report_out: str, formats=("md",)) -> List[str]:
+    """Groups the final state once, then writes one report per format (report.md, report.html, report.json)."""
+    model = build_report(state)
+    return [write_report(model, with_format(report_out, fmt), fmt) for fmt in formats]
+
+def run_audit(variant: str = "full", rubric_id: str = None, revision: str = None, checkout: bool = True,
+              formats=("md",), refresh: bool = False):
     """
     Zero-Path Orchestrator. Pulls all variables from .env.
+    variant='evidence' stops after the aggregator and saves the findings as JSON.
+    refresh=True re-audits even when the result store already holds this commit.
     """
     repo_url = os.getenv("TARGET_REPO_URL")
     pdf_url = os.getenv("TARGET_PDF_LINK")
@@ -119,35 +49,143 @@ def run_audit():
     print(f"🛡️ Initializing Sandboxed Audit for: {repo_url}")
 
     # --- EXECUTION IN EPHEMERAL SANDBOX ---
-    with tempfile.TemporaryDirectory(prefix="forensic_swarm_") as workspace:
-        try:
-            # Clone into the unique temp workspace
-            print(f"📡 Cloning Narrative to Workspace: {workspace}")
-            subprocess.run(["git", "clone", "--depth", "100", repo_url, workspace], check=True, capture_output=True)
-
-            initial_input = {
-                "repo_url": repo_url,
-                "workspace_path": workspace,
-                "pdf_path": pdf_url,
-                "evidences": {}, 
-                "opinions": [],
-                "aggregated_score": 0.0
-            }
-            
-            # Execute the Swarm Graph
-            final_state = forensic_app.invoke(initial_input)
-            
-            # Generate and Save Report
-            report_content = generate_professional_markdown(final_state)
-            os.makedirs(os.path.dirname(report_out), exist_ok=True)
+    try:
+        # Execute the Swarm Graph
+        # The graph compiles on first use inside the runner
+        final_state = audit_repository(repo_url, pdf_url, variant=variant, rubric_id=rubric_id,
+                                       revision=revision, checkout=checkout, refresh=refresh)
+
+        # Generate and Save Report (or the raw findings, for a later --rejudge)
+        if variant == "evidence":
+            report_out = os.path.splitext(report_out)[0] + "_evidence.json"
+            os.makedirs(os.path.dirname(report_out) or ".", exist_ok=True)
             with open(report_out, "w", encoding="utf-8") as f:
-                f.write(report_content)
-            
-            print(f"\n✅ Audit Complete! Report: {report_out}")
+                json.dump({"repo_url": repo_url, "evidences": to_jsonable(final_state.get("evidences", {}))}, f, indent=2)
+        else:
+            report_out = ", ".join(write_reports(final_state, report_out, formats))
+
+        reuse = final_state.get("reuse") or {}
+        stored = final_state.get("result_store") or {}
+        if stored.get("hit"):
+            print(f"⚡ Served from the result store: audit #{stored['id']} of {stored['head_sha'][:10]}, "
+                  f"{datetime.fromtimestamp(stored['created_at']):%Y-%m-%d %H:%M:%S} (--refresh to re-audit).")
+        else:
+            print(f"♻️ Reuse ({reuse.get('mode')}): {reuse.get('criteria_reused', 0)} criteria reused, "
+                  f"{reuse.get('criteria_recomputed', 0)} recomputed; {reuse.get('files_changed', 0)} files changed, "
+                  f"{reuse.get('files_reparsed', 0)} re-parsed.")
+        print(f"\n✅ Audit Complete! Report: {report_out}")
+
+    except Exception as e:
+        print(f"❌ Swarm Failure: {e}")
+        import traceback; traceback.print_exc()
+
+def run_rejudge(evidence_path: str, formats=("md",)):
+    """
+    Re-convenes the judges over saved findings: an '_evidence.json' file, or a server
+    /result payload. No clone and no detectives, so rubric or judge changes are cheap to replay.
+    """
+    report_out = os.getenv("REPORT_OUTPUT_DIR", "audit/final_report.md")
+    with open(evidence_path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    repo_url = payload.get("repo_url") or payload.get("target") or "Supplied Evidence"
 
-        except Exception as e:
-            print(f"❌ Swarm Failure: {e}")
-            import traceback; traceback.print_exc()
+    print(f"⚖️ Re-judging saved evidence for: {repo_url}")
+    final_state = rejudge_evidence(payload.get("evidences", payload), repo_url=repo_url)
+    report_out = ", ".join(write_reports(final_state, report_out, formats))
+    print(f"\n✅ Re-judgment Complete! Report: {report_out}")
+
+def run_history(rev_range: str = "HEAD", every: int = 1):
+    """
+    Time-series mode: the structural criteria at every (or every Nth) commit of the range,
+    read from the cached mirror. Nothing is checked out and no judges are convened.
+    """
+    from src.infrastructure.clone_cache import mirror_cache
+    from src.tools.history_audit import audit_history, trend_markdown
+
+    repo_url = os.getenv("TARGET_REPO_URL")
+    if not repo_url:
+        print("❌ History mode needs a repository: set TARGET_REPO_URL in .env.")
+        return
+    report_out = os.path.splitext(os.getenv("REPORT_OUTPUT_DIR", "audit/final_report.md"))[0] + "_history.md"
+    print(f"📈 Replaying history of: {repo_url} ({rev_range})")
+    result = audit_history(str(mirror_cache.sync(repo_url)), rev_range, every=every)
+    table = trend_markdown(result)
+    os.makedirs(os.path.dirname(report_out) or ".", exist_ok=True)
+    with open(report_out, "w", encoding="utf-8") as f:
+        f.write(f"# 📈 Criteria History: {repo_url}\n\n" + table)
+    print(table)
+    print(f"✅ History Complete: {result['sampled']}/{result['commits']} commits in {result['elapsed_s']}s. Report: {report_out}")
+
+def run_results(repo_url: str = None, limit: int = 20):
+    """Audit history from the result store: one repository, or every audited repository."""
+    from src.infrastructure.result_store import result_store
+
+    if not repo_url:
+        repos = result_store.repositories()
+        print(f"🗃️ Result Store: {result_store.path} ({len(repos)} repositories)")
+        for repo in repos:
+            print(f"  {repo['repo_url']}: {repo['audits']} audits, last {datetime.fromtimestamp(repo['last_audit']):%Y-%m-%d %H:%M}")
+        return
+    print(f"🗃️ Audit history for: {repo_url}")
+    print(f"{'#':>5}  {'When':<16}  {'Commit':<10}  {'Rubric':<14}  {'Variant':<8}  {'Score':>5}  Verdict")
+    for row in result_store.history(repo_url, limit=limit):
+        score = f"{row['aggregated_score']:.2f}" if row["aggregated_score"] is not None else "-"
+        print(f"{row['id']:>5}  {datetime.fromtimestamp(row['created_at']):%Y-%m-%d %H:%M}  {row['head_sha'][:10]:<10}  "
+              f"{(row['rubric_id'] or '-'):<14}  {row['variant']:<8}  {score:>5}  {row['global_verdict'] or '-'}")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Forensic Swarm Auditor")
+    parser.add_argument("--manifest", help="CSV/JSONL manifest (repo_url, pdf_path) for batch mode.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Batch worker processes.")
+    parser.add_argument("--retries", type=int, default=2, help="Retries for transient clone errors.")
+    parser.add_argument("--output", default="-", help="Batch JSONL results file ('-' for stdout).")
+    parser.add_argument("--report-dir", default=None, help="Also write one markdown report per repo here.")
+    parser.add_argument("--variant", choices=["full", "evidence"], default="full",
+                        help="'evidence' runs detectives + aggregator only (no judges).")
+    parser.add_argument("--rejudge", metavar="EVIDENCE_JSON", help="Run only the judges over saved evidence.")
+    parser.add_argument("--rubric", default=None,
+                        help="Rubric id from audit/rubrics/ (or 'constitution'); defaults to FORENSIC_RUBRIC.")
+    parser.add_argument("--revision", default=None, help="Audit this commit, tag or branch instead of HEAD.")
+    parser.add_argument("--no-checkout", dest="checkout", action="store_false",
+                        help="Read files straight from the cached mirror; no working tree is created.")
+    parser.add_argument("--format", dest="formats", default=os.getenv("REPORT_FORMATS", "md"),
+                        type=lambda value: [fmt.strip() for fmt in value.split(",") if fmt.strip()],
+                        help=f"Report formats, comma-separated: {', '.join(RENDERERS)} (default REPORT_FORMATS or md).")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-audit even if the result store already holds this commit and rubric.")
+    parser.add_argument("--results", nargs="?", const="", default=None, metavar="REPO_URL",
+                        help="List stored audits for a repository (TARGET_REPO_URL by default; 'all' lists repositories).")
+    parser.add_argument("--history", nargs="?", const="HEAD", default=None, metavar="RANGE",
+                        help="Trend the structural criteria across a commit range (e.g. 'v1.0..HEAD').")
+    parser.add_argument("--every", type=int, default=1, help="History mode: sample every Nth commit.")
+    args = parser.parse_args(argv)
+    unknown = [fmt for fmt in args.formats if fmt not in RENDERERS]
+    if unknown:
+        parser.error(f"unknown report format(s): {', '.join(unknown)}")
+    if args.every < 1:
+        parser.error("--every must be at least 1")
+    return args
 
 if __name__ == "__main__":
-    run_audit()
\ No newline at end of file
+    args = parse_args()
+    if args.results is not None:
+        target = args.results or os.getenv("TARGET_REPO_URL")
+        run_results(None if target == "all" else target)
+    elif args.history:
+        run_history(args.history, args.every)
+    elif args.rejudge:
+        run_rejudge(args.rejudge, args.formats)
+    elif args.manifest:
+        if args.output == "-":
+            run_batch(args.manifest, workers=args.workers, retries=args.retries, report_dir=args.report_dir,
+                      variant=args.variant, rubric_id=args.rubric)
+        else:
+            os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+            with open(args.output, "w", encoding="utf-8") as out:
+                summary = run_batch(args.manifest, workers=args.workers, out=out,
+                                    retries=args.retries, report_dir=args.report_dir, variant=args.variant,
+                                    rubric_id=args.rubric)
+            print(f"✅ Batch Complete: {summary['ok']}/{summary['total']} audited, "
+                  f"p50 {summary['latency_p50_s']}s, p95 {summary['latency_p95_s']}s. Results: {args.output}")
+    else:
+        run_audit(args.variant, args.rubric, args.revision, args.checkout, args.formats, args.refresh)
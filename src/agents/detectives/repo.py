@@ -1,8 +1,10 @@
 import os
-import ast
-import subprocess
 from typing import Dict, Any, List
 from src.core.state import Evidence
+from src.tools.ast_index import SymbolIndex, build_symbol_index, parse_python_source
+from src.core.incremental import reuse_or_compute
+from src.tools.git_history import stream_history
+from src.infrastructure.git_objects import RepoView
 
 def analyze_code_structure_internal(file_path: str) -> dict:
     """
@@ -12,121 +14,149 @@ def analyze_code_structure_internal(file_path: str) -> dict:
     if not os.path.exists(file_path):
         return {"has_annotated": False, "has_pydantic": False}
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            tree = ast.parse(f.read())
-        
-        has_annotated = False
-        has_pydantic = False
-        
-        for node in ast.walk(tree):
-            # Check for Annotated (Reducers)
-            if isinstance(node, ast.Name) and node.id == "Annotated":
-                has_annotated = True
-            # Check for Pydantic BaseModel (Rigor)
-            if isinstance(node, ast.ClassDef):
-                for base in node.bases:
-                    if isinstance(base, ast.Name) and base.id == "BaseModel":
-                        has_pydantic = True
-        
-        return {"has_annotated": has_annotated, "has_pydantic": has_pydantic}
+        with open(file_path, "rb") as f:
+            table = parse_python_source(f.read(), file_path)
+        if table["error"]:
+            return {"has_annotated": False, "has_pydantic": False}
+        has_pydantic = any(base.split(".")[-1] == "BaseModel" for cls in table["classes"] for base in cls["bases"])
+        return {"has_annotated": bool(table["annotated_reducers"]), "has_pydantic": has_pydantic}
     except Exception:
         return {"has_annotated": False, "has_pydantic": False}
 
-def get_git_log_manual(repo_path: str) -> List[str]:
-    """Protocol A.1: Git Forensic Analysis - Manual subprocess to ensure success."""
-    try:
-        result = subprocess.run(
-            ["git", "log", "--oneline", "--reverse"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip().split("\n")
-    except Exception:
-        return []
-
-def repo_investigator(state: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Sovereign Forensic Investigator.
-    Enforces 'Fact Supremacy' by providing the Chief Justice with 'VERIFIED' proof.
-    Updated: Multi-path metadata export for Judicial Visibility.
-    """
-    workspace_path = state.get("workspace_path")
-    findings_list = []
-
-    if not workspace_path or not os.path.exists(workspace_path):
-        return {"evidences": {"repo_agent": []}}
-
-    # --- 1. Git Forensic Analysis (Key: 'git') ---
-    commits = get_git_log_manual(workspace_path)
-    log_len = len(commits)
-    is_iterative = log_len > 3
+def _git_evidence(workspace_path: str, rev: str = "HEAD") -> Dict[str, Any]:
+    """Criterion 'git': commit chronology, streamed into columns by the history engine."""
+    chronology = stream_history(workspace_path, rev=rev).summary()
+    log_len = chronology["total_commits"]
+    is_iterative = log_len > 3 and not chronology["bulk_upload"]
     
-    git_rationale = (
-        f"VERIFIED: Captured {log_len} commits. Narrative shows iterative progression." 
-        if is_iterative else f"FAILURE: Only {log_len} commits found. Possible 'Bulk Upload' detected."
-    )
+    if is_iterative:
+        git_rationale = f"VERIFIED: Captured {log_len} commits over {chronology['active_days']} active days. Narrative shows iterative progression."
+    elif log_len > 3:
+        git_rationale = (f"FAILURE: {log_len} commits, but timestamps are clustered "
+                         f"({chronology['bulk_reason']}). Possible 'Bulk Upload' detected.")
+    else:
+        git_rationale = f"FAILURE: Only {log_len} commits found. Possible 'Bulk Upload' detected."
     
     # We add a 'metadata' dictionary so the Prosecutor can find the 'total_commits'
-    findings_list.append(Evidence(
+    return Evidence(
         found=is_iterative,
         criterion="git",
         rationale=git_rationale,
-        metadata={"total_commits": log_len}  # <--- CRITICAL FOR PROSECUTOR
-    ).model_dump())
+        metadata=chronology  # <--- 'total_commits' IS CRITICAL FOR PROSECUTOR
+    ).model_dump()
 
-    # --- 2. State Management Rigor (Key: 'state') ---
-    state_file = os.path.join(workspace_path, "src", "core", "state.py")
-    analysis = analyze_code_structure_internal(state_file)
+def _state_evidence(index: SymbolIndex) -> Dict[str, Any]:
+    """Criterion 'state': Pydantic models and Annotated reducers anywhere in the repo."""
+    models = index.pydantic_models()
+    reducers = index.annotated_reducers()
     
-    state_success = analysis.get("has_annotated") and analysis.get("has_pydantic")
+    state_success = bool(models) and bool(reducers)
     state_rationale = (
-        "VERIFIED: AST Scan confirmed 'BaseModel' and 'Annotated' reducers. State is robust." 
+        f"VERIFIED: AST Scan confirmed 'BaseModel' and 'Annotated' reducers "
+        f"({len(models)} models, {len(reducers)} reducers across {index.stats['files']} files). State is robust." 
         if state_success else "FAILURE: Missing Pydantic models or Reducers; risk of data overwriting."
     )
     
-    findings_list.append(Evidence(
+    return Evidence(
         found=state_success,
         criterion="state",
-        rationale=state_rationale
-    ).model_dump())
+        rationale=state_rationale,
+        metadata={
+            "models": [f"{path}:{name}" for path, name in models],
+            "reducers": [f"{path}:{field}={reducer}" for path, field, reducer in reducers],
+            "operator_reducers": sorted({op for _, op in index.operator_reducers()}),
+        }
+    ).model_dump()
 
-    # --- 3. Graph Orchestration (Key: 'graph') ---
-    graph_path = os.path.join(workspace_path, "src", "core", "graph.py")
-    graph_exists = os.path.exists(graph_path)
+def _graph_evidence(index: SymbolIndex) -> Dict[str, Any]:
+    """Criterion 'graph': a StateGraph builder with registered nodes."""
+    graph_files = index.graph_files()
+    graph_exists = bool(graph_files)
     
     graph_rationale = (
-        "VERIFIED: 'StateGraph' builder detected in src/core/graph.py. Orchestration active." 
+        f"VERIFIED: 'StateGraph' builder detected in {', '.join(graph_files)}. Orchestration active." 
         if graph_exists else "FAILURE: No graph definition found. Orchestration Fraud suspected."
     )
 
-    findings_list.append(Evidence(
+    return Evidence(
         found=graph_exists,
         criterion="graph",
-        rationale=graph_rationale
-    ).model_dump())
+        rationale=graph_rationale,
+        metadata={
+            "graph_files": graph_files,
+            "nodes": sorted(set(index.graph_nodes())),
+            "edges": len(index.graph_edges()),
+        }
+    ).model_dump()
 
-    # --- 4. Security & Sandbox Detection (Criterion #9) ---
-    # Scan main.py to see if it uses the 'tempfile' module or 'shutil'
-    main_path = os.path.join(workspace_path, "main.py")
-    uses_proper_sandbox = False
-    if os.path.exists(main_path):
-        with open(main_path, 'r') as f:
-            content = f.read()
-            uses_proper_sandbox = "tempfile" in content and "TemporaryDirectory" in content
+def _security_evidence(index: SymbolIndex) -> Dict[str, Any]:
+    """
+    Criterion 'security': ephemeral sandboxes anywhere in the codebase, not only in main.py.
+    Also exports the try/except count the Tech Lead rules on for resilience.
+    """
+    sandbox_sites = [path for path, call in index.sandbox_calls() if call == "tempfile.TemporaryDirectory"]
+    uses_proper_sandbox = bool(sandbox_sites)
 
-    findings_list.append(Evidence(
+    return Evidence(
         found=uses_proper_sandbox,
         criterion="security",
         rationale="VERIFIED: Code uses tempfile.TemporaryDirectory()." if uses_proper_sandbox 
-                  else "FAILURE: Manual pathing/shutil detected. Lacks ephemeral sandboxing."
-    ).model_dump())
+                  else "FAILURE: Manual pathing/shutil detected. Lacks ephemeral sandboxing.",
+        metadata={"sandbox_files": sorted(set(sandbox_sites)), "try_blocks": index.try_blocks()}
+    ).model_dump()
+
+def repo_investigator(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sovereign Forensic Investigator.
+    Enforces 'Fact Supremacy' by providing the Chief Justice with 'VERIFIED' proof.
+    Updated: Multi-path metadata export for Judicial Visibility.
+    Each criterion declares its inputs, so an incremental re-audit only recomputes
+    the findings whose files changed since the last audited commit.
+    """
+    workspace_path = state.get("workspace_path")
+    findings_list = []
+    reuse_log = []
+
+    if not workspace_path or not os.path.exists(workspace_path):
+        return {"evidences": {"repo_agent": []}}
+
+    # Files are read through the object store: a checkout, a bare mirror or a past revision all work.
+    revision = state.get("revision")
+    view = RepoView(workspace_path, rev=revision)
+
+    # The whole-repo AST index is only built if a structural criterion must be recomputed.
+    # One parallel pass over every Python file; unchanged blobs come from the SHA-keyed cache.
+    built = {}
+    def index() -> SymbolIndex:
+        if "index" not in built:
+            built["index"] = build_symbol_index(workspace_path, view=view)
+        return built["index"]
+
+    checks = [
+        ("git", ["@history"], lambda: _git_evidence(workspace_path, revision or "HEAD")),  # --- 1. Git Forensic Analysis
+        ("state", ["*.py"], lambda: _state_evidence(index())),                   # --- 2. State Management Rigor
+        ("graph", ["*.py"], lambda: _graph_evidence(index())),                   # --- 3. Graph Orchestration
+        ("security", ["*.py"], lambda: _security_evidence(index())),             # --- 4. Security & Sandbox (Criterion #9)
+    ]
+    try:
+        for criterion, inputs, compute in checks:
+            evidence, entry = reuse_or_compute(state, "repo_agent", criterion, inputs, compute)
+            findings_list.append(evidence)
+            reuse_log.append(entry)
+    finally:
+        view.close()
+
+    if "index" in built:
+        reuse_log.append({"agent": "repo_agent", "criterion": "@index", "reused": False, **built["index"].stats})
+
+    log_len = findings_list[0]["metadata"]["total_commits"]
+    state_success = findings_list[1]["found"]
 
     # --- RETURN TO STATE ---
     # We return the count at the ROOT level so the Prosecutor can't miss it
     return {
         "evidences": {"repo_agent": findings_list},
+        "incremental_log": reuse_log,
         "commit_count": log_len,  # <--- FOR PROSECUTOR FACT-CHECKING
         "has_pydantic": state_success
-    }
\ No newline at end of file
+    }
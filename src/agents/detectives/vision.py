@@ -1,4 +1,3 @@
-import fitz
 import os
 
 def vision_inspector(state):
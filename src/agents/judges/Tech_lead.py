@@ -1,18 +1,19 @@
 from typing import Dict, Any, List
 from src.core.state import AgentState, Opinion
+from src.core.features import features_of
 
 def tech_lead_node(state: AgentState) -> Dict[str, Any]:
     """
     The Tech Lead: Final Arbitrator for Engineering Standards.
     Maps rulings directly to the 10-Point Rubric for Executive Grade reporting.
     """
-    evidences = state.get("evidences", {})
-    repo_findings = evidences.get("repo_agent", [])
-    
+    features = features_of(state)
+
     # --- FORENSIC CHECKS ---
-    uses_dict_soup = any("dictionary" in str(f).lower() and "basemodel" not in str(f).lower() for f in repo_findings)
-    is_sandboxed = any("temp_dir" in str(f).lower() or "tempfile" in str(f).lower() for f in repo_findings)
-    has_error_handling = any("try" in str(f).lower() or "except" in str(f).lower() for f in repo_findings)
+    # Dict soup: the state criterion was scanned and no BaseModel schema exists anywhere
+    uses_dict_soup = "repo_agent/state" in features.criteria and not features.has_pydantic
+    is_sandboxed = features.sandboxed
+    has_error_handling = features.has_error_handling
 
     new_opinions = []
 
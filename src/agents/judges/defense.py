@@ -1,21 +1,20 @@
 from typing import Dict, Any, List
 from src.core.state import AgentState, Opinion
+from src.core.features import features_of
 
 def defense_node(state: AgentState) -> Dict[str, Any]:
     """
     The Defense: Maps specific technical effort to rubric items.
     Focuses on 'Engineering Grit' and 'Structural Intent'.
     """
-    evidences = state.get("evidences", {})
-    repo_findings = evidences.get("repo_agent", [])
-    
-    # --- FORENSIC SCANNING LOGIC ---
-    # 1. State Rigor Check
-    has_ast = any("ast" in str(f).lower() or "parsing" in str(f).lower() for f in repo_findings)
-    
+    features = features_of(state)
+
+    # --- FORENSIC FACTS ---
+    # 1. State Rigor Check: the AST scan verified models and reducers
+    has_ast = features.state_verified
+
     # 2. Git Chronology Check (Focusing on the 51-commit win)
-    git_finding = next((f for f in repo_findings if f.get("criterion") == "git"), {})
-    commit_count = git_finding.get("metadata", {}).get("total_commits", 0)
+    commit_count = features.commit_count
     
     new_opinions = []
 
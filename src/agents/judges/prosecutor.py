@@ -1,38 +1,21 @@
 from typing import Dict, Any, List
 from src.core.state import AgentState, Opinion
+from src.core.features import features_of
 
 def prosecutor(state: AgentState) -> Dict[str, Any]:
     """
     Sovereign Prosecutor: The Adversarial Voice of the Swarm.
-    Upgraded with Multi-Path Metadata Retrieval for Executive Grade accuracy.
+    Rules on the aggregator's precomputed feature index: O(1) lookups, no text search.
     """
-    evidences = state.get("evidences", {})
-    repo_findings = evidences.get("repo_agent", [])
-    vision_findings = evidences.get("vision_agent", [])
-    doc_findings = evidences.get("doc_agent", [])
-    
-    # --- 1. ROBUST GIT CHRONOLOGY SCAN (The 22-Commit Rule) ---
-    # We check multiple paths to find the commit count to avoid 0-count hallucinations
-    commit_count = 0
-    
-    # Path A: Search for the specific git criterion finding
-    git_finding = next((f for f in repo_findings if f.get("criterion") == "git"), {})
-    
-    # Path B: Check metadata sub-dict (Current logic)
-    commit_count = git_finding.get("metadata", {}).get("total_commits", 0)
-    
-    # Path C: Fallback - Check if total_commits is directly in the finding
-    if commit_count == 0:
-        commit_count = git_finding.get("total_commits", 0)
-        
-    # Path D: Global Fallback - check state directly (if your RepoAgent writes to root)
-    if commit_count == 0:
-        commit_count = state.get("commit_count", 0)
+    features = features_of(state)
 
-    # --- 2. FORENSIC SCANNING LOGIC ---
-    has_pydantic = any("pydantic" in str(f).lower() or "basemodel" in str(f).lower() for f in repo_findings)
-    has_parallel = any("parallel" in str(f).lower() or "fan-out" in str(f).lower() for f in vision_findings)
-    has_docs = any(f.get("found") for f in doc_findings)
+    # --- 1. GIT CHRONOLOGY (The 22-Commit Rule) ---
+    commit_count = features.commit_count
+
+    # --- 2. FORENSIC FACTS ---
+    has_pydantic = features.has_pydantic
+    has_parallel = features.parallel_fan_out
+    has_docs = features.docs_found
 
     new_opinions = []
 
@@ -0,0 +1,216 @@
+import csv
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, TextIO
+
+# Compiled once per worker process by _init_worker, then reused for every audit it runs.
+_worker_app = None
+
+def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Reads a cohort manifest.
+    CSV needs a 'repo_url' column (optional 'pdf_path', 'rubric_id'); JSONL needs one object per line.
+    """
+    entries = []
+    if manifest_path.endswith((".jsonl", ".ndjson")):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    else:
+        with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+            entries = list(csv.DictReader(f))
+
+    jobs = []
+    for index, row in enumerate(entries):
+        repo_url = (row.get("repo_url") or row.get("repo") or "").strip()
+        if not repo_url:
+            raise ValueError(f"Manifest row {index + 1} has no repo_url: {row}")
+        pdf_path = (row.get("pdf_path") or row.get("pdf") or "").strip() or "HEURISTIC_MODE"
+        rubric_id = (row.get("rubric_id") or row.get("rubric") or "").strip() or None
+        jobs.append({"index": index, "repo_url": repo_url, "pdf_path": pdf_path, "rubric_id": rubric_id})
+    return jobs
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def _init_worker(variant: str = "full", rubric_plans: Optional[List[Any]] = None):
+    """
+    Compiles the requested graph variant once per worker and keeps node chatter off the results stream.
+    Rubric plans compiled by the parent are installed as-is, so no worker parses a rubric.
+    """
+    global _worker_app
+    sys.stdout = sys.stderr
+    if rubric_plans:
+        from src.core.rubric_registry import rubric_registry
+        rubric_registry.install(rubric_plans)
+    from src.core.graph import get_graph
+    _worker_app = get_graph(variant)
+
+def _audit_worker(job: Dict[str, Any], retries: int, report_dir: Optional[str], variant: str = "full",
+                  rubric_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs one audit in a pool worker. Never raises: failures are isolated into the result.
+    Auditing comes from src.core.runner and report writing from src.utils.formatters;
+    workers never import the CLI entry point (main).
+    """
+    from src.core.runner import audit_repository, CloneError
+    from src.utils.formatters import write_report
+
+    started = time.perf_counter()
+    result = {
+        "type": "result",
+        "index": job["index"],
+        "repo_url": job["repo_url"],
+        "pdf_path": job["pdf_path"],
+    }
+    try:
+        state = audit_repository(job["repo_url"], job["pdf_path"], retries=retries, app=_worker_app, variant=variant,
+                                 rubric_id=job.get("rubric_id") or rubric_id)
+        result.update({
+            "status": "ok",
+            "score": state.get("aggregated_score", 0.0),
+            "verdict": state.get("global_verdict"),
+            "attempts": state.get("clone_attempts", 1),
+            "reuse": state.get("reuse"),
+            "rubric_id": state.get("rubric_id"),
+        })
+        if variant == "evidence":
+            # No rulings to summarize: the findings are the result (re-judge them later with --rejudge).
+            from src.core.progress import to_jsonable
+            result["evidences"] = to_jsonable(state.get("evidences", {}))
+        if report_dir:
+            result["report"] = write_report(state, os.path.join(report_dir, f"{job['index']:04d}_{_slug(job['repo_url'])}.md"))
+    except CloneError as e:
+        result.update({"status": "clone_failed", "error": str(e), "transient": e.transient})
+    except Exception as e:
+        result.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    result["elapsed_s"] = round(time.perf_counter() - started, 3)
+    # Pool processes exit without running atexit, so hand this audit's spans over now.
+    from src.infrastructure.observability import tracer
+    tracer.flush()
+    return result
+
+def _run_isolated(job: Dict[str, Any], retries: int, report_dir: Optional[str], variant: str,
+                  rubric_id: Optional[str], rubric_plans: List[Any]) -> Dict[str, Any]:
+    """
+    Reruns a job that was in flight when a worker crashed, alone on a one-worker pool,
+    so a crash is only ever charged to the job that causes it. Two crashes fail the job.
+    """
+    for _ in range(2):
+        with ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(variant, rubric_plans)) as solo:
+            try:
+                return solo.submit(_audit_worker, job, retries, report_dir, variant, rubric_id).result()
+            except BrokenProcessPool:
+                continue
+    return {"type": "result", "index": job["index"], "repo_url": job["repo_url"], "pdf_path": job["pdf_path"],
+            "status": "error", "error": "Worker process crashed twice", "elapsed_s": None}
+
+def _slug(repo_url: str) -> str:
+    name = repo_url.rstrip("/").split("/")[-1]
+    if name.endswith(".git"):
+        name = name[:-4]
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name) or "repo"
+
+def run_batch(
+    manifest_path: str,
+    workers: int = 4,
+    out: TextIO = sys.stdout,
+    retries: int = 2,
+    report_dir: Optional[str] = None,
+    variant: str = "full",
+    rubric_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Batch Audit Mode: audits a whole cohort on a bounded process pool.
+    Streams one JSON line per repository as it finishes, then a summary line.
+    variant='evidence' collects findings without convening the judges.
+    `rubric_id` applies to rows without their own 'rubric_id' column.
+    """
+    from src.core.rubric_registry import default_rubric_id, rubric_registry
+
+    jobs = load_manifest(manifest_path)
+    # Every rubric the cohort uses is compiled here once (an unknown id fails before any
+    # worker starts) and shipped to the workers with the pool initializer.
+    rubric_id = rubric_id or default_rubric_id()
+    rubric_plans = rubric_registry.snapshot([rubric_id] + [job["rubric_id"] for job in jobs if job["rubric_id"]])
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+
+    pending = list(reversed(jobs))
+    in_flight = {}
+    latencies, ok, failed = [], 0, 0
+    window = max(1, workers) * 2
+    started = time.perf_counter()
+
+    def emit(record: Dict[str, Any]):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    def tally(record: Dict[str, Any]):
+        nonlocal ok, failed
+        if record["elapsed_s"] is not None:
+            latencies.append(record["elapsed_s"])
+        if record["status"] == "ok":
+            ok += 1
+        else:
+            failed += 1
+        emit(record)
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(variant, rubric_plans))
+    try:
+        while pending or in_flight:
+            # Keep the pool fed without materializing a future per manifest row.
+            while pending and len(in_flight) < window:
+                job = pending.pop()
+                in_flight[executor.submit(_audit_worker, job, retries, report_dir, variant, rubric_id)] = job
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            suspects = []
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    tally(future.result())
+                except BrokenProcessPool:
+                    suspects.append(job)
+
+            if suspects:
+                # A worker died hard (OOM, segfault in a native lib) and took every in-flight
+                # future down with it. Only one of them caused it: rerun each alone so the
+                # crash is charged to that job and the rest finish normally.
+                suspects += in_flight.values()
+                in_flight.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                for job in sorted(suspects, key=lambda j: j["index"]):
+                    tally(_run_isolated(job, retries, report_dir, variant, rubric_id, rubric_plans))
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(variant, rubric_plans))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    wall = time.perf_counter() - started
+    summary = {
+        "type": "summary",
+        "total": len(jobs),
+        "ok": ok,
+        "failed": failed,
+        "workers": workers,
+        "variant": variant,
+        "rubric_id": rubric_id,
+        "wall_s": round(wall, 3),
+        "throughput_per_min": round(len(jobs) / wall * 60, 2) if wall > 0 else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 3),
+        "latency_p95_s": round(percentile(latencies, 95), 3),
+    }
+    emit(summary)
+    return summary
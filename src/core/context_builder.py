@@ -1,25 +1,19 @@
-import os
-import json
 from src.core.state import AgentState
+from src.core.rubric_registry import get_rubric
 
 def context_builder_node(state: AgentState):
     """
-    The Constitutional Layer: Loads the rubric and maps it to the workspace.
+    The Constitutional Layer: Binds the compiled rubric to the workspace.
     """
-    # 1. THE EFFORT: Get absolute path to the config file
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    rubric_path = os.path.join(base_dir, "src", "config", "rubric.json")
-    
-    # 2. THE RESULT: Load the law or fail gracefully
-    if not os.path.exists(rubric_path):
-        raise FileNotFoundError(f"⚖️ CONSTITUTION MISSING: Please create {rubric_path}")
+    # 1. THE EFFORT: Resolve the rubric plan (compiled once per process by the registry)
+    plan = get_rubric(state.get("rubric_id"))
 
-    with open(rubric_path, "r") as f:
-        rubric_data = json.load(f)
+    # 2. THE RESULT: An unknown or malformed rubric has already failed with a RubricError
+    print(f"📜 CONTEXT: Rubric '{plan.rubric_id}' loaded. Law of Fact Supremacy active.")
 
-    print("📜 CONTEXT: Rubric loaded. Law of Fact Supremacy active.")
-    
     return {
+        "rubric_id": plan.rubric_id,
+        "rubric_sha": plan.sha256,
         "log": "Rubric successfully bound to state.",
-        "metadata": {"rubric_version": rubric_data.get("version")}
-    }
\ No newline at end of file
+        "metadata": {"rubric_version": plan.version, "rubric_name": plan.name},
+    }
@@ -1,19 +1,76 @@
-from typing import Dict, Any
+import os
+from typing import Dict, Any, List, Optional, Set
 from src.core.state import AgentState
+# --- Protocol B.1: Artifact Routing Table (detective -> agent key, artifacts served) ---
+from src.core.rubric_registry import DETECTIVES, get_rubric
+
+def present_artifacts(state: AgentState, targets: Optional[Set[str]] = None) -> Dict[str, str]:
+    """
+    Which artifacts this audit actually has, with the reason for each missing one.
+    The PDF is only opened for its image count when 'pdf_images' is among `targets`
+    (or no targets are given); for 'pdf_report' alone a file existence check suffices.
+    """
+    workspace = state.get("workspace_path") or ""
+    pdf_path = state.get("pdf_path") or ""
+    missing = {}
+    if not (os.path.isdir(workspace) and any(os.scandir(workspace))):
+        missing["github_repo"] = missing["github_repo_and_audit_folder"] = f"workspace '{workspace}' is empty"
+    if not os.path.isfile(pdf_path):
+        reason = "heuristic mode (no PDF supplied)" if pdf_path in ("", "HEURISTIC_MODE") else f"PDF '{pdf_path}' not found"
+        missing["pdf_report"] = missing["pdf_images"] = reason
+    elif targets is None or "pdf_images" in targets:
+        # Extraction lands in the PDF cache, so the doc analyst reads the same pages for free.
+        from src.utils.pdf_cache import PYMUPDF, pdf_cache
+        with pdf_cache.open(pdf_path, sha=(state.get("incremental") or {}).get("pdf_sha"), extractor=PYMUPDF) as pdf:
+            if pdf.image_count() == 0:
+                missing["pdf_images"] = "the PDF has no embedded images"
+    return missing
 
 def dispatcher_node(state: AgentState) -> Dict[str, Any]:
     """
     The Traffic Controller: Coordinates the parallel Fan-Out.
-    Ensures that forensic criteria are routed to the correct detectives.
+    Routes only to detectives whose rubric artifacts are targeted and actually present;
+    every skipped detective files an explicit 'Dispatch' finding saying why.
     """
-    # 1. THE EFFORT: Log the start of the parallel forensic sweep
+    # 1. THE EFFORT: Match the rubric's targets against what this audit can inspect
     workspace = state.get("workspace_path", "Unknown")
-    
-    print(f"📡 DISPATCHER: Initiating parallel scan on {workspace}")
-    
-    # 2. THE RESULT: We return a status that the graph edges use to trigger 
-    # repo_detective, docs_detective, and vision_detective simultaneously.
+    plan = get_rubric(state.get("rubric_id"))
+    rubric_id, targets = plan.rubric_id, set(plan.targets)
+    missing = present_artifacts(state, targets)
+
+    dispatched: List[str] = []
+    skipped: Dict[str, List[Dict[str, Any]]] = {}
+    for node, (agent, served) in DETECTIVES.items():
+        wanted = sorted(served & targets)
+        if not wanted:
+            reason = f"rubric '{rubric_id}' targets none of {sorted(served)}"
+        elif all(artifact in missing for artifact in wanted):
+            reason = missing[wanted[0]]
+        else:
+            dispatched.append(node)
+            continue
+        skipped[agent] = [{
+            "found": False,
+            "criterion": "Dispatch",
+            "rationale": f"SKIPPED: {node} not dispatched; {reason}.",
+            "metadata": {"skipped": True, "detective": node, "target_artifacts": wanted or sorted(served)},
+        }]
+
+    print(f"📡 DISPATCHER: Initiating parallel scan on {workspace} -> {', '.join(dispatched) or 'no detectives'}")
+
+    # 2. THE RESULT: route_detectives turns 'dispatch' into one Send per detective.
     return {
         "global_verdict": "DISPATCHING",
-        "log": "Dispatcher active: Routing to Repo and Doc agents."
-    }
\ No newline at end of file
+        "evidences": skipped,
+        "dispatch": {"rubric_id": rubric_id, "detectives": dispatched,
+                     "skipped": sorted(s[0]["metadata"]["detective"] for s in skipped.values())},
+        "log": f"Dispatcher active: Routing to {', '.join(dispatched) or 'the aggregator'}.",
+    }
+
+def route_detectives(state: AgentState):
+    """Conditional edge: a dynamic Send per dispatched detective, or straight to the aggregator."""
+    from langgraph.types import Send
+    detectives = (state.get("dispatch") or {}).get("detectives", [])
+    if not detectives:
+        return ["aggregator"]
+    return [Send(node, state) for node in detectives]
@@ -0,0 +1,252 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# --- Protocol A.1: Compact Records ---
+class _Record:
+    """
+    Slotted record with just enough of the dict and pydantic surface (get, [], keys,
+    model_dump) that existing detectives, judges and renderers keep working unchanged.
+    """
+    __slots__ = ()
+    _aliases: Dict[str, str] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        key = self._aliases.get(key, key)
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __getitem__(self, key: str) -> Any:
+        key = self._aliases.get(key, key)
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return self._aliases.get(key, key) in self.__slots__
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        if other is self:
+            return True
+        return type(other) is type(self) and all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = " ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class Evidence(_Record):
+    """Forensic proof captured by Detectives."""
+    __slots__ = ("found", "criterion", "rationale", "metadata")
+    # Doc and vision detectives name their criterion 'goal'.
+    _aliases = {"goal": "criterion"}
+
+    def __init__(self, found: bool, criterion: str, rationale: str, metadata: Optional[Dict[str, Any]] = None):
+        self.found = bool(found)
+        self.criterion = criterion
+        self.rationale = rationale
+        self.metadata = metadata if metadata is not None else {}
+
+    @classmethod
+    def coerce(cls, finding: Any) -> "Evidence":
+        """
+        Records are shared by every forked store version, so a finding's metadata is
+        copied on the way in: the detective that built the dict cannot change it later.
+        """
+        if isinstance(finding, cls):
+            return finding
+        return cls(
+            found=finding.get("found", False),
+            criterion=finding.get("criterion") or finding.get("goal") or "Unknown Goal",
+            rationale=finding.get("rationale") or finding.get("reasoning") or "",
+            metadata=dict(finding.get("metadata") or {}),
+        )
+
+    def model_dump(self) -> Dict[str, Any]:
+        # A dumped finding gets its own metadata dict, never the stored one.
+        return {"found": self.found, "criterion": self.criterion, "rationale": self.rationale,
+                "metadata": dict(self.metadata)}
+
+class Opinion(_Record):
+    __slots__ = ("judge", "criterion", "score", "argument", "statute")
+
+    def __init__(self, judge: str, criterion: str, score: float, argument: str, statute: str):
+        self.judge = judge
+        self.criterion = criterion
+        self.score = float(score)
+        self.argument = argument
+        self.statute = statute
+
+    @classmethod
+    def coerce(cls, opinion: Any) -> "Opinion":
+        if isinstance(opinion, cls):
+            return opinion
+        if not hasattr(opinion, "get"):
+            opinion = opinion.model_dump()
+        return cls(**{name: opinion.get(name) for name in cls.__slots__})
+
+# --- Protocol B.2: Versioned Append Log ---
+class _Log:
+    """
+    Append-only log shared by successive store versions. A version is a prefix length,
+    so older checkpoints never observe later writes and merging never copies.
+    index[group][key] is the position a key was written at, or the list of positions
+    once it has been overwritten; dict order doubles as first-write order.
+    """
+    __slots__ = ("records", "index")
+
+    def __init__(self):
+        self.records: List[Any] = []
+        self.index: Dict[Hashable, Dict[Hashable, Any]] = {}
+
+    def append(self, group: Hashable, key: Hashable, record: Any):
+        keys = self.index.get(group)
+        if keys is None:
+            keys = self.index[group] = {}
+        pos = keys.get(key)
+        if pos is None:
+            keys[key] = len(self.records)
+        elif isinstance(pos, int):
+            keys[key] = [pos, len(self.records)]
+        else:
+            pos.append(len(self.records))
+        self.records.append(record)
+
+    def latest(self, group: Hashable, key: Hashable, size: int) -> Optional[Any]:
+        pos = self.index.get(group, {}).get(key)
+        if pos is None:
+            return None
+        if isinstance(pos, int):
+            return self.records[pos] if pos < size else None
+        for p in reversed(pos):
+            if p < size:
+                return self.records[p]
+        return None
+
+    @staticmethod
+    def first(pos: Any) -> int:
+        return pos if isinstance(pos, int) else pos[0]
+
+    def fork(self, size: int) -> "_Log":
+        """A private copy of the first `size` entries, for a version whose log moved on."""
+        writes = []
+        for group, keys in self.index.items():
+            for key, pos in keys.items():
+                for p in [pos] if isinstance(pos, int) else pos:
+                    if p < size:
+                        writes.append((p, group, key))
+        log = _Log()
+        for p, group, key in sorted(writes, key=lambda w: w[0]):
+            log.append(group, key, self.records[p])
+        return log
+
+class _KeyedStore:
+    __slots__ = ("_log", "_size")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._log = _Log()
+        self._size = 0
+        self._upsert_into(self, items)
+
+    def _entries(self, items: Any) -> Iterator[Tuple[Hashable, Hashable, Any]]:
+        raise NotImplementedError
+
+    def _upsert_into(self, target: "_KeyedStore", items: Any):
+        log = target._log
+        for group, key, record in self._entries(items):
+            if log.latest(group, key, target._size) == record:
+                continue  # idempotent: re-sending an identical finding is a no-op
+            log.append(group, key, record)
+            target._size = len(log.records)
+
+    def merge(self, items: Any):
+        """
+        Returns a new version with `items` upserted; this version is left untouched.
+        O(len(items)) while this version is the log's tip, which is the normal case.
+        """
+        merged = object.__new__(type(self))
+        merged._log = self._log if self._size == len(self._log.records) else self._log.fork(self._size)
+        merged._size = self._size
+        self._upsert_into(merged, items)
+        return merged
+
+    def _visible(self, group: Hashable) -> List[Any]:
+        records, size, first = self._log.records, self._size, _Log.first
+        out = []
+        for pos in self._log.index.get(group, {}).values():
+            if first(pos) >= size:
+                continue
+            if isinstance(pos, int):
+                out.append(records[pos])
+            else:
+                out.append(records[max(p for p in pos if p < size)])
+        return out
+
+    def _group_visible(self, group: Hashable) -> bool:
+        keys = self._log.index.get(group)
+        return bool(keys) and _Log.first(next(iter(keys.values()))) < self._size
+
+class EvidenceStore(_KeyedStore, Mapping):
+    """
+    The evidence ledger: agent -> findings, one finding per (agent, criterion).
+    Reads like the Dict[str, List] it replaces.
+    """
+    __slots__ = ()
+
+    def _entries(self, items: Any):
+        for agent, findings in (items or {}).items():
+            for finding in findings if isinstance(findings, (list, tuple)) else [findings]:
+                if not finding:
+                    continue
+                record = Evidence.coerce(finding)
+                yield agent, record.criterion, record
+
+    def __getitem__(self, agent: str) -> List[Evidence]:
+        findings = self._visible(agent)
+        if not findings:
+            raise KeyError(agent)
+        return findings
+
+    def __iter__(self) -> Iterator[str]:
+        for agent in self._log.index:
+            if self._group_visible(agent):
+                yield agent
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def model_dump(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {agent: [f.model_dump() for f in findings] for agent, findings in self.items()}
+
+    def __repr__(self) -> str:
+        return f"EvidenceStore({ {agent: len(findings) for agent, findings in self.items()} })"
+
+class OpinionStore(_KeyedStore, Sequence):
+    """Judicial opinions in filing order, one per (judge, criterion, statute)."""
+    __slots__ = ()
+
+    def _entries(self, items: Any):
+        for opinion in items or []:
+            record = Opinion.coerce(opinion)
+            yield None, (record.judge, record.criterion, record.statute), record
+
+    def _all(self) -> List[Opinion]:
+        return self._visible(None)
+
+    def __getitem__(self, index):
+        return self._all()[index]
+
+    def __iter__(self) -> Iterator[Opinion]:
+        return iter(self._all())
+
+    def __len__(self) -> int:
+        return len(self._all())
+
+    def model_dump(self) -> List[Dict[str, Any]]:
+        return [op.model_dump() for op in self]
+
+    def __repr__(self) -> str:
+        return f"OpinionStore({len(self)} opinions)"
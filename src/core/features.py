@@ -0,0 +1,106 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+
+# --- Protocol A.3: Precomputed Judicial Facts ---
+class FeatureIndex(BaseModel):
+    """
+    Typed facts distilled from the evidence ledger once, in the aggregator.
+    Judges rule on these fields instead of searching rationale text, so a judge's
+    cost does not grow with the number of findings.
+
+    The index is deliberately lossy. Judges see only the counts and flags below, and
+    never the rest of a finding's metadata: model, reducer and node names, graph files
+    and edge count, operator reducers, sandbox files, the git authors, churn, gap
+    histogram and burst figures, marker texts, hallucinated paths, and every rationale.
+    A repeated agent/criterion key keeps only its first finding. None of this is lost to
+    the audit: state["evidences"] is left untouched, and the report, the result store and
+    --rejudge all read the full ledger.
+    """
+    # Git chronology (repo_agent / git)
+    commit_count: int = 0
+    active_days: int = 0
+    bulk_upload: bool = False
+    # State management (repo_agent / state)
+    state_verified: bool = False
+    pydantic_models: int = 0
+    annotated_reducers: int = 0
+    # Orchestration (repo_agent / graph, vision_agent / Graph Orchestration)
+    graph_verified: bool = False
+    graph_nodes: int = 0
+    parallel_fan_out: bool = False
+    # Security & resilience (repo_agent / security)
+    sandboxed: bool = False
+    try_blocks: int = 0
+    # Documentation (doc_agent)
+    docs_found: bool = False
+    theory_markers: int = 0
+    path_hallucinations: int = 0
+    # Per-criterion pass/fail, keyed "agent/criterion"
+    criteria: Dict[str, bool] = {}
+    total_findings: int = 0
+
+    def passed(self, agent: str, criterion: str) -> bool:
+        return self.criteria.get(f"{agent}/{criterion}", False)
+
+    @property
+    def has_pydantic(self) -> bool:
+        return self.pydantic_models > 0
+
+    @property
+    def has_error_handling(self) -> bool:
+        return self.try_blocks > 0
+
+def build_feature_index(evidences: Dict[str, Any]) -> FeatureIndex:
+    """
+    Single pass over every finding. Facts come from criterion keys and structured
+    metadata only; free-text rationales are never inspected.
+    """
+    criteria: Dict[str, bool] = {}
+    metadata: Dict[str, Dict[str, Any]] = {}
+    total = 0
+    for agent, findings in (evidences or {}).items():
+        for finding in findings if isinstance(findings, list) else [findings]:
+            # Plain dicts and slotted Evidence records both answer .get()
+            if not finding or not hasattr(finding, "get"):
+                continue
+            total += 1
+            key = f"{agent}/{finding.get('criterion') or finding.get('goal') or 'Unknown Goal'}"
+            # Plain-dict ledgers may repeat a key; the first is the detective's own finding.
+            if key not in criteria:
+                criteria[key] = bool(finding.get("found"))
+                metadata[key] = finding.get("metadata") or {}
+
+    git = metadata.get("repo_agent/git", {})
+    state = metadata.get("repo_agent/state", {})
+    graph = metadata.get("repo_agent/graph", {})
+    security = metadata.get("repo_agent/security", {})
+    theory = metadata.get("doc_agent/Theoretical Depth", {})
+    host = metadata.get("doc_agent/Host Analysis Accuracy", {})
+
+    return FeatureIndex(
+        commit_count=git.get("total_commits", 0),
+        active_days=git.get("active_days", 0),
+        bulk_upload=git.get("bulk_upload", False),
+        state_verified=criteria.get("repo_agent/state", False),
+        pydantic_models=len(state.get("models", [])),
+        annotated_reducers=len(state.get("reducers", [])),
+        graph_verified=criteria.get("repo_agent/graph", False),
+        graph_nodes=len(graph.get("nodes", [])),
+        parallel_fan_out=criteria.get("vision_agent/Graph Orchestration", False),
+        sandboxed=criteria.get("repo_agent/security", False),
+        try_blocks=security.get("try_blocks", 0),
+        docs_found=any(found for key, found in criteria.items() if key.startswith("doc_agent/")),
+        theory_markers=len(theory.get("markers", {})),
+        path_hallucinations=len(host.get("hallucinations", {})),
+        criteria=criteria,
+        total_findings=total,
+    )
+
+def features_of(state: Dict[str, Any]) -> FeatureIndex:
+    """The aggregator's index, or one built on the spot for graphs that skip the aggregator."""
+    features: Optional[Any] = state.get("features")
+    if isinstance(features, FeatureIndex):
+        return features
+    if isinstance(features, dict):
+        return FeatureIndex(**features)
+    return build_feature_index(state.get("evidences", {}))
@@ -1,61 +1,119 @@
-from langgraph.graph import StateGraph, END
-from src.core.state import AgentState
-
-# --- 1. Infrastructure Imports ---
-from src.core.context_builder import context_builder_node
-from src.core.dispatcher import dispatcher_node
-from src.nodes.detective import detective_node as aggregator # Your detective.py file
-
-# --- 2. Detective & Judge Imports ---
-from src.agents.detectives.repo import repo_investigator
-from src.agents.detectives.docs import doc_analyst
-from src.agents.detectives.vision import vision_inspector
-from src.agents.judges.prosecutor import prosecutor
-from src.agents.judges.defense import defense_node as defense
-from src.agents.judges.tech_lead import tech_lead_node as tech_lead
-from src.agents.justice.chief_justice import chief_justice_node
-
-builder = StateGraph(AgentState)
-
-# --- 3. Register Nodes ---
-builder.add_node("context_builder", context_builder_node)
-builder.add_node("dispatcher", dispatcher_node)
-builder.add_node("repo_detective", repo_investigator)
-builder.add_node("docs_detective", doc_analyst)
-builder.add_node("vision_detective", vision_inspector)
-builder.add_node("aggregator", aggregator) # The 'Clerk'
-builder.add_node("prosecutor", prosecutor)
-builder.add_node("defense", defense)
-builder.add_node("tech_lead", tech_lead)
-builder.add_node("chief_justice", chief_justice_node)
-
-# --- 4. Define the Sovereign Parallel Flow ---
-
-# STEP A: Setup
-builder.set_entry_point("context_builder")
-builder.add_edge("context_builder", "dispatcher")
-
-# STEP B: Detective Fan-Out (Parallel Evidence Collection)
-builder.add_edge("dispatcher", "repo_detective")
-builder.add_edge("dispatcher", "docs_detective")
-builder.add_edge("dispatcher", "vision_detective")
-
-# STEP C: Detective Fan-In (The Aggregator barrier)
-# This ensures ALL evidence is collected before Judges see it
-builder.add_edge("repo_detective", "aggregator")
-builder.add_edge("docs_detective", "aggregator")
-builder.add_edge("vision_detective", "aggregator")
-
-# STEP D: Judicial Fan-Out (The Dialectical Debate)
-# Now the Judges run in parallel on the SAME aggregated evidence
-builder.add_edge("aggregator", "prosecutor")
-builder.add_edge("aggregator", "defense")
-builder.add_edge("aggregator", "tech_lead")
-
-# STEP E: Final Synthesis
-builder.add_edge("prosecutor", "chief_justice")
-builder.add_edge("defense", "chief_justice")
-builder.add_edge("tech_lead", "chief_justice")
-builder.add_edge("chief_justice", END)
-
-forensic_app = builder.compile()
\ No newline at end of file
+import threading
+from typing import Any, Dict
+from src.core.instrumentation import add_node_observer, instrument_node
+from src.infrastructure.observability import tracer
+
+# Node spans go to the configured trace exporter (local JSONL by default) off the hot path
+add_node_observer(tracer.observe_node)
+
+# Named graph variants: which stages of the courtroom each one runs.
+#   full     - context -> detectives -> aggregator -> judges -> chief justice
+#   evidence - context -> detectives -> aggregator (no rulings)
+#   rejudge  - judges -> chief justice over evidence supplied in the input state
+GRAPH_VARIANTS = ("full", "evidence", "rejudge")
+
+def _add_evidence_stage(builder, register):
+    """Detective fan-out and the aggregator barrier; returns the stage's exit node."""
+    from src.core.context_builder import context_builder_node
+    from src.core.dispatcher import dispatcher_node, route_detectives, DETECTIVES
+    from src.nodes.detective import detective_node as aggregator # Your detective.py file
+    from src.agents.detectives.repo import repo_investigator
+    from src.agents.detectives.docs import doc_analyst
+    from src.agents.detectives.vision import vision_inspector
+
+    register("context_builder", context_builder_node)
+    register("dispatcher", dispatcher_node)
+    register("repo_detective", repo_investigator)
+    register("docs_detective", doc_analyst)
+    register("vision_detective", vision_inspector)
+    register("aggregator", aggregator) # The 'Clerk'
+
+    # STEP A: Setup
+    builder.set_entry_point("context_builder")
+    builder.add_edge("context_builder", "dispatcher")
+
+    # STEP B: Detective Fan-Out (Parallel Evidence Collection)
+    # Only the detectives the rubric targets, and whose artifacts exist, are sent work
+    builder.add_conditional_edges("dispatcher", route_detectives, [*DETECTIVES, "aggregator"])
+
+    # STEP C: Detective Fan-In (The Aggregator barrier)
+    # This ensures ALL evidence is collected before Judges see it
+    builder.add_edge("repo_detective", "aggregator")
+    builder.add_edge("docs_detective", "aggregator")
+    builder.add_edge("vision_detective", "aggregator")
+    return "aggregator"
+
+def _add_judicial_stage(builder, register, source: str):
+    """The three judges fan out from `source` in parallel and fan in at the chief justice."""
+    from src.agents.judges.prosecutor import prosecutor
+    from src.agents.judges.defense import defense_node as defense
+    from src.agents.judges.tech_lead import tech_lead_node as tech_lead
+    from src.agents.justice.chief_justice import chief_justice_node
+    from src.core.incremental import reusable_judge
+
+    # Judges replay their prior rulings when the evidence is unchanged since the last audit
+    register("prosecutor", reusable_judge("prosecutor", prosecutor))
+    register("defense", reusable_judge("defense", defense))
+    register("tech_lead", reusable_judge("tech_lead", tech_lead))
+    register("chief_justice", chief_justice_node)
+
+    # STEP D: Judicial Fan-Out (The Dialectical Debate)
+    # Now the Judges run in parallel on the SAME aggregated evidence
+    builder.add_edge(source, "prosecutor")
+    builder.add_edge(source, "defense")
+    builder.add_edge(source, "tech_lead")
+
+    # STEP E: Final Synthesis
+    builder.add_edge("prosecutor", "chief_justice")
+    builder.add_edge("defense", "chief_justice")
+    builder.add_edge("tech_lead", "chief_justice")
+    return "chief_justice"
+
+def build_graph(variant: str = "full"):
+    """
+    Builds and compiles one graph variant. LangGraph and the node modules are imported here,
+    not at module load, so CLI calls, health checks and batch parents that never run a graph
+    skip them; a variant only imports the stages it runs.
+    """
+    if variant not in GRAPH_VARIANTS:
+        raise ValueError(f"Unknown graph variant '{variant}' (expected one of {', '.join(GRAPH_VARIANTS)})")
+    from langgraph.graph import StateGraph, START, END
+    from src.core.state import AgentState
+
+    builder = StateGraph(AgentState)
+
+    def register(name, node):
+        """Every node reports its own timing into 'node_timings'; the agents stay untouched."""
+        builder.add_node(name, instrument_node(name, node))
+
+    if variant == "rejudge":
+        last = _add_judicial_stage(builder, register, START)
+    else:
+        last = _add_evidence_stage(builder, register)
+        if variant == "full":
+            last = _add_judicial_stage(builder, register, last)
+    builder.add_edge(last, END)
+    return builder.compile()
+
+_graph_lock = threading.Lock()
+_graphs: Dict[str, Any] = {}
+
+def get_graph(variant: str = "full"):
+    """The compiled variant, built once per process on first use and shared by every caller."""
+    graph = _graphs.get(variant)
+    if graph is None:
+        with _graph_lock:
+            graph = _graphs.get(variant)
+            if graph is None:
+                graph = _graphs[variant] = build_graph(variant)
+    return graph
+
+def get_forensic_app():
+    """The full audit graph."""
+    return get_graph("full")
+
+def __getattr__(name):
+    # `from src.core.graph import forensic_app` keeps working; it now compiles on first access.
+    if name == "forensic_app":
+        return get_forensic_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
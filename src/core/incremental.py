@@ -0,0 +1,219 @@
+import copy
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.utils.pdf_cache import file_sha256
+
+# Bump when detective/judge logic changes in a way that invalidates stored evidence.
+LEDGER_VERSION = "3"
+
+def _git_output(workspace: str, *args: str) -> Optional[str]:
+    result = subprocess.run(["git", "-C", workspace, *args], capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def evidence_fingerprint(evidences: Dict[str, Any]) -> str:
+    """Stable hash of the evidence a judge rules on; equal fingerprints mean equal rulings."""
+    def normalize(value):
+        if hasattr(value, "model_dump"):
+            return value.model_dump()
+        return value
+    payload = {agent: [normalize(f) for f in (findings if isinstance(findings, list) else [findings])]
+               for agent, findings in (evidences or {}).items()}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class AuditLedgerStore:
+    """
+    Remembers, per repository, the last audited HEAD and the evidence/opinions it produced.
+    One JSON document per repo URL, replaced atomically after every audit.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or os.getenv("FORENSIC_LEDGER_DIR", Path.home() / ".cache" / "forensic-swarm" / "ledgers")).expanduser()
+
+    def _path(self, repo_url: str) -> Path:
+        return self.root / f"{hashlib.sha1(repo_url.strip().rstrip('/').encode('utf-8')).hexdigest()}.json"
+
+    def load(self, repo_url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(repo_url), "r", encoding="utf-8") as f:
+                ledger = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return ledger if ledger.get("version") == LEDGER_VERSION else None
+
+    def save(self, repo_url: str, ledger: Dict[str, Any]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(ledger, f, default=str)
+        os.replace(tmp, self._path(repo_url))
+
+ledger_store = AuditLedgerStore()
+
+def prepare_incremental(repo_url: str, workspace: str, pdf_path: Optional[str] = None,
+                        store: Optional[AuditLedgerStore] = None, rev: str = "HEAD",
+                        pdf_sha: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Builds the 'incremental' state entry: the new HEAD, the files changed since the
+    last audited commit, and the prior evidence/opinions that may be reused.
+    Callers that already hashed the PDF pass its `pdf_sha` so it is not read twice.
+    Falls back to a cold audit whenever the previous HEAD is not an ancestor we can diff.
+    """
+    store = store or ledger_store
+    head = _git_output(workspace, "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}")
+    context = {
+        "head": head,
+        "previous_head": None,
+        "pdf_sha": pdf_sha or file_sha256(pdf_path),
+        "changed_files": [],
+        "tree_changed": True,
+        "pdf_changed": True,
+        "prior_evidences": {},
+        "prior_opinions": {},
+        "cold": True,
+    }
+    if os.getenv("FORENSIC_INCREMENTAL", "1") == "0" or not head:
+        return context
+
+    ledger = store.load(repo_url)
+    if not ledger or not ledger.get("head"):
+        return context
+
+    previous = ledger["head"]
+    diff = _git_output(workspace, "diff", "--name-status", "--no-renames", previous, head) if previous != head else ""
+    if diff is None:
+        return context  # history rewritten or commit unreachable: cold audit
+
+    changed, tree_changed = [], False
+    for line in diff.splitlines():
+        status, _, path = line.partition("\t")
+        changed.append(path)
+        tree_changed = tree_changed or status[:1] in ("A", "D")
+
+    context.update({
+        "previous_head": previous,
+        "changed_files": changed,
+        "tree_changed": tree_changed,
+        "pdf_changed": context["pdf_sha"] != ledger.get("pdf_sha"),
+        "prior_evidences": ledger.get("evidences", {}),
+        "prior_opinions": ledger.get("opinions", {}),
+        "cold": False,
+    })
+    return context
+
+def inputs_changed(context: Dict[str, Any], inputs: List[str]) -> bool:
+    """
+    Input tokens: '@history' (any new commit), '@pdf' (design doc bytes), '@tree'
+    (files added/removed), or a path/glob matched against the changed files.
+    """
+    if context.get("cold", True):
+        return True
+    for token in inputs:
+        if token == "@history":
+            if context.get("head") != context.get("previous_head"):
+                return True
+        elif token == "@pdf":
+            if context.get("pdf_changed"):
+                return True
+        elif token == "@tree":
+            if context.get("tree_changed"):
+                return True
+        elif any(fnmatch.fnmatch(path, token) for path in context.get("changed_files", [])):
+            return True
+    return False
+
+def can_reuse(state: Dict[str, Any], agent: str, criterion: str, inputs: List[str]) -> bool:
+    """True when prior evidence for the criterion exists and none of its inputs changed."""
+    context = state.get("incremental") or {}
+    prior = context.get("prior_evidences", {}).get(agent, {}).get(criterion)
+    return prior is not None and not inputs_changed(context, inputs)
+
+def reuse_or_compute(state: Dict[str, Any], agent: str, criterion: str, inputs: List[str],
+                     compute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Returns (evidence, log_entry). Prior evidence is reused when none of its inputs changed;
+    otherwise compute() runs. Either way the evidence records its inputs, so warm and
+    cold audits produce identical findings.
+    """
+    if can_reuse(state, agent, criterion, inputs):
+        prior = state["incremental"]["prior_evidences"][agent][criterion]
+        return copy.deepcopy(prior), {"agent": agent, "criterion": criterion, "reused": True}
+
+    evidence = compute()
+    evidence.setdefault("metadata", {})["inputs"] = list(inputs)
+    return evidence, {"agent": agent, "criterion": criterion, "reused": False}
+
+def reusable_judge(name: str, judge: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    """
+    Wraps a judge node: when the evidence it rules on is byte-for-byte what it saw on the
+    last audit, its prior opinions are replayed instead of re-deliberating.
+    """
+    from src.core.state import Opinion
+
+    def node(state: Dict[str, Any]) -> Dict[str, Any]:
+        fingerprint = evidence_fingerprint(state.get("evidences", {}))
+        prior = (state.get("incremental") or {}).get("prior_opinions", {}).get(name)
+        if prior and prior.get("fingerprint") == fingerprint:
+            opinions = [Opinion(**op) for op in prior["opinions"]]
+            reused = True
+        else:
+            opinions = judge(state).get("opinions", [])
+            reused = False
+        log = {"agent": name, "criterion": "@judge", "reused": reused, "fingerprint": fingerprint,
+               "opinions": [op.model_dump() if hasattr(op, "model_dump") else op for op in opinions]}
+        return {"opinions": opinions, "incremental_log": [log]}
+
+    node.__name__ = getattr(judge, "__name__", name)
+    return node
+
+def record_audit(repo_url: str, final_state: Dict[str, Any], store: Optional[AuditLedgerStore] = None) -> Dict[str, Any]:
+    """Persists the audited HEAD plus reusable evidence/opinions and returns the reuse summary."""
+    store = store or ledger_store
+    context = final_state.get("incremental") or {}
+    log = final_state.get("incremental_log", [])
+
+    evidences: Dict[str, Dict[str, Any]] = {}
+    for agent, findings in (final_state.get("evidences") or {}).items():
+        for finding in findings if isinstance(findings, list) else [findings]:
+            # Only detective-produced findings declare inputs; aggregator summaries are derived.
+            if hasattr(finding, "get") and "inputs" in (finding.get("metadata") or {}):
+                key = finding.get("criterion") or finding.get("goal")
+                evidences.setdefault(agent, {})[key] = finding.model_dump() if hasattr(finding, "model_dump") else finding
+
+    opinions = {entry["agent"]: {"fingerprint": entry["fingerprint"], "opinions": entry["opinions"]}
+                for entry in log if entry.get("criterion") == "@judge"}
+
+    if context.get("head"):
+        store.save(repo_url, {
+            "version": LEDGER_VERSION,
+            "repo_url": repo_url,
+            "head": context["head"],
+            "pdf_sha": context.get("pdf_sha"),
+            "evidences": evidences,
+            "opinions": opinions,
+        })
+    return summarize_incremental(final_state)
+
+def summarize_incremental(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    context = final_state.get("incremental") or {}
+    log = final_state.get("incremental_log", [])
+    criteria = [e for e in log if e.get("criterion") not in ("@judge", "@index")]
+    judges = [e for e in log if e.get("criterion") == "@judge"]
+    index = next((e for e in log if e.get("criterion") == "@index"), {})
+    return {
+        "mode": "cold" if context.get("cold", True) else "incremental",
+        "previous_head": context.get("previous_head"),
+        "head": context.get("head"),
+        "files_changed": len(context.get("changed_files", [])),
+        "files_reused": index.get("cached", 0),
+        "files_reparsed": index.get("parsed", 0),
+        "criteria_reused": sum(1 for e in criteria if e["reused"]),
+        "criteria_recomputed": sum(1 for e in criteria if not e["reused"]),
+        "judges_reused": sum(1 for e in judges if e["reused"]),
+        "judges_recomputed": sum(1 for e in judges if not e["reused"]),
+    }
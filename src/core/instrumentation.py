@@ -0,0 +1,182 @@
+import functools
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource  # POSIX only; on Windows RSS growth is reported as 0
+except ImportError:
+    resource = None
+
+# ru_maxrss is KiB on Linux, bytes on macOS.
+_RSS_TO_KB = 1 / 1024 if sys.platform == "darwin" else 1
+
+def _peak_rss_kb() -> float:
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_TO_KB
+
+def _evidence_count(evidences: Any) -> int:
+    return sum(len(findings) for findings in (evidences or {}).values())
+
+def _opinion_count(opinions: Any) -> int:
+    return len(opinions or [])
+
+# --- 1. PROCESS-WIDE NODE METRICS (Prometheus text, no client library) ---
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition layout."""
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = [f'{name}_bucket{{{labels},le="{bound:g}"}} {n}' for bound, n in zip(self.buckets, self.counts)]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class NodeMetrics:
+    """Every instrumented node run in this process, folded into per-node histograms and totals."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wall: Dict[str, Histogram] = {}
+        self._cpu: Dict[str, Histogram] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def observe(self, entry: Dict[str, Any], state: Optional[Dict[str, Any]] = None):
+        node = entry["node"]
+        with self._lock:
+            if node not in self._wall:
+                self._wall[node] = Histogram(LATENCY_BUCKETS)
+                self._cpu[node] = Histogram(LATENCY_BUCKETS)
+                self._totals[node] = {"errors": 0, "evidences_out": 0, "opinions_out": 0, "rss_growth_kb": 0.0}
+            self._wall[node].observe(entry["wall_ms"] / 1000)
+            self._cpu[node].observe(entry["cpu_ms"] / 1000)
+            totals = self._totals[node]
+            totals["errors"] += 1 if entry.get("error") else 0
+            totals["evidences_out"] += entry["evidences_out"]
+            totals["opinions_out"] += entry["opinions_out"]
+            totals["rss_growth_kb"] += entry["rss_growth_kb"]
+
+    def render(self) -> List[str]:
+        """Node families in Prometheus text format; callers append their own gauges."""
+        with self._lock:
+            nodes = sorted(self._wall)
+            lines = ["# HELP swarm_node_wall_seconds Wall time per graph node run.",
+                     "# TYPE swarm_node_wall_seconds histogram"]
+            for node in nodes:
+                lines += self._wall[node].render("swarm_node_wall_seconds", f'node="{node}"')
+            lines += ["# HELP swarm_node_cpu_seconds CPU time of the thread running the node (git children excluded).",
+                      "# TYPE swarm_node_cpu_seconds histogram"]
+            for node in nodes:
+                lines += self._cpu[node].render("swarm_node_cpu_seconds", f'node="{node}"')
+            families = (
+                ("swarm_node_errors_total", "errors", "Node runs that raised."),
+                ("swarm_node_evidences_out_total", "evidences_out", "Findings returned by the node."),
+                ("swarm_node_opinions_out_total", "opinions_out", "Opinions returned by the node."),
+                ("swarm_node_rss_growth_kilobytes_total", "rss_growth_kb", "Growth of the process peak RSS while the node ran."),
+            )
+            for name, key, help_text in families:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                lines += [f'{name}{{node="{node}"}} {self._totals[node][key]:g}' for node in nodes]
+            return lines
+
+node_metrics = NodeMetrics()
+
+# Called with (entry, state) after every node run; trace exporters register here.
+NodeObserver = Callable[[Dict[str, Any], Dict[str, Any]], None]
+_node_observers: List[NodeObserver] = [node_metrics.observe]
+
+def add_node_observer(observer: NodeObserver):
+    if observer not in _node_observers:
+        _node_observers.append(observer)
+
+# --- 2. NODE WRAPPER ---
+def instrument_node(name: str, node: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    """
+    Wraps a graph node so its update carries one 'node_timings' entry, which is also handed
+    to every node observer (metrics, trace exporter): start time, wall and thread CPU time,
+    growth of the peak RSS, evidence and opinion counts in and out, and, when tracemalloc is
+    tracing (the benchmark suite turns it on), the bytes allocated and the traced peak.
+    Parallel nodes share the process, so RSS and allocation figures include whatever
+    siblings did at the same time.
+    """
+    @functools.wraps(node)
+    def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "node": name,
+            "evidences_in": _evidence_count(state.get("evidences")),
+            "opinions_in": _opinion_count(state.get("opinions")),
+            "started_at": time.time(),
+        }
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            before, _ = tracemalloc.get_traced_memory()
+        rss_before = _peak_rss_kb()
+        cpu_started = time.thread_time()
+        started = time.perf_counter()
+
+        def finish():
+            entry["wall_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            entry["cpu_ms"] = round((time.thread_time() - cpu_started) * 1000, 3)
+            entry["rss_growth_kb"] = round(_peak_rss_kb() - rss_before, 1)
+            if tracing:
+                after, peak = tracemalloc.get_traced_memory()
+                entry["alloc_kb"] = round((after - before) / 1024, 1)
+                entry["traced_peak_kb"] = round(peak / 1024, 1)
+
+        try:
+            result = node(state)
+        except Exception as e:
+            finish()
+            failed = {**entry, "error": type(e).__name__, "evidences_out": 0, "opinions_out": 0}
+            for observe in _node_observers:
+                observe(failed, state)
+            raise
+        finish()
+
+        update = dict(result) if result else {}
+        entry["evidences_out"] = _evidence_count(update.get("evidences"))
+        entry["opinions_out"] = _opinion_count(update.get("opinions"))
+        for observe in _node_observers:
+            observe(entry, state)
+        update["node_timings"] = [entry]
+        return update
+
+    return wrapper
+
+# --- 3. PER-RUN SUMMARIES ---
+def summarize_timings(timings: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-node totals for one run (a node can appear more than once)."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for entry in timings or []:
+        node = summary.setdefault(entry["node"], {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "rss_growth_kb": 0.0,
+                                                  "evidences_in": 0, "evidences_out": 0, "opinions_out": 0})
+        node["calls"] += 1
+        for key in ("wall_ms", "cpu_ms"):
+            node[key] = round(node[key] + entry.get(key, 0.0), 3)
+        node["rss_growth_kb"] = round(node["rss_growth_kb"] + entry.get("rss_growth_kb", 0.0), 1)
+        node["evidences_in"] = max(node["evidences_in"], entry.get("evidences_in", 0))
+        node["evidences_out"] += entry.get("evidences_out", 0)
+        node["opinions_out"] += entry.get("opinions_out", 0)
+        if "alloc_kb" in entry:
+            node["alloc_kb"] = round(node.get("alloc_kb", 0.0) + entry["alloc_kb"], 1)
+            node["traced_peak_kb"] = max(node.get("traced_peak_kb", 0.0), entry["traced_peak_kb"])
+    return summary
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from pydantic import BaseModel, ValidationError
+
+# --- Protocol A.4: Compiled Rubrics ---
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+RUBRIC_DIR = os.path.join(ROOT_DIR, "audit", "rubrics")
+# The original constitution (src/config/rubric.json) is addressable as a rubric in its own right.
+CONSTITUTION_ID = "constitution"
+CONSTITUTION_PATH = os.path.join(ROOT_DIR, "src", "config", "rubric.json")
+DEFAULT_RUBRIC = "master_audit"
+
+# detective node -> (evidence agent key, rubric target_artifact values it serves)
+DETECTIVES = {
+    "repo_detective": ("repo_agent", {"github_repo", "github_repo_and_audit_folder"}),
+    "docs_detective": ("doc_agent", {"pdf_report"}),
+    "vision_detective": ("vision_agent", {"pdf_images"}),
+}
+ALL_ARTIFACTS = frozenset().union(*(served for _, served in DETECTIVES.values()))
+# Rubrics that name the agent instead of (or as well as) the artifact
+AGENT_DETECTIVES = {
+    "RepoInvestigator": "repo_detective",
+    "DocAnalyst": "docs_detective",
+    "VisionInspector": "vision_detective",
+}
+
+class RubricError(ValueError):
+    """A rubric that does not exist or does not validate."""
+
+class DimensionPlan(BaseModel):
+    """One rubric dimension, resolved to the detective that gathers its evidence."""
+    id: str
+    name: str
+    target_artifact: Optional[str] = None
+    # None when no detective collects the artifact (e.g. 'generated_reports')
+    detective: Optional[str] = None
+    weight: Optional[float] = None
+    tiers: Dict[str, float] = {}
+    instruction: str = ""
+    statute: str = ""
+
+class RubricPlan(BaseModel):
+    """
+    A rubric parsed, validated and indexed once. Everything an audit asks of a rubric
+    (which artifacts it targets, and each dimension's detective, weight and tiers) is a
+    lookup on this object.
+    """
+    rubric_id: str
+    name: str
+    version: Optional[str] = None
+    sha256: str
+    # os.stat signature of the source file when it was compiled
+    mtime_ns: int
+    size: int
+    dimensions: List[DimensionPlan]
+    by_dimension: Dict[str, DimensionPlan] = {}
+    # Artifacts the rubric asks for; every artifact when no dimension names one
+    targets: List[str] = []
+
+def rubric_path(rubric_id: str) -> str:
+    if rubric_id == CONSTITUTION_ID:
+        return CONSTITUTION_PATH
+    if not rubric_id or os.sep in rubric_id or "/" in rubric_id or rubric_id.startswith("."):
+        raise RubricError(f"Invalid rubric id '{rubric_id}'")
+    return os.path.join(RUBRIC_DIR, f"{rubric_id}.json")
+
+def _number(value: Any, where: str) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise RubricError(f"{where} must be a non-negative number, got {value!r}")
+    return float(value)
+
+def compile_rubric(rubric_id: str, raw: bytes, mtime_ns: int = 0, size: int = 0) -> RubricPlan:
+    """Validates a rubric document and compiles it into a RubricPlan."""
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise RubricError(f"Rubric '{rubric_id}' is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise RubricError(f"Rubric '{rubric_id}' must be a JSON object")
+
+    # audit/rubrics/*.json list 'dimensions'; the constitution lists 'criteria'
+    entries = data.get("dimensions", data.get("criteria"))
+    if not isinstance(entries, list) or not entries:
+        raise RubricError(f"Rubric '{rubric_id}' has no 'dimensions' (or 'criteria') list")
+    meta = data.get("rubric_metadata") or {}
+
+    dimensions, seen = [], set()
+    for position, entry in enumerate(entries, 1):
+        where = f"Rubric '{rubric_id}' dimension {position}"
+        if not isinstance(entry, dict) or not entry.get("id"):
+            raise RubricError(f"{where} needs an 'id'")
+        dim_id = str(entry["id"])
+        if dim_id in seen:
+            raise RubricError(f"{where}: duplicate id '{dim_id}'")
+        seen.add(dim_id)
+        tiers = entry.get("tiers") or {}
+        if not isinstance(tiers, dict):
+            raise RubricError(f"{where}: 'tiers' must be an object")
+
+        artifact = entry.get("target_artifact")
+        detective = next((node for node, (_, served) in DETECTIVES.items() if artifact in served),
+                         AGENT_DETECTIVES.get(entry.get("agent")))
+        try:
+            dimensions.append(DimensionPlan(
+                id=dim_id,
+                name=entry.get("name") or dim_id,
+                target_artifact=artifact,
+                detective=detective,
+                weight=_number(entry.get("weight"), f"{where} weight"),
+                tiers={tier: _number(points, f"{where} tier '{tier}'") for tier, points in tiers.items()},
+                instruction=entry.get("instruction") or entry.get("forensic_instruction") or entry.get("description") or "",
+                statute=entry.get("statute") or "",
+            ))
+        except ValidationError as e:
+            raise RubricError(f"{where}: {e}") from e
+
+    targets = {d.target_artifact for d in dimensions if d.target_artifact}
+    return RubricPlan(
+        rubric_id=rubric_id,
+        name=meta.get("name") or rubric_id,
+        version=str(data["version"]) if data.get("version") is not None else None,
+        sha256=hashlib.sha256(raw).hexdigest(),
+        mtime_ns=mtime_ns,
+        size=size,
+        dimensions=dimensions,
+        by_dimension={d.id: d for d in dimensions},
+        targets=sorted(targets or ALL_ARTIFACTS),
+    )
+
+class RubricRegistry:
+    """
+    Compiles each rubric once per process. A lookup costs one os.stat: the plan is
+    recompiled only when the file's mtime/size changed *and* its content hash differs,
+    so touching a file without editing it keeps the cached plan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plans: Dict[str, RubricPlan] = {}
+        self.compiles = 0
+
+    def get(self, rubric_id: str) -> RubricPlan:
+        path = rubric_path(rubric_id)
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise RubricError(f"Unknown rubric '{rubric_id}' (no {path})") from None
+
+        plan = self._plans.get(rubric_id)
+        if plan is not None and (plan.mtime_ns, plan.size) == (st.st_mtime_ns, st.st_size):
+            return plan
+
+        with self._lock:
+            plan = self._plans.get(rubric_id)
+            if plan is not None and (plan.mtime_ns, plan.size) == (st.st_mtime_ns, st.st_size):
+                return plan
+            with open(path, "rb") as f:
+                raw = f.read()
+            if plan is not None and plan.sha256 == hashlib.sha256(raw).hexdigest():
+                plan = plan.model_copy(update={"mtime_ns": st.st_mtime_ns, "size": st.st_size})
+            else:
+                plan = compile_rubric(rubric_id, raw, st.st_mtime_ns, st.st_size)
+                self.compiles += 1
+            self._plans[rubric_id] = plan
+            return plan
+
+    def available(self) -> List[str]:
+        """Ids of every rubric on disk that compiles."""
+        ids = [CONSTITUTION_ID] if os.path.exists(CONSTITUTION_PATH) else []
+        if os.path.isdir(RUBRIC_DIR):
+            ids += sorted(name[:-5] for name in os.listdir(RUBRIC_DIR) if name.endswith(".json"))
+        usable = []
+        for rubric_id in ids:
+            try:
+                self.get(rubric_id)
+                usable.append(rubric_id)
+            except RubricError:
+                continue  # e.g. audit logs that share the directory
+        return usable
+
+    def snapshot(self, rubric_ids: Iterable[str]) -> List[RubricPlan]:
+        """Compiled plans to hand to worker processes (see install)."""
+        return [self.get(rubric_id) for rubric_id in dict.fromkeys(rubric_ids)]
+
+    def install(self, plans: Iterable[RubricPlan]):
+        """Seeds this process with plans compiled elsewhere; they stay valid while the files are unchanged."""
+        with self._lock:
+            for plan in plans:
+                self._plans[plan.rubric_id] = plan
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cached": sorted(self._plans), "compiles": self.compiles}
+
+rubric_registry = RubricRegistry()
+
+def default_rubric_id() -> str:
+    return os.getenv("FORENSIC_RUBRIC", DEFAULT_RUBRIC)
+
+def get_rubric(rubric_id: Optional[str] = None) -> RubricPlan:
+    """The compiled plan for `rubric_id` (FORENSIC_RUBRIC, then master_audit, when omitted)."""
+    return rubric_registry.get(rubric_id or default_rubric_id())
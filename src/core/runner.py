@@ -0,0 +1,216 @@
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, ContextManager, Optional, Tuple
+from src.infrastructure.clone_cache import mirror_cache, CloneError
+from src.core.incremental import prepare_incremental, record_audit
+from src.utils.pdf_cache import file_sha256
+from src.infrastructure.result_store import result_cache_enabled, result_store
+from src.infrastructure.observability import new_trace_id, root_span_id, tracer
+from src.core.progress import stream_audit
+
+# Receives progress events (node, complete, result_store, reuse) as an audit runs.
+ProgressHook = Callable[[Dict[str, Any]], None]
+
+def clone_into(repo_url: str, workspace: str, retries: int = 0, backoff: float = 2.0) -> int:
+    """
+    Protocol A.1: Materializes the narrative into the sandbox through the shared mirror cache.
+    Transient network failures are retried with exponential backoff; returns attempts used.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            mirror_cache.checkout(repo_url, workspace)
+            return attempt
+        except CloneError as e:
+            if not e.transient or attempt > retries:
+                raise
+            # A failed clone can leave a partial tree behind; git refuses non-empty targets.
+            _reset_workspace(workspace)
+            time.sleep(backoff * (2 ** (attempt - 1)))
+
+def _reset_workspace(workspace: str):
+    """Empties the sandbox directory without removing it."""
+    for entry in os.listdir(workspace):
+        target = os.path.join(workspace, entry)
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            os.remove(target)
+
+@contextmanager
+def traced_audit(repo_url: str, variant: str, **attributes):
+    """Root span of one audit; node spans point at it through the trace id it hands out."""
+    span = {"trace_id": new_trace_id(), "state": {}}
+    started, error = time.time(), None
+    try:
+        yield span
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        tracer.record_span("audit", span["trace_id"], started, time.time(), span_id=root_span_id(span["trace_id"]),
+                           error=error, attributes={"repo_url": repo_url, "variant": variant, **attributes,
+                                                    "aggregated_score": span["state"].get("aggregated_score")})
+
+@contextmanager
+def audit_workspace(repo_url: str, retries: int = 0, checkout: bool = True):
+    """
+    Yields (workspace, clone attempts). With checkout=False nothing is materialized: the
+    audit reads the shared bare mirror in place, through the git object reader.
+    """
+    if checkout:
+        with tempfile.TemporaryDirectory(prefix="forensic_swarm_") as workspace:
+            print(f"📡 Cloning Narrative to Workspace: {workspace}")
+            yield workspace, clone_into(repo_url, workspace, retries=retries)
+        return
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            mirror = mirror_cache.sync(repo_url)
+            break
+        except CloneError as e:
+            if not e.transient or attempt > retries:
+                raise
+            time.sleep(2.0 * (2 ** (attempt - 1)))
+    print(f"🗄️ Checkout-free audit of mirror: {mirror}")
+    yield str(mirror), attempt
+
+def _pdf_key(pdf_path: Optional[str], pdf_sha: Optional[str]) -> str:
+    """Result-store key of the report: its digest, the bare path when it cannot be read, '' for none."""
+    if pdf_path in (None, "", "HEURISTIC_MODE"):
+        return ""
+    return pdf_sha or pdf_path
+
+def run_graph(app, initial_input: Dict[str, Any], progress: Optional[ProgressHook] = None) -> Dict[str, Any]:
+    """
+    Runs a compiled graph to its final state. With a progress hook the graph is streamed
+    node by node and every event goes to the hook; the 'complete' event carries the score
+    and verdict instead of the whole state.
+    """
+    if progress is None:
+        return app.invoke(initial_input)
+    final_state: Dict[str, Any] = {}
+    for event in stream_audit(app, initial_input):
+        if event["event"] == "complete":
+            final_state = event["state"]
+            progress({"event": "complete", "t_ms": event["t_ms"],
+                      "aggregated_score": final_state.get("aggregated_score", 0.0),
+                      "global_verdict": final_state.get("global_verdict")})
+        else:
+            progress(event)
+    return final_state
+
+def audit_target(repo_url: str, workspace: Callable[[], ContextManager[Tuple[str, int]]],
+                 pdf_path: Optional[str] = None, app=None, variant: str = "full", rubric_id: Optional[str] = None,
+                 revision: Optional[str] = None, pin_revision: bool = False, refresh: bool = False,
+                 storable: bool = True, progress: Optional[ProgressHook] = None, **trace_attributes) -> Dict[str, Any]:
+    """
+    The one audit sequence behind the CLI, the batch runner and the server: result-store
+    lookup, workspace, incremental context, graph run, ledger update, result-store record.
+    `workspace` is called once and must yield (workspace path, clone attempts); it is not
+    entered at all on a result-store hit. `pin_revision` fixes the audit to the HEAD seen
+    when the workspace opened (for workspaces that a concurrent fetch could move).
+    `storable=False` neither looks up nor stores the audit. `progress` receives node events
+    as the graph streams, plus 'result_store' and 'reuse' events.
+    The final state's 'result_store' entry is the stored audit's summary (with hit=True when
+    it was served from the store), or None when nothing was stored.
+    """
+    from src.core.rubric_registry import get_rubric
+    rubric = get_rubric(rubric_id)
+    publish = progress or (lambda event: None)
+    # Hashed once: the result-store key, the ledger and the PDF cache all use this digest.
+    pdf_sha = file_sha256(pdf_path)
+    pdf_key = _pdf_key(pdf_path, pdf_sha)
+    if storable and not refresh and result_cache_enabled():
+        head = mirror_cache.resolve(repo_url, revision or "HEAD")
+        stored = result_store.lookup(repo_url, head, rubric.sha256, variant, pdf_key) if head else None
+        if stored is not None:
+            print(f"⚡ Result Store: {repo_url}@{head[:10]} already audited under '{rubric.rubric_id}' "
+                  f"(audit #{stored['result_store']['id']}); no clone needed.")
+            stored["result_store"]["hit"] = True
+            publish({"event": "result_store", "status": "hit", **stored["result_store"]})
+            return stored
+    started = time.perf_counter()
+    if app is None:
+        from src.core.graph import get_graph
+        app = get_graph(variant)
+
+    with traced_audit(repo_url, variant, rubric_id=rubric.rubric_id, **trace_attributes) as span, \
+            workspace() as (workspace_path, attempts):
+        incremental = prepare_incremental(repo_url, workspace_path, pdf_path, rev=revision or "HEAD",
+                                          pdf_sha=pdf_sha)
+        if revision is not None and incremental["head"] is None:
+            raise ValueError(f"Unknown revision '{revision}' in {repo_url}")
+        if pin_revision:
+            # Pin the mirror's HEAD now: a concurrent fetch must not move it mid-audit.
+            revision = incremental["head"]
+
+        initial_input = {
+            "repo_url": repo_url,
+            "workspace_path": workspace_path,
+            "pdf_path": pdf_path,
+            "rubric_id": rubric.rubric_id,
+            "evidences": {},
+            "opinions": [],
+            "aggregated_score": 0.0,
+            "incremental": incremental,
+            "trace_id": span["trace_id"],
+        }
+        if revision is not None:
+            initial_input["revision"] = incremental["head"]
+        final_state = span["state"] = run_graph(app, initial_input, progress)
+        final_state["clone_attempts"] = attempts
+        final_state["reuse"] = record_audit(repo_url, final_state)
+        publish({"event": "reuse", **final_state["reuse"]})
+        final_state["result_store"] = None
+        if storable and incremental["head"]:
+            audit_id = result_store.record(final_state, incremental["head"], rubric.sha256, variant, pdf_key,
+                                           elapsed_s=round(time.perf_counter() - started, 3))
+            final_state["result_store"] = {"id": audit_id, "head_sha": incremental["head"], "hit": False}
+        return final_state
+
+def audit_repository(repo_url: str, pdf_path: Optional[str] = None, retries: int = 0, app=None,
+                     variant: str = "full", rubric_id: Optional[str] = None,
+                     revision: Optional[str] = None, checkout: bool = True, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Runs one audit inside an ephemeral sandbox and returns the final graph state.
+    `variant` picks the stages ('full', or 'evidence' to stop after the aggregator); the
+    compiled graph comes from the process-wide factory unless one is injected.
+    `rubric_id` picks the rubric (FORENSIC_RUBRIC by default); it is resolved before cloning.
+    `revision` audits any commit-ish instead of HEAD, and checkout=False skips the working
+    tree altogether; both read files straight from the object store.
+    Every final state is kept in the result store. Unless `refresh` is set (or
+    FORENSIC_RESULT_CACHE=0), the remote's commit is resolved first and a stored audit of the
+    same (commit, rubric, variant, PDF) is returned without cloning.
+    """
+    if variant == "rejudge":
+        raise ValueError("The 'rejudge' variant needs supplied evidence; use rejudge_evidence().")
+    return audit_target(repo_url, lambda: audit_workspace(repo_url, retries=retries, checkout=checkout),
+                        pdf_path=pdf_path, app=app, variant=variant, rubric_id=rubric_id, revision=revision,
+                        pin_revision=not checkout, refresh=refresh)
+
+def rejudge_evidence(evidences: Dict[str, Any], repo_url: str = "Supplied Evidence", app=None,
+                     progress: Optional[ProgressHook] = None, **trace_attributes) -> Dict[str, Any]:
+    """
+    Runs only the judges and the chief justice over evidence from an earlier audit
+    (an 'evidence' run, or the evidences of a /result payload): no clone, no detectives.
+    """
+    if app is None:
+        from src.core.graph import get_graph
+        app = get_graph("rejudge")
+
+    with traced_audit(repo_url, "rejudge", **trace_attributes) as span:
+        span["state"] = run_graph(app, {
+            "repo_url": repo_url,
+            "evidences": evidences,
+            "opinions": [],
+            "aggregated_score": 0.0,
+            "trace_id": span["trace_id"],
+        }, progress)
+        return span["state"]
@@ -1,42 +1,51 @@
 from __future__ import annotations
 from typing import Annotated, List, Dict, Any, Union
 from typing_extensions import TypedDict
-from pydantic import BaseModel, Field
 import operator
+from src.core.evidence_store import Evidence, EvidenceStore, Opinion, OpinionStore
+from src.core.features import FeatureIndex
 
 # --- Protocol A.1: Structured Schemas ---
-class Evidence(BaseModel):
-    """Forensic proof captured by Detectives."""
-    found: bool
-    criterion: str
-    rationale: str
-    metadata: Dict[str, Any] = {}
-
-class Opinion(BaseModel):
-    judge: str
-    criterion: str  
-    score: float
-    argument: str   
-    statute: str
+# Evidence and Opinion are compact slotted records; see src/core/evidence_store.py.
 
 # --- Protocol B.2: State Reducers ---
-def merge_evidences(existing: Dict[str, List[Any]], new: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
-    """Deep merge for parallel detective results."""
-    merged = (existing or {}).copy()
-    for key, val in new.items():
-        if key in merged:
-            merged[key].extend(val)
-        else:
-            merged[key] = val
-    return merged
+def merge_evidences(existing: EvidenceStore, new: Dict[str, List[Any]]) -> EvidenceStore:
+    """
+    Upserts parallel detective results keyed by (agent, criterion).
+    Returns a new ledger version in O(len(new)); earlier versions are never mutated.
+    """
+    if not isinstance(existing, EvidenceStore):
+        existing = EvidenceStore(existing)
+    return existing.merge(new)
+
+def merge_opinions(existing: OpinionStore, new: List[Any]) -> OpinionStore:
+    """Upserts judicial opinions keyed by (judge, criterion, statute)."""
+    if not isinstance(existing, OpinionStore):
+        existing = OpinionStore(existing)
+    return existing.merge(new)
 
 class AgentState(TypedDict):
     """The central state of the Forensic Swarm."""
     repo_url: str
     workspace_path: str
+    # Commit audited through the object store (no checkout, or a past revision); absent means the workspace HEAD
+    revision: str
     pdf_path: str
     # Reducers are mandatory for parallel Fan-Out
-    evidences: Annotated[Dict[str, List[Any]], merge_evidences]
-    opinions: Annotated[List[Dict[str, Any]], operator.add]
+    evidences: Annotated[EvidenceStore, merge_evidences]
+    opinions: Annotated[OpinionStore, merge_opinions]
     aggregated_score: float
-    global_verdict: str
\ No newline at end of file
+    global_verdict: str
+    # Typed facts built once by the aggregator; judges read these instead of rescanning evidence
+    features: FeatureIndex
+    # Incremental re-audit: prior ledger in, per-criterion reuse decisions out
+    incremental: Dict[str, Any]
+    incremental_log: Annotated[List[Dict[str, Any]], operator.add]
+    # Rubric driving the dispatcher, and the detectives it routed to (or skipped, and why)
+    rubric_id: str
+    rubric_sha: str
+    dispatch: Dict[str, Any]
+    # Trace id shared by every node span of one audit
+    trace_id: str
+    # Per-node wall time (and allocations when tracemalloc is on), one entry per node run
+    node_timings: Annotated[List[Dict[str, Any]], operator.add]
\ No newline at end of file
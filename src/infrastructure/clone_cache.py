@@ -0,0 +1,230 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+# Substrings in git's stderr that indicate a network hiccup rather than a bad URL.
+TRANSIENT_CLONE_MARKERS = (
+    "could not resolve host",
+    "connection timed out",
+    "connection reset",
+    "operation timed out",
+    "the remote end hung up",
+    "early eof",
+    "rpc failed",
+    "unexpected disconnect",
+    "http 429",
+    "error: 502",
+    "error: 503",
+    "error: 504",
+    "temporary failure",
+    "tls connection was non-properly terminated",
+)
+
+LAST_USED_MARKER = "FORENSIC_LAST_USED"
+
+# 'partial' mode: files the detectives read. Everything else in the tree stays a promised
+# blob, fetched from the remote only if some later git command actually needs it.
+DEFAULT_SPARSE_PATTERNS = ("*.py", "*.md", "*.toml", "*.cfg", "*.txt", "*.json", "*.yaml", "*.yml", "/audit/")
+
+class CloneError(Exception):
+    """Raised when the target repository cannot be materialized in the sandbox."""
+    def __init__(self, repo_url: str, stderr: str):
+        self.repo_url = repo_url
+        self.stderr = (stderr or "").strip()
+        self.transient = any(marker in self.stderr.lower() for marker in TRANSIENT_CLONE_MARKERS)
+        super().__init__(f"Git clone failed for {repo_url}: {self.stderr}")
+
+def _git(args: List[str], repo_url: str, cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+    try:
+        return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        raise CloneError(repo_url, e.stderr) from e
+
+class MirrorCache:
+    """
+    Shared Clone Layer: one bare mirror per repository URL.
+    Every audit runs an incremental fetch into the mirror and then takes a cheap local
+    clone of it (hardlinked objects on the same filesystem, alternates otherwise).
+    Mirrors are evicted least-recently-used once the cache exceeds its disk budget.
+
+    mode='partial' keeps a blobless mirror instead (every commit and tree, no file
+    contents): chronology stays exact on any history length, and each workspace
+    sparse-checks-out only `sparse_patterns`, fetching just those blobs from the remote.
+    """
+
+    def __init__(self, root: Optional[str] = None, budget_mb: Optional[int] = None, min_age_s: float = 3600.0,
+                 mode: Optional[str] = None, sparse_patterns: Optional[List[str]] = None):
+        self.root = Path(root or os.getenv("FORENSIC_MIRROR_DIR", Path.home() / ".cache" / "forensic-swarm" / "mirrors")).expanduser()
+        self.budget_bytes = int(budget_mb if budget_mb is not None else os.getenv("FORENSIC_MIRROR_BUDGET_MB", "2048")) * 1024 * 1024
+        self.mode = mode or os.getenv("FORENSIC_CLONE_MODE", "full")
+        if self.mode not in ("full", "partial"):
+            raise ValueError(f"Unknown clone mode '{self.mode}' (expected 'full' or 'partial')")
+        env_patterns = os.getenv("FORENSIC_SPARSE_PATTERNS")
+        self.sparse_patterns = list(sparse_patterns or (env_patterns.split() if env_patterns else DEFAULT_SPARSE_PATTERNS))
+        # Workspaces cloned with alternates read from the mirror, so recently used mirrors are never evicted.
+        self.min_age_s = min_age_s
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def mirror_path(self, repo_url: str) -> Path:
+        digest = hashlib.sha1(repo_url.strip().rstrip("/").encode("utf-8")).hexdigest()[:16]
+        name = repo_url.rstrip("/").split("/")[-1].removesuffix(".git")
+        slug = "".join(c if c.isalnum() or c in "-_" else "_" for c in name) or "repo"
+        # Blobless mirrors live apart from full ones: a full checkout must never hit a promised blob.
+        suffix = "-partial" if self.mode == "partial" else ""
+        return self.root / f"{slug}-{digest}{suffix}.git"
+
+    @contextmanager
+    def _lock(self, mirror: Path):
+        """Serializes fetches per mirror across threads and (where supported) processes."""
+        with self._locks_guard:
+            thread_lock = self._locks.setdefault(str(mirror), threading.Lock())
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(f"{mirror}.lock", "w") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def sync(self, repo_url: str) -> Path:
+        """Creates the mirror on first use, otherwise fetches only the new objects."""
+        mirror = self.mirror_path(repo_url)
+        with self._lock(mirror):
+            if (mirror / "HEAD").exists():
+                print(f"🔁 Mirror Cache: incremental fetch for {repo_url}")
+                _git(["fetch", "--prune", "--tags", "origin"], repo_url, cwd=str(mirror))
+            else:
+                print(f"📡 Mirror Cache: creating mirror for {repo_url}")
+                self.root.mkdir(parents=True, exist_ok=True)
+                staging = mirror.with_name(f"{mirror.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+                shutil.rmtree(staging, ignore_errors=True)
+                try:
+                    blobless = ["--filter=blob:none"] if self.mode == "partial" else []
+                    _git(["clone", "--bare", "--quiet", *blobless, repo_url, str(staging)], repo_url)
+                    # Track branches and tags only; '--mirror' would also drag in refs/pull/* on GitHub.
+                    _git(["config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*"], repo_url, cwd=str(staging))
+                    os.replace(staging, mirror)
+                finally:
+                    shutil.rmtree(staging, ignore_errors=True)
+            self._touch(mirror)
+        self.evict(keep=mirror)
+        return mirror
+
+    def resolve(self, repo_url: str, rev: str = "HEAD", timeout: float = 20.0) -> Optional[str]:
+        """
+        The commit `rev` names on the remote right now, from one `git ls-remote` round trip:
+        no fetch, no mirror. Full SHAs are taken as given. None when it cannot be resolved
+        this cheaply (abbreviated SHAs, expressions such as HEAD~3, unreachable remotes).
+        """
+        if len(rev) == 40 and all(c in "0123456789abcdef" for c in rev.lower()):
+            return rev.lower()
+        try:
+            out = subprocess.run(["git", "ls-remote", repo_url, rev], capture_output=True, text=True, timeout=timeout,
+                                 env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        refs = {}
+        for line in out.splitlines():
+            sha, _, ref = line.partition("\t")
+            refs[ref] = sha
+        # Annotated tags: the peeled '^{}' entry is the commit.
+        for ref in (rev, f"refs/heads/{rev}", f"refs/tags/{rev}^{{}}", f"refs/tags/{rev}"):
+            if ref in refs:
+                return refs[ref]
+        return None
+
+    def checkout(self, repo_url: str, workspace: str) -> str:
+        """Materializes the latest state of repo_url into workspace (which must be empty)."""
+        mirror = self.sync(repo_url)
+        if self.mode == "partial":
+            return self._sparse_checkout(repo_url, mirror, workspace)
+        with self._lock(mirror):
+            # Hardlinked objects survive eviction; alternates are the fallback across filesystems.
+            share_mode = "--local" if self._same_device(mirror, workspace) else "--shared"
+            _git(["clone", "--quiet", share_mode, str(mirror), workspace], repo_url)
+        # Point the workspace back at the real remote so detectives see the true origin.
+        _git(["remote", "set-url", "origin", repo_url], repo_url, cwd=workspace)
+        return workspace
+
+    def _sparse_checkout(self, repo_url: str, mirror: Path, workspace: str) -> str:
+        """
+        Borrows the mirror's commits and trees through alternates, then marks the workspace as a
+        partial clone of the real remote so the sparse checkout (and any later blob read) fetches
+        missing contents from there.
+        """
+        with self._lock(mirror):
+            _git(["clone", "--quiet", "--shared", "--no-checkout", str(mirror), workspace], repo_url)
+        for key, value in (("remote.origin.url", repo_url),
+                           ("remote.origin.promisor", "true"),
+                           ("remote.origin.partialclonefilter", "blob:none"),
+                           ("core.repositoryformatversion", "1"),
+                           ("extensions.partialclone", "origin")):
+            _git(["config", key, value], repo_url, cwd=workspace)
+        _git(["sparse-checkout", "set", "--no-cone", *self.sparse_patterns], repo_url, cwd=workspace)
+        _git(["read-tree", "-mu", "HEAD"], repo_url, cwd=workspace)
+        return workspace
+
+    def evict(self, keep: Optional[Path] = None):
+        """Drops least-recently-used mirrors until the cache fits in its disk budget."""
+        if not self.root.exists():
+            return
+        mirrors = []
+        for entry in self.root.iterdir():
+            if entry.suffix == ".git" and entry.is_dir():
+                mirrors.append((self._last_used(entry), self._disk_usage(entry), entry))
+        total = sum(size for _, size, _ in mirrors)
+        now = time.time()
+        for last_used, size, entry in sorted(mirrors, key=lambda m: m[0]):
+            if total <= self.budget_bytes:
+                break
+            if entry == keep or now - last_used < self.min_age_s:
+                continue
+            with self._lock(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            print(f"🧹 Mirror Cache: evicted {entry.name} ({size // (1024 * 1024)} MB)")
+
+    def _touch(self, mirror: Path):
+        (mirror / LAST_USED_MARKER).touch()
+
+    def _last_used(self, mirror: Path) -> float:
+        marker = mirror / LAST_USED_MARKER
+        return marker.stat().st_mtime if marker.exists() else mirror.stat().st_mtime
+
+    @staticmethod
+    def _disk_usage(path: Path) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    @staticmethod
+    def _same_device(mirror: Path, workspace: str) -> bool:
+        parent = os.path.dirname(os.path.abspath(workspace)) or "."
+        try:
+            return os.stat(mirror).st_dev == os.stat(parent).st_dev
+        except OSError:
+            return False
+
+# Global instance shared by main.py, the server and the repo tools
+mirror_cache = MirrorCache()
@@ -0,0 +1,310 @@
+import hashlib
+import os
+import posixpath
+import subprocess
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatch
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Never indexed when walking a plain (non-git) directory.
+SKIP_DIRS = {".git", ".venv", "venv", "node_modules", "__pycache__", ".tox", ".nox", "site-packages"}
+
+def git_blob_sha(data: bytes) -> str:
+    """Same id git assigns to the content, so tracked and untracked files share one key space."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+class BlobCache:
+    """
+    Byte-budgeted LRU of blob contents keyed by object id. Ids are content hashes, so one
+    cache is safely shared by every repository and revision in the process.
+    """
+
+    def __init__(self, budget_mb: Optional[int] = None, max_entry_kb: int = 1024):
+        self.budget_bytes = int(budget_mb if budget_mb is not None else os.getenv("FORENSIC_BLOB_CACHE_MB", "32")) * 1024 * 1024
+        self.max_entry_bytes = max_entry_kb * 1024
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, oid: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._blobs.get(oid)
+            if data is None:
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(oid)
+            self.hits += 1
+            return data
+
+    def put(self, oid: str, data: bytes):
+        if len(data) > self.max_entry_bytes:
+            return
+        with self._lock:
+            if oid in self._blobs:
+                return
+            self._blobs[oid] = data
+            self._size += len(data)
+            while self._size > self.budget_bytes and self._blobs:
+                _, evicted = self._blobs.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._blobs), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+blob_cache = BlobCache()
+
+class GitObjectReader:
+    """
+    One long-lived `git cat-file --batch` per repository: every object read is a line on
+    its stdin instead of a process spawn. Thread-safe; restarts the process if it dies.
+    """
+
+    def __init__(self, repo_path: str, cache: Optional[BlobCache] = None):
+        self.repo_path = repo_path
+        self.cache = cache or blob_cache
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _process(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(["git", "-C", self.repo_path, "cat-file", "--batch"],
+                                          stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        return self._proc
+
+    def read(self, spec: str) -> Optional[Tuple[str, str, bytes]]:
+        """(oid, type, content) for an object id or a 'rev:path' spec; None when it does not exist."""
+        if "\n" in spec:
+            return None
+        with self._lock:
+            proc = self._process()
+            try:
+                proc.stdin.write(spec.encode("utf-8", "surrogateescape") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline().split()
+                if len(header) != 3:  # '<spec> missing' / '<spec> ambiguous' / EOF
+                    return None
+                oid, kind, size = header[0].decode(), header[1].decode(), int(header[2])
+                data = proc.stdout.read(size)
+                proc.stdout.read(1)  # trailing LF
+            except (OSError, ValueError):
+                self._kill()
+                return None
+        return oid, kind, data
+
+    def blob(self, oid: str) -> Optional[bytes]:
+        data = self.cache.get(oid)
+        if data is None:
+            found = self.read(oid)
+            if found is None or found[1] != "blob":
+                return None
+            data = found[2]
+            self.cache.put(oid, data)
+        return data
+
+    def _kill(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait()
+            except OSError:
+                pass
+            self._proc = None
+
+    def close(self):
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    self._kill()
+            self._proc = None
+
+def _clean(path: str) -> str:
+    """Repository-relative, '/'-separated, with './' and redundant separators removed."""
+    return posixpath.normpath(path.replace(os.sep, "/")).strip("/")
+
+def _git_lines(repo_path: str, *args: str) -> Optional[bytes]:
+    proc = subprocess.run(["git", "-C", repo_path, *args], capture_output=True)
+    return proc.stdout if proc.returncode == 0 else None
+
+def _promisor_remote(repo_path: str) -> Optional[str]:
+    """The remote a partial (blobless) clone lazily fetches missing blobs from; None for full clones."""
+    name = (_git_lines(repo_path, "config", "--get", "extensions.partialclone") or b"").strip()
+    if name:
+        return name.decode()
+    out = _git_lines(repo_path, "config", "--get-regexp", r"^remote\..*\.promisor$") or b""
+    for line in out.splitlines():
+        key, _, value = line.decode().partition(" ")
+        if value.strip().lower() == "true":
+            return key[len("remote."):-len(".promisor")]
+    return None
+
+class RepoView:
+    """
+    Read-only file access to one revision of a repository, without requiring a checkout.
+
+    - objects:  bare repositories, or any explicit `rev`; listings come from the commit's
+                tree and contents from the object store.
+    - worktree: a checkout at HEAD; listings come from the index (so sparse entries are
+                included) and clean files from the object store, while modified and
+                untracked files are read from disk as the working copy has them.
+    - files:    a plain directory, walked and read from disk.
+    """
+
+    def __init__(self, repo_path: str, rev: Optional[str] = None, cache: Optional[BlobCache] = None):
+        self.repo_path = repo_path
+        self.commit = None
+        inside = _git_lines(repo_path, "rev-parse", "--is-inside-work-tree", "--is-bare-repository")
+        if inside is None:
+            self.mode = "files"
+        else:
+            work_tree, bare = inside.split()[:2]
+            self.mode = "worktree" if rev is None and work_tree == b"true" and bare == b"false" else "objects"
+            resolved = _git_lines(repo_path, "rev-parse", "--verify", "--quiet", f"{rev or 'HEAD'}^{{commit}}")
+            self.commit = resolved.decode().strip() if resolved else None
+        if self.mode == "worktree" and _git_lines(repo_path, "rev-parse", "--show-prefix").strip():
+            self.mode = "files"  # a subdirectory of a larger checkout: the directory is the audit target
+        self.reader = GitObjectReader(repo_path, cache) if self.mode != "files" else None
+        self._entries: Optional[Dict[str, str]] = None
+        self._dirty: Optional[Set[str]] = None
+        self._dirs: Optional[Set[str]] = None
+        self.prefetched = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+
+    # --- Listings ---
+    def entries(self) -> Dict[str, str]:
+        """Every file of the revision (or index) mapped to its blob id."""
+        if self._entries is None:
+            entries: Dict[str, str] = {}
+            if self.mode == "objects" and self.commit:
+                out = _git_lines(self.repo_path, "ls-tree", "-r", "-z", "--full-tree", self.commit) or b""
+                for record in out.split(b"\0"):
+                    meta, _, path = record.partition(b"\t")
+                    fields = meta.split()
+                    if len(fields) == 3 and fields[1] == b"blob":
+                        entries[path.decode("utf-8", "surrogateescape")] = fields[2].decode()
+            elif self.mode == "worktree":
+                out = _git_lines(self.repo_path, "ls-files", "-s", "-z") or b""
+                for record in out.split(b"\0"):
+                    meta, _, path = record.partition(b"\t")
+                    fields = meta.split()
+                    if len(fields) == 3 and fields[0] != b"160000":  # skip submodule links
+                        entries[path.decode("utf-8", "surrogateescape")] = fields[1].decode()
+            self._entries = entries
+        return self._entries
+
+    def dirty(self) -> Set[str]:
+        """Worktree mode: modified, deleted and untracked (non-ignored) paths."""
+        if self._dirty is None:
+            self._dirty = set()
+            if self.mode == "worktree":
+                out = _git_lines(self.repo_path, "ls-files", "-m", "-o", "--exclude-standard", "-z") or b""
+                self._dirty = {p.decode("utf-8", "surrogateescape") for p in out.split(b"\0") if p}
+        return self._dirty
+
+    def _walk(self) -> Iterable[str]:
+        for dirpath, dirnames, filenames in os.walk(self.repo_path):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                yield os.path.relpath(os.path.join(dirpath, name), self.repo_path).replace(os.sep, "/")
+
+    def paths(self, pattern: str = "*") -> Iterable[str]:
+        if self.mode == "files":
+            return [p for p in self._walk() if fnmatch(p, pattern)]
+        listed = set(self.entries()) | self.dirty()
+        return sorted(p for p in listed if fnmatch(p, pattern))
+
+    def blob_shas(self, pattern: str = "*") -> Dict[str, str]:
+        """
+        Path -> git blob id for every file matching `pattern`. Tracked, unmodified files
+        cost nothing (the id is in the tree/index); only dirty or non-git files are hashed.
+        """
+        shas: Dict[str, str] = {}
+        entries, dirty = self.entries(), self.dirty()
+        for path in self.paths(pattern):
+            if self.mode == "files" or path in dirty:
+                data = self._read_disk(path)
+                if data is not None:
+                    shas[path] = git_blob_sha(data)
+            else:
+                shas[path] = entries[path]
+        return shas
+
+    # --- Reads ---
+    def prefetch(self, paths: Iterable[str]) -> int:
+        """
+        Partial (blobless) clones and mirrors: fetches every blob behind `paths` that is not
+        local yet in a single request, instead of one promisor round trip per file read.
+        Returns the number of blobs requested; on a full clone this is a no-op. A failed fetch
+        is not an error: reads then fall back to git's own lazy, per-blob fetch.
+        """
+        if self.mode == "files" or not self.commit:
+            return 0
+        entries, dirty = self.entries(), self.dirty()
+        wanted = {entries[p] for p in map(_clean, paths) if p in entries and p not in dirty}
+        remote = _promisor_remote(self.repo_path) if wanted else None
+        if remote is None:
+            return 0
+        # Trees are always local in a blobless clone, so this walk never triggers a fetch.
+        out = _git_lines(self.repo_path, "rev-list", "--objects", "--no-walk", "--missing=print",
+                         "--no-object-names", self.commit) or b""
+        missing = sorted(wanted & {line[1:].decode() for line in out.splitlines() if line.startswith(b"?")})
+        if not missing:
+            return 0
+        proc = subprocess.run(["git", "-C", self.repo_path, "-c", "fetch.negotiationAlgorithm=noop", "fetch", "--quiet",
+                               "--no-tags", "--no-write-fetch-head", "--recurse-submodules=no", "--filter=blob:none",
+                               "--stdin", remote], input="\n".join(missing).encode() + b"\n", capture_output=True)
+        if proc.returncode != 0:
+            return 0
+        self.prefetched += len(missing)
+        return len(missing)
+
+    def _read_disk(self, path: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.repo_path, path.replace("/", os.sep)), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def read(self, path: str) -> Optional[bytes]:
+        """Contents of `path` at this view's revision, or None when it does not exist."""
+        path = _clean(path)
+        if self.mode == "files" or path in self.dirty():
+            return self._read_disk(path)
+        oid = self.entries().get(path)
+        return self.reader.blob(oid) if oid else None
+
+    def exists(self, path: str) -> bool:
+        """True for files and directories of the revision."""
+        path = _clean(path)
+        if path.startswith("../") or path == "..":
+            return False
+        if self.mode == "files":
+            return os.path.exists(os.path.join(self.repo_path, path.replace("/", os.sep)))
+        if path in self.dirty():
+            return os.path.exists(os.path.join(self.repo_path, path.replace("/", os.sep)))
+        if path in self.entries():
+            return True
+        if self._dirs is None:
+            self._dirs = {p.rsplit("/", 1)[0] for p in self.entries() if "/" in p}
+            self._dirs |= {d.rsplit("/", i)[0] for d in list(self._dirs) for i in range(1, d.count("/") + 1)}
+        return path in self._dirs
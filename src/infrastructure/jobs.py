@@ -0,0 +1,130 @@
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+class QueueFullError(Exception):
+    """Raised when the audit queue is at capacity; the API maps this to HTTP 429."""
+
+class AuditJob:
+    """One submitted audit and its lifecycle: queued -> running -> done | failed."""
+
+    def __init__(self, job_id: str, params: Dict[str, Any]):
+        self.job_id = job_id
+        self.params = params
+        self.status = "queued"
+        self.result: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Progress feed for SSE subscribers; the index of an event doubles as its SSE id.
+        self.events: List[Dict[str, Any]] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def publish(self, event: Dict[str, Any]):
+        self.events.append(event)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            # Supplied evidence (re-judge jobs) can be large; status only reports its size.
+            "params": {k: (f"<{len(v)} agents>" if k == "evidences" and v else v) for k, v in self.params.items()},
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_wait_s": round(self.started_at - self.submitted_at, 3) if self.started_at else None,
+            "run_s": round(self.finished_at - self.started_at, 3) if self.finished_at and self.started_at else None,
+            "events": len(self.events),
+        }
+
+class AuditJobManager:
+    """
+    Non-blocking Audit Queue: runs audits on a bounded worker pool so the event loop
+    never waits on cloning or graph execution. Submissions beyond max_queue are rejected.
+    """
+
+    def __init__(self, runner: Callable[..., Any], max_workers: int = 2, max_queue: int = 16, retain: int = 256):
+        self.runner = runner
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retain = retain
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audit-worker")
+        self._jobs: "OrderedDict[str, AuditJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def submit(self, **params) -> AuditJob:
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise QueueFullError(f"Audit queue is full ({self._queued}/{self.max_queue} waiting).")
+            job = AuditJob(uuid4().hex, params)
+            self._jobs[job.job_id] = job
+            self._queued += 1
+            self._trim()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[AuditJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_limit": self.max_queue,
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: AuditJob):
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+            job.status = "running"
+            job.started_at = time.time()
+        try:
+            job.result = self.runner(job, **job.params)
+            job.status = "done"
+        except Exception as e:
+            traceback.print_exc()
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._in_flight -= 1
+                if job.status == "done":
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    def _trim(self):
+        """Forgets the oldest finished jobs so a long-lived server has bounded memory."""
+        if len(self._jobs) <= self.retain:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.retain:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
@@ -1,44 +1,292 @@
+import atexit
+import json
 import os
-from langsmith import Client
-from uuid import uuid4
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
 from dotenv import load_dotenv
 
 # Load variables from your .env file
 load_dotenv()
 
-class ObservabilityManager:
-    def __init__(self):
-        self.api_key = os.getenv("LANGCHAIN_API_KEY")
-        self.project_name = os.getenv("LANGCHAIN_PROJECT", "Forensic-Swarm-Auditor-W2")
+# --- 1. EXPORTERS (Where finished spans go) ---
+class TraceExporter:
+    """Backend interface: receives finished spans in batches, always on the tracer's worker thread."""
+    name = "none"
+
+    def export(self, spans: List[Dict[str, Any]]):
+        pass
+
+    def close(self):
+        pass
+
+class JsonlTraceExporter(TraceExporter):
+    """
+    Local sink for air-gapped deployments: one JSON object per span, with OpenTelemetry
+    field names, appended to a daily file per process so concurrent workers never interleave.
+    """
+    name = "jsonl"
+
+    def __init__(self, root: Optional[str] = None):
+        base = root or os.getenv("FORENSIC_TRACE_DIR", Path.home() / ".cache" / "forensic-swarm" / "traces")
+        self.root = Path(base).expanduser()
+
+    def path(self) -> Path:
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        return self.root / f"spans-{day}-{os.getpid()}.jsonl"
+
+    def export(self, spans: List[Dict[str, Any]]):
+        target = self.path()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(span, default=str, separators=(",", ":")) + "\n" for span in spans)
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(payload)
+
+class LangSmithTraceExporter(TraceExporter):
+    """Optional backend: spans become LangSmith runs. langsmith is only imported when selected."""
+    name = "langsmith"
+
+    def __init__(self, project_name: Optional[str] = None):
+        from langsmith import Client
+        self.project_name = project_name or os.getenv("LANGCHAIN_PROJECT", "Forensic-Swarm-Auditor-W2")
         self.client = Client()
 
-    def initialize_courtroom(self):
-        """
-        Forces a heartbeat trace to LangSmith. 
-        This ensures the project exists in the dashboard before the Audit starts.
-        """
-        if not self.api_key:
-            print("❌ CRITICAL: LANGCHAIN_API_KEY is missing from environment.")
-            return False
-        
-        try:
-            run_id = uuid4()
-            # Send a 'System Ready' signal to LangSmith
+    @staticmethod
+    def _run_id(span_id: Optional[str]) -> Optional[UUID]:
+        return UUID(int=int(span_id, 16)) if span_id else None
+
+    def export(self, spans: List[Dict[str, Any]]):
+        # Parents first, so LangSmith has the root run before its children arrive.
+        for span in sorted(spans, key=lambda s: s.get("parent_span_id") is not None):
             self.client.create_run(
-                name="Forensic_Infrastructure_Check",
+                id=self._run_id(span["span_id"]),
+                parent_run_id=self._run_id(span.get("parent_span_id")),
+                name=span["name"],
                 run_type="chain",
-                inputs={"status": "initializing_agent_swarm"},
+                inputs={"trace_id": span["trace_id"]},
+                outputs=span.get("attributes", {}),
+                start_time=datetime.fromtimestamp(span["start_time_unix_nano"] / 1e9, timezone.utc),
+                end_time=datetime.fromtimestamp(span["end_time_unix_nano"] / 1e9, timezone.utc),
+                error=span.get("status", {}).get("message"),
                 project_name=self.project_name,
-                id=run_id
             )
-            self.client.update_run(run_id, outputs={"result": "Infrastructure Verified"})
-            print(f"✅ Handshake Success: Project '{self.project_name}' is now active.")
+
+    def close(self):
+        flush = getattr(self.client, "flush", None)
+        if flush:
+            flush()
+
+def build_exporter(kind: Optional[str] = None) -> TraceExporter:
+    kind = (kind or os.getenv("FORENSIC_TRACE_EXPORTER", "jsonl")).lower()
+    if kind == "jsonl":
+        return JsonlTraceExporter()
+    if kind == "langsmith":
+        return LangSmithTraceExporter()
+    if kind == "none":
+        return TraceExporter()
+    raise ValueError(f"Unknown trace exporter '{kind}' (expected jsonl, langsmith or none)")
+
+# --- 2. BATCHING TRACER (Nodes enqueue; a background thread does the I/O) ---
+def new_trace_id() -> str:
+    return uuid4().hex
+
+def root_span_id(trace_id: str) -> str:
+    """The audit's root span id is derived from its trace id, so nodes can parent to it without coordination."""
+    return trace_id[:16]
+
+class BatchingTracer:
+    """
+    Non-blocking span pipeline. record() is a put_nowait on a bounded queue: when the
+    exporter falls behind, new spans are dropped and counted instead of stalling the graph.
+    A daemon thread drains the queue in batches of `batch_size`, or every `flush_interval`
+    seconds, whichever comes first. Sampling is decided per trace, so an audit is kept or
+    dropped whole.
+    """
+
+    def __init__(self, exporter: TraceExporter, sample_rate: float = 1.0, max_queue: int = 10000,
+                 batch_size: int = 256, flush_interval: float = 2.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._recorded = 0
+        self._dropped = 0
+        self._sampled_out = 0
+        self._exported = 0
+        self._export_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter.name != "none" and self.sample_rate > 0
+
+    def sampled(self, trace_id: Optional[str]) -> bool:
+        if self.sample_rate >= 1.0:
             return True
+        if not trace_id:
+            return random.random() < self.sample_rate
+        return int(trace_id[-8:], 16) / 0xFFFFFFFF < self.sample_rate
+
+    def record(self, span: Dict[str, Any]) -> bool:
+        """Queues a finished span; never blocks and never raises."""
+        if not self.enabled:
+            return False
+        if not self.sampled(span.get("trace_id")):
+            with self._lock:
+                self._sampled_out += 1
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        with self._lock:
+            self._recorded += 1
+        return True
+
+    def record_span(self, name: str, trace_id: Optional[str], start: float, end: float,
+                    attributes: Optional[Dict[str, Any]] = None, span_id: Optional[str] = None,
+                    parent_span_id: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """Builds an OTel-shaped span from wall-clock start/end seconds and queues it."""
+        trace_id = trace_id or new_trace_id()
+        return self.record({
+            "trace_id": trace_id,
+            "span_id": span_id or uuid4().hex[:16],
+            "parent_span_id": parent_span_id,
+            "name": name,
+            "start_time_unix_nano": int(start * 1e9),
+            "end_time_unix_nano": int(end * 1e9),
+            "attributes": attributes or {},
+            "status": {"code": "ERROR", "message": error} if error else {"code": "OK"},
+        })
+
+    def observe_node(self, entry: Dict[str, Any], state: Dict[str, Any]):
+        """Node observer for src.core.instrumentation: one child span of the audit per node run."""
+        trace_id = state.get("trace_id")
+        attributes = {k: v for k, v in entry.items() if k not in ("node", "started_at", "error")}
+        self.record_span(entry["node"], trace_id, entry["started_at"], entry["started_at"] + entry["wall_ms"] / 1000,
+                         attributes=attributes, parent_span_id=root_span_id(trace_id) if trace_id else None,
+                         error=entry.get("error"))
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._drain, name="trace-exporter", daemon=True)
+                self._worker.start()
+
+    def _drain(self):
+        batch: List[Any] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if isinstance(item, threading.Event):
+                self._export(batch)
+                batch = []
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._export(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _export(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+            with self._lock:
+                self._exported += len(batch)
         except Exception as e:
-            print(f"❌ Handshake Failed: {str(e)}")
+            # Tracing must never take an audit down; the spans are lost and counted.
+            with self._lock:
+                self._export_errors += len(batch)
+            print(f"⚠️ Trace export ({self.exporter.name}) failed: {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Blocks until everything queued so far has been handed to the exporter."""
+        if self._worker is None or not self._worker.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        self.flush(timeout)
+        self.exporter.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "exporter": self.exporter.name,
+                "sample_rate": self.sample_rate,
+                "queue_depth": self._queue.qsize(),
+                "recorded": self._recorded,
+                "exported": self._exported,
+                "dropped": self._dropped,
+                "sampled_out": self._sampled_out,
+                "export_errors": self._export_errors,
+            }
+
+def build_tracer() -> BatchingTracer:
+    return BatchingTracer(
+        build_exporter(),
+        sample_rate=float(os.getenv("FORENSIC_TRACE_SAMPLE_RATE", "1.0")),
+        max_queue=int(os.getenv("FORENSIC_TRACE_QUEUE_LIMIT", "10000")),
+        batch_size=int(os.getenv("FORENSIC_TRACE_BATCH_SIZE", "256")),
+        flush_interval=float(os.getenv("FORENSIC_TRACE_FLUSH_S", "2.0")),
+    )
+
+# Process-wide tracer shared by every graph compiled in this process.
+tracer = build_tracer()
+atexit.register(tracer.close)
+
+# --- 3. COURTROOM HANDSHAKE ---
+class ObservabilityManager:
+    def __init__(self, span_tracer: Optional[BatchingTracer] = None):
+        self.tracer = span_tracer or tracer
+        self.project_name = os.getenv("LANGCHAIN_PROJECT", "Forensic-Swarm-Auditor-W2")
+
+    def initialize_courtroom(self):
+        """
+        Queues a heartbeat span through the configured exporter. With the LangSmith backend
+        this makes the project exist in the dashboard before the audit starts; nothing here
+        waits on the network.
+        """
+        if self.tracer.exporter.name == "langsmith" and not os.getenv("LANGCHAIN_API_KEY"):
+            print("❌ CRITICAL: LANGCHAIN_API_KEY is missing from environment.")
             return False
 
+        now = time.time()
+        queued = self.tracer.record_span("Forensic_Infrastructure_Check", new_trace_id(), now, now,
+                                         attributes={"status": "initializing_agent_swarm", "result": "Infrastructure Verified"})
+        if queued:
+            print(f"✅ Handshake queued: '{self.tracer.exporter.name}' exporter for project '{self.project_name}'.")
+        else:
+            print(f"⚠️ Handshake not traced (exporter '{self.tracer.exporter.name}', sample rate {self.tracer.sample_rate}).")
+        return queued
+
 # Self-test logic
 if __name__ == "__main__":
     obs = ObservabilityManager()
-    obs.initialize_courtroom()
\ No newline at end of file
+    obs.initialize_courtroom()
+    obs.tracer.flush()
+    print(obs.tracer.stats())
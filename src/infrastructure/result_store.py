@@ -0,0 +1,157 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Bump when the stored state layout changes; older rows are then never served as cache hits.
+RESULT_SCHEMA_VERSION = 1
+
+# Final-state keys worth keeping. Workspace paths, the incremental ledger and derived
+# features are either ephemeral or rebuilt from these.
+STORED_KEYS = ("repo_url", "pdf_path", "revision", "rubric_id", "rubric_sha", "aggregated_score", "global_verdict",
+               "evidences", "opinions", "dispatch", "node_timings", "reuse", "clone_attempts", "trace_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo_url         TEXT NOT NULL,
+    head_sha         TEXT NOT NULL,
+    rubric_id        TEXT,
+    rubric_sha       TEXT NOT NULL,
+    variant          TEXT NOT NULL,
+    pdf_key          TEXT NOT NULL DEFAULT '',
+    engine_version   TEXT NOT NULL,
+    created_at       REAL NOT NULL,
+    elapsed_s        REAL,
+    aggregated_score REAL,
+    global_verdict   TEXT,
+    state            BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audits_by_repo ON audits (repo_url, created_at);
+CREATE INDEX IF NOT EXISTS audits_by_key ON audits (head_sha, rubric_sha, variant, pdf_key, engine_version);
+CREATE INDEX IF NOT EXISTS audits_by_time ON audits (created_at);
+"""
+
+_SUMMARY_COLUMNS = ("id", "repo_url", "head_sha", "rubric_id", "rubric_sha", "variant", "pdf_key",
+                    "created_at", "elapsed_s", "aggregated_score", "global_verdict")
+
+def normalize_repo_url(repo_url: str) -> str:
+    """One row key per repository however the URL was typed (trailing '/' or '.git')."""
+    url = (repo_url or "").strip().rstrip("/")
+    return url[:-4] if url.endswith(".git") else url
+
+def engine_version() -> str:
+    """Stored results are only reused while detective/judge logic and this schema are unchanged."""
+    from src.core.incremental import LEDGER_VERSION
+    return f"{LEDGER_VERSION}.{RESULT_SCHEMA_VERSION}"
+
+class ResultStore:
+    """
+    Every finished audit, in one local SQLite database: score, verdict, evidences,
+    opinions and node timings, indexed by repository, resolved HEAD, rubric hash and time.
+    A (HEAD, rubric, variant, PDF) key that was already audited is served from here
+    without cloning. WAL mode, one connection per thread.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        default = Path.home() / ".cache" / "forensic-swarm" / "results.db"
+        self.path = Path(path or os.getenv("FORENSIC_RESULT_DB", default)).expanduser()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode(state: Dict[str, Any]) -> bytes:
+        from src.core.progress import to_jsonable
+        payload = {key: to_jsonable(state[key]) for key in STORED_KEYS if key in state}
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        state = json.loads(zlib.decompress(row["state"]).decode("utf-8"))
+        state["result_store"] = {column: row[column] for column in _SUMMARY_COLUMNS}
+        return state
+
+    # --- Writes ---
+    def record(self, state: Dict[str, Any], head_sha: str, rubric_sha: str, variant: str = "full",
+               pdf_key: str = "", elapsed_s: Optional[float] = None) -> int:
+        """Stores one final state; returns its audit id."""
+        with self._conn() as conn:
+            cursor = conn.execute(
+                "INSERT INTO audits (repo_url, head_sha, rubric_id, rubric_sha, variant, pdf_key, engine_version, "
+                "created_at, elapsed_s, aggregated_score, global_verdict, state) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                (normalize_repo_url(state.get("repo_url", "")), head_sha, state.get("rubric_id"), rubric_sha, variant,
+                 pdf_key or "", engine_version(), time.time(), elapsed_s, state.get("aggregated_score"),
+                 state.get("global_verdict"), self._encode(state)))
+            return cursor.lastrowid
+
+    # --- Reads ---
+    def lookup(self, repo_url: str, head_sha: str, rubric_sha: str, variant: str = "full",
+               pdf_key: str = "") -> Optional[Dict[str, Any]]:
+        """The newest stored state for exactly this audit key, or None."""
+        row = self._conn().execute(
+            "SELECT * FROM audits WHERE head_sha=? AND rubric_sha=? AND variant=? AND pdf_key=? AND engine_version=? "
+            "AND repo_url=? ORDER BY created_at DESC LIMIT 1",
+            (head_sha, rubric_sha, variant, pdf_key or "", engine_version(), normalize_repo_url(repo_url))).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._decode(row)
+
+    def get(self, audit_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM audits WHERE id=?", (audit_id,)).fetchone()
+        return self._decode(row) if row is not None else None
+
+    def history(self, repo_url: str, limit: int = 50, since: Optional[float] = None,
+                rubric_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Audit summaries for one repository, newest first (no evidence payloads)."""
+        query = f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM audits WHERE repo_url=?"
+        params: List[Any] = [normalize_repo_url(repo_url)]
+        if since is not None:
+            query += " AND created_at >= ?"
+            params.append(since)
+        if rubric_id is not None:
+            query += " AND rubric_id = ?"
+            params.append(rubric_id)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._conn().execute(query, params)]
+
+    def repositories(self) -> List[Dict[str, Any]]:
+        """Every audited repository with its audit count and latest audit time."""
+        rows = self._conn().execute(
+            "SELECT repo_url, COUNT(*) AS audits, MAX(created_at) AS last_audit FROM audits "
+            "GROUP BY repo_url ORDER BY last_audit DESC")
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        count = self._conn().execute("SELECT COUNT(*) FROM audits").fetchone()[0]
+        return {"path": str(self.path), "audits": count, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+result_store = ResultStore()
+
+def result_cache_enabled() -> bool:
+    return os.getenv("FORENSIC_RESULT_CACHE", "1") != "0"
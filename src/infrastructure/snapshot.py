@@ -0,0 +1,101 @@
+import os
+import shutil
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from src.infrastructure.clone_cache import CloneError, MirrorCache, _git
+
+# Never part of an audit: VCS internals, dependency trees, virtualenvs and tool caches.
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", ".tox", ".nox",
+             ".mypy_cache", ".pytest_cache", ".ruff_cache"}
+
+def _skip_dir(path: str, name: str) -> bool:
+    # Virtualenvs are recognised by their marker file whatever they are called.
+    return name in SKIP_DIRS or os.path.isfile(os.path.join(path, name, "pyvenv.cfg"))
+
+def _copy_file(src: str, dst: str, follow_symlinks: bool = True) -> str:
+    """
+    copy2, but through copy_file_range where the kernel offers it: on reflink-capable
+    filesystems (btrfs, XFS) the data blocks are shared copy-on-write instead of duplicated.
+    """
+    if os.path.islink(src) or not hasattr(os, "copy_file_range"):
+        return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+        return dst
+    except OSError:
+        return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+def _work_tree_root(path: str) -> Optional[str]:
+    """The top of the git work tree at `path`, or None when it is not the root of a git checkout with commits."""
+    try:
+        top = subprocess.run(["git", "-C", path, "rev-parse", "--show-toplevel"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        subprocess.run(["git", "-C", path, "rev-parse", "--verify", "--quiet", "HEAD"],
+                       capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return top if os.path.realpath(top) == os.path.realpath(path) else None
+
+def _dirty_paths(source: str) -> List[Tuple[str, str]]:
+    """(status, path) for every modified, deleted or untracked (non-ignored) file in the work tree."""
+    out = _git(["status", "--porcelain=v1", "-z", "--untracked-files=all", "--no-renames"], source, cwd=source).stdout
+    return [(entry[:2], entry[3:]) for entry in out.split("\0") if entry]
+
+def _overlay_dirty(source: str, workspace: str) -> int:
+    """Replays the uncommitted state of `source` onto a clean checkout of its HEAD."""
+    applied = 0
+    for status, rel in _dirty_paths(source):
+        parts = rel.split("/")
+        if any(part in SKIP_DIRS for part in parts[:-1]):
+            continue
+        src, dst = os.path.join(source, rel), os.path.join(workspace, rel)
+        if "D" in status or not os.path.lexists(src):
+            if os.path.lexists(dst):
+                os.remove(dst)
+        else:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.islink(dst):
+                os.remove(dst)
+            _copy_file(src, dst, follow_symlinks=False)
+        applied += 1
+    return applied
+
+def snapshot_local(source: str, workspace: str, include_dirty: bool = False) -> Dict[str, Any]:
+    """
+    Materializes a local directory into the (empty) sandbox without duplicating it.
+    A git work tree is cloned from its own object store: hardlinked objects on the same
+    filesystem, alternates otherwise, and only HEAD's tracked files are checked out, so
+    ignored trees (node_modules, virtualenvs, build output) are never touched. Uncommitted
+    and untracked files are layered on top only when `include_dirty` is set. Anything
+    else is copied file by file, skipping SKIP_DIRS. The sandbox never shares writable
+    files with the original working copy.
+    """
+    started = time.perf_counter()
+    root = _work_tree_root(source)
+    if root is not None:
+        share_mode = "--local" if MirrorCache._same_device(root, workspace) else "--shared"
+        _git(["clone", "--quiet", share_mode, root, workspace], source)
+        stats = {
+            "mode": f"git{share_mode}",
+            "head": _git(["rev-parse", "HEAD"], source, cwd=workspace).stdout.strip(),
+            "dirty_files": _overlay_dirty(root, workspace) if include_dirty else 0,
+        }
+    else:
+        try:
+            shutil.copytree(source, workspace, dirs_exist_ok=True, symlinks=True, copy_function=_copy_file,
+                            ignore=lambda path, names: {n for n in names if _skip_dir(path, n)})
+        except (OSError, shutil.Error) as e:
+            raise CloneError(source, str(e)) from e
+        stats = {"mode": "copy", "head": None, "dirty_files": 0}
+    stats["elapsed_s"] = round(time.perf_counter() - started, 3)
+    print(f"📸 Snapshot ({stats['mode']}): {source} in {stats['elapsed_s']}s"
+          + (f", {stats['dirty_files']} uncommitted files" if stats["dirty_files"] else ""))
+    return stats
@@ -2,6 +2,7 @@ import os
 from typing import Dict, Any, List
 # Syncing with the standardized state name to avoid ImportErrors
 from src.core.state import AgentState 
+from src.core.features import build_feature_index
 
 def detective_node(state: AgentState) -> Dict[str, Any]:
     """
@@ -19,30 +20,27 @@ def detective_node(state: AgentState) -> Dict[str, Any]:
     # 2. Mapping agent keys to their specific forensic weight
     agent_keys = ["repo_agent", "doc_agent", "vision_agent"]
     
-    # We create a refined ledger specifically for the Report Generator
-    refined_ledger = {}
+    # Only agents that filed nothing get a ledger entry from here: the store already
+    # holds one normalized record per (agent, criterion), so re-emitting it would be a no-op.
+    placeholders = {}
 
     for agent in agent_keys:
-        # Handling both list of findings or a single finding dict
-        raw_data = evidences.get(agent, [])
-        findings = raw_data if isinstance(raw_data, list) else [raw_data]
-        
-        # Filter out empty or None results
-        findings = [f for f in findings if f]
+        findings = [f for f in evidences.get(agent, []) if f]
         
         if not findings:
             # Log empty agent results
-            refined_ledger[agent] = [{
+            placeholders[agent] = [{
                 "found": False, 
                 "criterion": "Scan", 
                 "rationale": f"No artifacts found for {agent}."
             }]
             continue
             
-        agent_refined_findings = []
         for item in findings:
-            if not isinstance(item, dict): continue
-            
+            if (item.get("metadata") or {}).get("skipped"):
+                # Not dispatched for this rubric/input: recorded, but not a failed criterion
+                detailed_rationale.append(f"⏭️ SKIPPED [{agent.upper()}]: {item.get('rationale')}")
+                continue
             total_criteria += 1
             # Check for "found" status
             is_found = item.get("found", False)
@@ -54,15 +52,6 @@ def detective_node(state: AgentState) -> Dict[str, Any]:
             else:
                 detailed_rationale.append(f"❌ FAILED [{agent.upper()}]: {goal}")
 
-            # Standardizing finding structure for the markdown report
-            agent_refined_findings.append({
-                "found": is_found,
-                "criterion": goal,
-                "rationale": item.get("rationale") or item.get("reasoning") or "Verified by agent."
-            })
-        
-        refined_ledger[agent] = agent_refined_findings
-
     # 3. Calculate Weighted Score (1.0 - 5.0 Scale)
     if total_criteria > 0:
         raw_ratio = passed_criteria / total_criteria
@@ -76,12 +65,16 @@ def detective_node(state: AgentState) -> Dict[str, Any]:
     summary = f"Audit complete. Processed {total_criteria} forensic criteria. "
     summary += f"Found {passed_criteria} matches across Repository, Documentation, and Vision layers."
 
+    # 5. Judicial Feature Index: built once here, read in O(1) by every judge
+    features = build_feature_index(evidences)
+
     print(f"🕵️ Detective: Finalizing record with Score {calc_score}")
 
     return {
         "aggregated_score": calc_score, 
         "global_verdict": verdict,
-        "evidences": refined_ledger,    # Reducer will merge this into the state
+        "evidences": placeholders,      # Reducer upserts these into the ledger
+        "features": features,
         "log": summary,                 # Added for graph logging
         "metadata": {
             "summary": summary,
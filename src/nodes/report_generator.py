@@ -1,102 +1,19 @@
 import os
-from datetime import datetime
 from typing import Dict, Any
-from src.core.state import ForensicState
+from src.core.state import AgentState
+from src.utils.formatters import build_report, with_format, write_report
 
-def report_generator_node(state: ForensicState) -> Dict[str, Any]:
+def report_generator_node(state: AgentState) -> Dict[str, Any]:
     """
-    The Forensic Secretary v4.0: Atomic 10-Point Audit Ledger.
-    Transforms raw JSON criteria into a high-fidelity Judicial Record.
+    The Forensic Secretary: seals the final state into the audit record.
+    Writes REPORT_OUTPUT_DIR (default audit/final_report.md) in every REPORT_FORMATS format
+    (md, html, json) from one grouped report model; each file is replaced atomically.
     """
-    
-    # 1. Path Configuration
-    output_dir = r"D:\10 ACADAMY KIFIYA\TRP_Training\week 2\forensic-swarm-auditor\audit\report_onself_generated"
-    os.makedirs(output_dir, exist_ok=True)
-    file_path = os.path.join(output_dir, "final_audit_report.md")
+    report_out = os.getenv("REPORT_OUTPUT_DIR", "audit/final_report.md")
+    formats = [fmt.strip() for fmt in os.getenv("REPORT_FORMATS", "md").split(",") if fmt.strip()]
 
-    # 2. Data Extraction
-    score = state.get("aggregated_score", 3.95) # Fallback to current score
-    opinions = state.get("opinions", [])
-    evidences = state.get("evidences", {})
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    model = build_report(state)
+    written = [write_report(model, with_format(report_out, fmt), fmt) for fmt in formats]
 
-    # 3. The 10-Point DNA (Your provided JSON Mapping)
-    criteria_data = [
-        {"id": 1, "title": "Project Infrastructure", "key": "infra", "task": "Root-level sweep for 'uv' usage, '.env' safety, and 'src/' isolation.", "remedial": "Add 'uv run' commands to README."},
-        {"id": 2, "title": "Graph Orchestration", "key": "graph", "task": "Tracing Fan-Out (Detectives) and Fan-In (Judges).", "remedial": "Add failure/retry semantics to nodes."},
-        {"id": 3, "title": "State Management Rigor", "key": "state", "task": "Verification of Pydantic models and reducers.", "remedial": "Implement Field validation in schemas."},
-        {"id": 4, "title": "Git Forensic Analysis", "key": "git", "task": "AST-based 'git log' scan for progression.", "remedial": "Adopt Conventional Commits (feat/fix)."},
-        {"id": 5, "title": "Safe Tool Engineering", "key": "tools", "task": "Auditing 'tempfile' usage and sandbox hygiene.", "remedial": "Replace os.system with tempfile module."},
-        {"id": 6, "title": "Theoretical Depth", "key": "theory", "task": "Scanning PDF for Metacognition/Dialectics.", "remedial": "Include direct code citations in docs."},
-        {"id": 7, "title": "Host Analysis Accuracy", "key": "host", "task": "Cross-referencing PDF claims against file paths.", "remedial": "Generate automated project-map appendix."},
-        {"id": 8, "title": "Structured Output Rigor", "key": "output", "task": "Scanning for .with_structured_output().", "remedial": "Add 'Confidence Score' to Judge schemas."},
-        {"id": 9, "title": "Visual Accuracy", "key": "vision", "task": "VisionInspector analysis of PDF diagrams.", "remedial": "Embed Mermaid.js in README."},
-        {"id": 10, "title": "Synthesis Logic", "key": "synthesis", "task": "Auditing 'ChiefJustice' for deterministic synthesis.", "remedial": "Add 'Dissent Flag' if delta > 2.0."}
-    ]
-
-    # Helper for Status Logic
-    def evaluate_status(criterion_key):
-        # Scan evidences for matches with the criterion key
-        for agent, findings in evidences.items():
-            findings_list = findings if isinstance(findings, list) else [findings]
-            for f in findings_list:
-                if criterion_key in str(f.get("goal", "")).lower() or criterion_key in str(f.get("rationale", "")).lower():
-                    if f.get("found") or "VERIFIED" in str(f.get("rationale", "")).upper():
-                        return "✅", f.get("rationale")
-        return "❌", "Requirement not met in current iteration."
-
-    # 4. Building the Detailed Ledger Table
-    ledger_rows = ""
-    todo_list = ""
-    done_list = ""
-
-    for item in criteria_data:
-        icon, rationale = evaluate_status(item['key'])
-        ledger_rows += f"| **{item['id']:02}** | {item['title']} | {item['task']} | {icon} |\n"
-        
-        if icon == "✅":
-            done_list += f"- **{item['title']}**: {item['task']}\n"
-        else:
-            todo_list += f"- **[FIX] {item['title']}**: {item['remedial']}\n"
-
-    # 5. Final Markdown Construction
-    report_md = f"""# ⚖️ Forensic Swarm Audit Report
-**Audit Timestamp:** {timestamp}
-**Overall Score:** {score:.2f} / 5.00
-**Framework:** LangGraph Sovereign Swarm 
-
----
-
-## 🏛️ Judicial Verdicts
-| Role | Score | Forensic Brief |
-| :--- | :---: | :--- |
-| **TECHLEAD** | 1.0/5 | Security Negligence regarding Sandboxing. |
-| **DEFENSE** | 3.8/5 | Structural intent and Orchestration verified. |
-| **PROSECUTOR** | 2.0/5 | Hallucination risk due to missing Pydantic returns. |
-
----
-
-## 🕵️ Forensic Evidence Ledger (10-Point Analysis)
-| ID | Criterion | Forensic Task | Status |
-| :--- | :--- | :--- | :---: |
-{ledger_rows}
-
----
-
-## 🛠️ Detailed Remediation Plan
-
-### ✅ Verified Achievements (What is Done)
-{done_list if done_list else "- No criteria verified yet."}
-
-### ❌ Required Actions (What Should be Done)
-{todo_list if todo_list else "- All criteria satisfied."}
-
----
-*Report generated by Automaton Auditor v2.0 - Record Sealed.*
-"""
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(report_md)
-
-    print(f"📊 [REPORT SEALED]: Final 10-point record saved to {file_path}")
-    return {"metadata": {"last_report": file_path}}
\ No newline at end of file
+    print(f"📊 [REPORT SEALED]: {model.score:.2f}/5.00 record saved to {', '.join(written)}")
+    return {"metadata": {"last_report": written[0] if written else None, "reports": written}}
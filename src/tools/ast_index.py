@@ -0,0 +1,213 @@
+import ast
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.infrastructure.git_objects import RepoView, git_blob_sha  # noqa: F401 (git_blob_sha re-exported)
+
+# Bump when the symbol-table layout changes so stale cache entries are ignored.
+INDEX_SCHEMA_VERSION = "v1"
+# Below this many cache misses, spinning up a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 32
+
+def _dotted(node: ast.AST) -> str:
+    """Renders Name/Attribute chains such as 'pydantic.BaseModel' or 'operator.add'."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        prefix = _dotted(node.value)
+        return f"{prefix}.{node.attr}" if prefix else node.attr
+    if isinstance(node, ast.Subscript):
+        return _dotted(node.value)
+    return ""
+
+def _literal(node: ast.AST) -> Optional[str]:
+    """Node/edge identifiers: string constants, or names such as START/END."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    name = _dotted(node)
+    return name or None
+
+def parse_python_source(source, path: str = "<memory>") -> Dict[str, Any]:
+    """
+    The Detective's Microscope, single pass: extracts the compact symbol table for one file.
+    Classes and bases, Annotated reducers, operator.add/ior uses, StateGraph wiring,
+    tempfile sandbox calls and try/except density.
+    """
+    table = {
+        "classes": [],
+        "annotated_reducers": [],
+        "operator_reducers": [],
+        "state_graphs": 0,
+        "graph_nodes": [],
+        "graph_edges": [],
+        "sandbox_calls": [],
+        "try_blocks": 0,
+        "error": None,
+    }
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError) as e:
+        table["error"] = f"{type(e).__name__}: {e}"
+        return table
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            table["classes"].append({
+                "name": node.name,
+                "bases": [_dotted(b) for b in node.bases],
+                "line": node.lineno,
+            })
+        elif isinstance(node, ast.AnnAssign):
+            annotation = node.annotation
+            if isinstance(annotation, ast.Subscript) and _dotted(annotation.value).split(".")[-1] == "Annotated":
+                args = annotation.slice.elts if isinstance(annotation.slice, ast.Tuple) else [annotation.slice]
+                field = node.target.id if isinstance(node.target, ast.Name) else _dotted(node.target)
+                for meta in args[1:]:
+                    table["annotated_reducers"].append({"field": field, "reducer": _dotted(meta), "line": node.lineno})
+        elif isinstance(node, ast.Attribute):
+            if node.attr in ("add", "ior") and isinstance(node.value, ast.Name) and node.value.id == "operator":
+                table["operator_reducers"].append(f"operator.{node.attr}")
+        elif isinstance(node, ast.Try):
+            table["try_blocks"] += 1
+        elif isinstance(node, ast.Call):
+            callee = _dotted(node.func)
+            short = callee.split(".")[-1]
+            if short == "StateGraph":
+                table["state_graphs"] += 1
+            elif short == "add_node" and node.args:
+                name = _literal(node.args[0])
+                if name:
+                    table["graph_nodes"].append(name)
+            elif short == "add_edge" and len(node.args) >= 2:
+                src, dst = _literal(node.args[0]), _literal(node.args[1])
+                if src and dst:
+                    table["graph_edges"].append([src, dst])
+            elif callee.startswith("tempfile."):
+                table["sandbox_calls"].append(callee)
+    return table
+
+def _parse_blob(args: Tuple[str, Optional[bytes]]) -> Tuple[str, Dict[str, Any]]:
+    """Process-pool entry point: parses one file's contents (None when it could not be read)."""
+    rel_path, data = args
+    if data is None:
+        return rel_path, {**parse_python_source(""), "error": "OSError: unreadable"}
+    return rel_path, parse_python_source(data, rel_path)
+
+def parse_blobs(items: List[Tuple[str, Optional[bytes]]], workers: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """(key, source) pairs -> (key, symbol table); across a process pool once there are enough of them."""
+    workers = workers or int(os.getenv("FORENSIC_AST_WORKERS", "0")) or os.cpu_count() or 1
+    if len(items) >= PARALLEL_THRESHOLD and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_parse_blob, items, chunksize=max(1, len(items) // (workers * 4))))
+    return [_parse_blob(item) for item in items]
+
+def python_blob_shas(workspace: str, view: Optional[RepoView] = None) -> Dict[str, str]:
+    """
+    Maps every Python file in the workspace to its git blob SHA.
+    Tracked files come straight from the index or tree; dirty, untracked or non-git files are hashed.
+    """
+    if view is not None:
+        return view.blob_shas("*.py")
+    with RepoView(workspace) as view:
+        return view.blob_shas("*.py")
+
+class SymbolCache:
+    """On-disk symbol tables keyed by git blob SHA: unchanged files are never re-parsed."""
+
+    def __init__(self, root: Optional[str] = None):
+        base = root or os.getenv("FORENSIC_AST_CACHE_DIR", Path.home() / ".cache" / "forensic-swarm" / "ast")
+        self.root = Path(base).expanduser() / INDEX_SCHEMA_VERSION
+
+    def _path(self, sha: str) -> Path:
+        return self.root / sha[:2] / f"{sha[2:]}.json"
+
+    def get(self, sha: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(sha), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, sha: str, table: Dict[str, Any]):
+        target = self._path(sha)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(table, f, separators=(",", ":"))
+        os.replace(tmp, target)
+
+class SymbolIndex:
+    """Whole-repository symbol table with the aggregate queries the detectives need."""
+
+    def __init__(self, files: Dict[str, Dict[str, Any]], stats: Dict[str, int]):
+        self.files = files
+        self.stats = stats
+
+    def pydantic_models(self) -> List[Tuple[str, str]]:
+        return [(path, cls["name"]) for path, table in self.files.items()
+                for cls in table["classes"]
+                if any(base.split(".")[-1] == "BaseModel" for base in cls["bases"])]
+
+    def annotated_reducers(self) -> List[Tuple[str, str, str]]:
+        return [(path, r["field"], r["reducer"]) for path, table in self.files.items()
+                for r in table["annotated_reducers"]]
+
+    def operator_reducers(self) -> List[Tuple[str, str]]:
+        return [(path, op) for path, table in self.files.items() for op in table["operator_reducers"]]
+
+    def graph_files(self) -> List[str]:
+        return [path for path, table in self.files.items() if table["state_graphs"] and table["graph_nodes"]]
+
+    def graph_nodes(self) -> List[str]:
+        return [node for table in self.files.values() for node in table["graph_nodes"]]
+
+    def graph_edges(self) -> List[Tuple[str, str]]:
+        return [tuple(edge) for table in self.files.values() for edge in table["graph_edges"]]
+
+    def sandbox_calls(self) -> List[Tuple[str, str]]:
+        return [(path, call) for path, table in self.files.items() for call in table["sandbox_calls"]]
+
+    def try_blocks(self) -> int:
+        return sum(table["try_blocks"] for table in self.files.values())
+
+def build_symbol_index(workspace: str, cache: Optional[SymbolCache] = None, workers: Optional[int] = None,
+                       view: Optional[RepoView] = None) -> SymbolIndex:
+    """
+    Indexes every Python file in the workspace (or in `view`, any revision of any repository,
+    checked out or not) in one pass.
+    Cache hits are served by blob SHA; misses are read through the object reader and parsed
+    across a process pool.
+    """
+    cache = cache or SymbolCache()
+    owned = view is None
+    view = view or RepoView(workspace)
+    try:
+        shas = python_blob_shas(workspace, view)
+        files: Dict[str, Dict[str, Any]] = {}
+
+        unparsed = []
+        for rel_path, sha in shas.items():
+            table = cache.get(sha)
+            if table is None:
+                unparsed.append(rel_path)
+            else:
+                files[rel_path] = table
+        # Over a blobless clone, every miss is fetched in one batch before it is read.
+        view.prefetch(unparsed)
+        misses = [(rel_path, view.read(rel_path)) for rel_path in unparsed]
+    finally:
+        if owned:
+            view.close()
+
+    for rel_path, table in parse_blobs(misses, workers):
+        files[rel_path] = table
+        if not (table["error"] or "").startswith("OSError"):
+            cache.put(shas[rel_path], table)
+
+    # Path order, whatever was cached: every SymbolIndex query (and so every finding built
+    # from one) must come out the same on a cold and on an incremental audit.
+    files = {rel_path: files[rel_path] for rel_path in sorted(files)}
+    return SymbolIndex(files, {"files": len(shas), "cached": len(shas) - len(misses), "parsed": len(misses)})
@@ -0,0 +1,197 @@
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.infrastructure.git_objects import GitObjectReader
+from src.tools.ast_index import SymbolCache, parse_blobs
+from src.tools.git_history import RECORD_SEP, FIELD_SEP
+
+# --- Protocol C.2: Structural Criteria Over Time ---
+# The repo detective's structural checks, reduced to per-file flags so a commit is scored by
+# adding and subtracting the flags of the files it touched.
+CRITERIA = ("pydantic_state", "annotated_reducers", "state_graph", "sandbox")
+# Each criterion needs one of these names spelled out in the source; a blob carrying none
+# of them cannot pass any criterion, so it is never parsed.
+NEEDLES = (b"BaseModel", b"Annotated", b"StateGraph", b"TemporaryDirectory")
+NO_FLAGS = (False,) * len(CRITERIA)
+
+def file_flags(table: Dict[str, Any]) -> Tuple[bool, ...]:
+    """The CRITERIA a single file satisfies (same tests as the repo detective's SymbolIndex)."""
+    return (
+        any(base.split(".")[-1] == "BaseModel" for cls in table["classes"] for base in cls["bases"]),
+        bool(table["annotated_reducers"]),
+        bool(table["state_graphs"] and table["graph_nodes"]),
+        "tempfile.TemporaryDirectory" in table["sandbox_calls"],
+    )
+
+def _base_tree(repo_path: str, base: str) -> Dict[str, str]:
+    """Python files of the range's base commit, path -> blob id."""
+    out = subprocess.run(["git", "-C", repo_path, "ls-tree", "-r", "-z", "--full-tree", base],
+                         capture_output=True, check=True).stdout
+    tree = {}
+    for record in out.split(b"\0"):
+        meta, _, path = record.partition(b"\t")
+        fields = meta.split()
+        if len(fields) == 3 and fields[1] == b"blob" and path.endswith(b".py"):
+            tree[path.decode("utf-8", "surrogateescape")] = fields[2].decode()
+    return tree
+
+def read_changes(repo_path: str, rev_range: str = "HEAD") -> List[Dict[str, Any]]:
+    """
+    One `git log --raw` pass over the first-parent chain, oldest first: for every commit
+    its id, timestamp and the .py blobs it added, modified (path -> blob id) or deleted
+    (path -> None). Tree diffs only, so no file contents are read here.
+    """
+    cmd = ["git", "-C", repo_path, "-c", "core.quotepath=off", "log", "--reverse", "--first-parent",
+           "--diff-merges=first-parent", "--raw", "--no-renames", "--no-abbrev",
+           "--format=%x1e%H%x1f%at", rev_range]
+    commits: List[Dict[str, Any]] = []
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for line in proc.stdout:
+            if line.startswith(RECORD_SEP):
+                sha, _, ts = line[1:].rstrip(b"\n").partition(FIELD_SEP)
+                commits.append({"commit": sha.decode(), "timestamp": int(ts), "changes": {}})
+            elif line.startswith(b":") and commits:
+                meta, _, path = line.rstrip(b"\n").partition(b"\t")
+                if not path.endswith(b".py"):
+                    continue
+                fields = meta.split()  # :old_mode new_mode old_oid new_oid status
+                status, new_mode, new_oid = fields[4][:1], fields[1], fields[3].decode()
+                gone = status == b"D" or new_mode == b"160000"
+                commits[-1]["changes"][path.decode("utf-8", "surrogateescape")] = None if gone else new_oid
+        stderr = proc.stderr.read().decode("utf-8", "replace")
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    if proc.returncode != 0:
+        raise ValueError(f"git log failed for '{rev_range}': {stderr.strip()}")
+    return commits
+
+def _sampled(commits: List[Dict[str, Any]], every: int) -> Set[int]:
+    """Indexes of the commits that get a trend row: every Nth, and always the last."""
+    picked = set(range(0, len(commits), max(1, every)))
+    if commits:
+        picked.add(len(commits) - 1)
+    return picked
+
+def audit_history(repo_path: str, rev_range: str = "HEAD", every: int = 1,
+                  cache: Optional[SymbolCache] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Scores the structural criteria at every commit (or every `every`th) of `rev_range`
+    ('HEAD', 'v1.0..HEAD', ...) without checking anything out.
+    Each distinct blob is parsed at most once, through the blob-SHA AST cache; misses are
+    read via one cat-file process and parsed across a process pool. Commits are then scored
+    by applying only the files they changed.
+    """
+    started = time.perf_counter()
+    cache = cache or SymbolCache()
+    commits = read_changes(repo_path, rev_range)
+    base = rev_range.split("..")[0] if ".." in rev_range else None
+    tree = _base_tree(repo_path, base) if base else {}
+    sampled = _sampled(commits, every)
+
+    # 1. Which blobs do the sampled commits contain? Only those are ever parsed; versions
+    #    overwritten between two samples are skipped (their flags are never added).
+    needed, touched = set(tree.values()), set()
+    running = dict(tree)
+    for index, commit in enumerate(commits):
+        for path, oid in commit["changes"].items():
+            if oid is None:
+                running.pop(path, None)
+            else:
+                running[path] = oid
+            touched.add(path)
+        if index in sampled:
+            needed.update(running[path] for path in touched if path in running)
+            touched = set()
+
+    # 2. Symbol tables: cache hits first, then one batch of parses for the rest
+    flags: Dict[str, Tuple[bool, ...]] = {}
+    misses, skipped = [], 0
+    with GitObjectReader(repo_path) as reader:
+        for oid in needed:
+            table = cache.get(oid)
+            if table is not None:
+                flags[oid] = file_flags(table)
+                continue
+            data = reader.blob(oid)
+            if data is not None and not any(needle in data for needle in NEEDLES):
+                flags[oid] = NO_FLAGS
+                skipped += 1
+            else:
+                misses.append((oid, data))
+    for oid, table in parse_blobs(misses, workers):
+        flags[oid] = file_flags(table)
+        if not (table["error"] or "").startswith("OSError"):
+            cache.put(oid, table)
+
+    # 3. Replay: per-criterion file counts, adjusted only for the files each commit touched
+    counts = [0] * len(CRITERIA)
+    def apply(oid: Optional[str], sign: int):
+        if oid is not None and oid in flags:
+            for i, hit in enumerate(flags[oid]):
+                counts[i] += sign * hit
+
+    running = dict(tree)
+    for oid in running.values():
+        apply(oid, 1)
+    rows, first_passed, regressions = [], {}, {c: 0 for c in CRITERIA}
+    previous = None
+    for index, commit in enumerate(commits):
+        for path, oid in commit["changes"].items():
+            apply(running.get(path), -1)
+            if oid is None:
+                running.pop(path, None)
+            else:
+                running[path] = oid
+                apply(oid, 1)
+        if index not in sampled:
+            continue
+        passed = tuple(count > 0 for count in counts)
+        for name, now, before in zip(CRITERIA, passed, previous or NO_FLAGS):
+            if now and name not in first_passed:
+                first_passed[name] = {"index": index, "commit": commit["commit"], "timestamp": commit["timestamp"]}
+            if before and not now:
+                regressions[name] += 1
+        rows.append({"index": index, "commit": commit["commit"][:10], "timestamp": commit["timestamp"],
+                     "python_files": len(running), **dict(zip(CRITERIA, passed))})
+        previous = passed
+
+    return {
+        "range": rev_range,
+        "commits": len(commits),
+        "sampled": len(rows),
+        "every": every,
+        "blobs_needed": len(needed),
+        "blobs_parsed": len(misses),
+        "blobs_skipped": skipped,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "first_passed": first_passed,
+        "regressions": regressions,
+        "rows": rows,
+    }
+
+def trend_markdown(result: Dict[str, Any]) -> str:
+    """
+    Compact trend table: the first and last sampled commits plus every commit where a
+    criterion flipped, followed by when each criterion first passed.
+    """
+    header = "| # | Commit | Date | .py files | " + " | ".join(CRITERIA) + " |"
+    lines = [f"## Criteria Over Time ({result['range']}, {result['commits']} commits, every {result['every']})", "",
+             header, "|" + " :--- |" * (4 + len(CRITERIA))]
+    rows = result["rows"]
+    for i, row in enumerate(rows):
+        flipped = i == 0 or i == len(rows) - 1 or any(row[c] != rows[i - 1][c] for c in CRITERIA)
+        if flipped:
+            date = time.strftime("%Y-%m-%d", time.gmtime(row["timestamp"]))
+            marks = " | ".join("✅" if row[c] else "❌" for c in CRITERIA)
+            lines.append(f"| {row['index']} | `{row['commit']}` | {date} | {row['python_files']} | {marks} |")
+    lines += ["", "| Criterion | First passed | Regressions |", "| :--- | :--- | :--- |"]
+    for name in CRITERIA:
+        first = result["first_passed"].get(name)
+        where = f"commit #{first['index']} `{first['commit'][:10]}`" if first else "never"
+        lines.append(f"| {name} | {where} | {result['regressions'][name]} |")
+    lines.append("")
+    lines.append(f"*{result['blobs_needed']} distinct blobs: {result['blobs_parsed']} parsed, "
+                 f"{result['blobs_skipped']} skipped by the token pre-filter; {result['elapsed_s']}s.*")
+    return "\n".join(lines) + "\n"
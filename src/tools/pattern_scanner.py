@@ -0,0 +1,137 @@
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+PATH_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_/")
+
+class AhoCorasick:
+    """
+    Multi-pattern automaton: every pattern is matched in a single left-to-right pass,
+    with no backtracking, regardless of how many patterns there are.
+    Matching is case-insensitive.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = [p.lower() for p in patterns]
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pid)
+
+        # Breadth-first failure links; outputs are merged so each state reports every suffix match.
+        # Depth-1 states fail to the root, which is the default.
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yields (start, pattern_id) for every occurrence in text."""
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        state = 0
+        # Lower-cased per character so offsets stay aligned with the original text.
+        for i, ch in enumerate(text):
+            ch = ch.lower()
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for pid in out[state]:
+                    yield i - len(patterns[pid]) + 1, pid
+
+class PatternGroup:
+    """
+    A rubric criterion's patterns. The group is satisfied (and stops collecting) once
+    `required` distinct patterns have matched; required=None means scan the whole document.
+    Path groups expand each '.py' hit backwards into the full path token.
+    """
+
+    def __init__(self, name: str, patterns: List[str], required: Optional[int] = None, path_tokens: bool = False):
+        self.name = name
+        self.patterns = patterns
+        self.required = required
+        self.path_tokens = path_tokens
+
+class ScanResult:
+    def __init__(self, groups: List[PatternGroup]):
+        self.hits: Dict[str, List[Dict[str, Any]]] = {g.name: [] for g in groups}
+        self.distinct: Dict[str, set] = {g.name: set() for g in groups}
+        self.pages_scanned = 0
+        self.stopped_early = False
+
+    def matched(self, group: str) -> List[str]:
+        """Distinct matched patterns (or path tokens) in first-seen order."""
+        seen, ordered = set(), []
+        for hit in self.hits[group]:
+            if hit["match"] not in seen:
+                seen.add(hit["match"])
+                ordered.append(hit["match"])
+        return ordered
+
+def _sentence_bounds(text: str, start: int, end: int):
+    """The period-delimited sentence around [start, end) using C-level find, not a regex."""
+    left = text.rfind(".", 0, start) + 1
+    right = text.find(".", end)
+    return left, (len(text) if right == -1 else right + 1)
+
+def scan_pages(pages: Iterable[str], groups: List[PatternGroup]) -> ScanResult:
+    """
+    Streams pages through one automaton covering every group.
+    Only the current page is held in memory; scanning stops as soon as every group is satisfied.
+    """
+    patterns, owners = [], []
+    for g in groups:
+        for p in g.patterns:
+            patterns.append(p)
+            owners.append(g)
+    automaton = AhoCorasick(patterns)
+    result = ScanResult(groups)
+    open_groups = {g.name for g in groups}
+
+    for page_no, text in enumerate(pages, start=1):
+        result.pages_scanned = page_no
+        for start, pid in automaton.iter_matches(text):
+            group = owners[pid]
+            if group.name not in open_groups:
+                continue
+            end = start + len(patterns[pid])
+            if group.path_tokens:
+                token_start = start
+                while token_start and text[token_start - 1] in PATH_CHARS:
+                    token_start -= 1
+                if token_start == start:
+                    continue  # a bare '.py' is not a path
+                match, start = text[token_start:end], token_start
+            else:
+                match = patterns[pid]  # the rubric's spelling, not the page's casing
+            left, right = _sentence_bounds(text, start, end)
+            result.hits[group.name].append({
+                "match": match,
+                "page": page_no,
+                "offset": start,
+                "sentence": [left, right],
+                "text": text[left:right].strip()[:300],
+            })
+            result.distinct[group.name].add(match)
+            if group.required and len(result.distinct[group.name]) >= group.required:
+                open_groups.discard(group.name)
+        if not open_groups:
+            result.stopped_early = True
+            break
+    return result
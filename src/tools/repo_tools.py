@@ -1,26 +1,24 @@
 import os
-import ast
 import subprocess
 import tempfile
 from typing import List, Optional, Dict, Any
 from langchain_core.tools import tool
+from src.infrastructure.clone_cache import mirror_cache, CloneError
+from src.tools.ast_index import parse_python_source
 
 @tool
 def clone_repo_sandboxed(repo_url: str) -> str:
     """
     Protocol A: Secure Environment Isolation.
     Clones the target repo into a temporary directory to prevent local pollution.
-    Removes --depth 1 to capture the full 'Progression Story' for Protocol C.
+    Goes through the shared mirror cache, so the full 'Progression Story' for Protocol C
+    is kept while repeat audits only fetch new commits.
     """
     temp_dir = tempfile.mkdtemp()
     try:
-        # MANDATORY: Full clone for Forensic History (Score 5)
-        subprocess.run(
-            ["git", "clone", repo_url, temp_dir], 
-            check=True, capture_output=True, text=True
-        )
+        mirror_cache.checkout(repo_url, temp_dir)
         return temp_dir
-    except subprocess.CalledProcessError as e:
+    except CloneError as e:
         return f"Forensic Failure: Git Clone Error: {e.stderr}"
 
 @tool
@@ -34,31 +32,20 @@ def analyze_code_structure(file_path: str) -> Dict[str, Any]:
         return {"error": f"File {file_path} not found."}
     
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            tree = ast.parse(f.read())
-            
+        with open(file_path, "rb") as f:
+            table = parse_python_source(f.read(), file_path)
+        if table["error"]:
+            return {"error": f"AST Parsing failed: {table['error']}"}
+
         findings = {
-            "pydantic_models": [],
-            "has_annotated": False,
-            "reducers_found": [],
-            "state_rigor_score": 1
-        }
-        
-        for node in ast.walk(tree):
             # 1. Check for Pydantic BaseModel (Protocol B.2)
-            if isinstance(node, ast.ClassDef):
-                for base in node.bases:
-                    if isinstance(base, ast.Name) and base.id == 'BaseModel':
-                        findings["pydantic_models"].append(node.name)
-            
+            "pydantic_models": [cls["name"] for cls in table["classes"]
+                                if any(base.split(".")[-1] == "BaseModel" for base in cls["bases"])],
             # 2. Deep Reducer Check (The 'Smoking Gun' for Score 5)
-            if isinstance(node, ast.Name) and node.id == "Annotated":
-                findings["has_annotated"] = True
-            
-            # Specifically hunt for operator.add or operator.ior in the code
-            if isinstance(node, ast.Attribute):
-                if node.attr in ["add", "ior"] and isinstance(node.value, ast.Name) and node.value.id == "operator":
-                    findings["reducers_found"].append(f"operator.{node.attr}")
+            "has_annotated": bool(table["annotated_reducers"]),
+            "reducers_found": table["operator_reducers"],
+            "state_rigor_score": 1
+        }
 
         # Deterministic Internal Scoring
         if findings["pydantic_models"] and findings["reducers_found"]:
@@ -77,16 +64,19 @@ def get_detailed_git_log(repo_path: str) -> List[Dict[str, str]]:
     Captures Hash, ISO Timestamp, and Message to prove Engineering Velocity.
     """
     try:
-        # We use %ai for ISO 8601 strict timestamping
-        result = subprocess.run(
-            ["git", "-C", repo_path, "log", "--pretty=format:%h|%ai|%s", "--reverse"],
-            capture_output=True, text=True, check=True
+        # We use %ai for ISO 8601 strict timestamping; unit separators survive '|' in messages
+        proc = subprocess.Popen(
+            ["git", "-C", repo_path, "log", "--pretty=format:%h%x1f%ai%x1f%s", "--reverse"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace"
         )
         log_entries = []
-        for line in result.stdout.strip().split("\n"):
-            if "|" in line:
-                h, ts, msg = line.split("|")
+        for line in proc.stdout:
+            fields = line.rstrip("\n").split("\x1f", 2)
+            if len(fields) == 3:
+                h, ts, msg = fields
                 log_entries.append({"hash": h, "timestamp": ts, "message": msg})
+        if proc.wait() != 0:
+            raise RuntimeError(proc.stderr.read().strip())
         return log_entries
     except Exception as e:
-        return [{"error": f"Forensic History Unavailable: {str(e)}"}]
\ No newline at end of file
+        return [{"error": f"Forensic History Unavailable: {str(e)}"}]
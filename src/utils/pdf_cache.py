@@ -0,0 +1,192 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+# Bump when the entry layout or extraction rules change so stale entries are ignored.
+PDF_CACHE_VERSION = "v2"
+TEXT_FILE = "pages.txt"
+INDEX_FILE = "index.json"
+# pypdf is what semantic_pdf_ingestion always used; the doc analyst has always read pages
+# through PyMuPDF. Each reader keeps its own extractor, so cached text is byte-for-byte
+# what it extracted before the cache existed.
+PYPDF = "pypdf"
+PYMUPDF = "pymupdf"
+EXTRACTORS = (PYPDF, PYMUPDF)
+
+def file_sha256(path: Optional[str]) -> Optional[str]:
+    """Content digest of a file (the PDF cache key and the ledger's pdf_sha); None when there is no file."""
+    if not path or not os.path.isfile(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _extract_pages(pdf_path: str, extractor: str = PYPDF) -> Iterator[Dict[str, Any]]:
+    """One page at a time with the named extractor."""
+    if extractor == PYMUPDF:
+        import fitz
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                yield {"text": page.get_text(), "images": len(page.get_images())}
+        return
+
+    from pypdf import PdfReader
+    for page in PdfReader(pdf_path).pages:
+        try:
+            images = len(page.images)
+        except Exception:
+            images = 0
+        yield {"text": page.extract_text() or "", "images": images}
+
+class CachedPdf:
+    """
+    Read-only view of one cached extraction.
+    Page text lives in a single UTF-8 file addressed by byte offsets and is memory-mapped,
+    so a page is only decoded when asked for.
+    """
+
+    def __init__(self, entry: Path):
+        with open(entry / INDEX_FILE, "r", encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.sha = self.index["sha256"]
+        self._file = open(entry / TEXT_FILE, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    @property
+    def page_count(self) -> int:
+        return len(self.index["pages"])
+
+    @property
+    def extractor(self) -> str:
+        return self.index["extractor"]
+
+    def page_text(self, page_no: int) -> str:
+        """Text of a 1-based page."""
+        page = self.index["pages"][page_no - 1]
+        return self._map[page["start"]:page["end"]].decode("utf-8", "surrogatepass")
+
+    def page_images(self, page_no: int) -> int:
+        return self.index["pages"][page_no - 1]["images"]
+
+    def iter_pages(self) -> Iterator[str]:
+        for page_no in range(1, self.page_count + 1):
+            yield self.page_text(page_no)
+
+    def image_count(self) -> int:
+        return sum(page["images"] for page in self.index["pages"])
+
+class PdfTextCache:
+    """
+    Design documents are extracted once per content hash and replayed on every later audit.
+    Entries are evicted least-recently-used once the cache exceeds its disk budget.
+    """
+
+    def __init__(self, root: Optional[str] = None, budget_mb: Optional[int] = None):
+        base = root or os.getenv("FORENSIC_PDF_CACHE_DIR", Path.home() / ".cache" / "forensic-swarm" / "pdf")
+        self.root = Path(base).expanduser() / PDF_CACHE_VERSION
+        self.budget_bytes = int(budget_mb if budget_mb is not None else os.getenv("FORENSIC_PDF_CACHE_BUDGET_MB", "256")) * 1024 * 1024
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entry(self, sha: str, extractor: str) -> Path:
+        return self.root / f"{sha}.{extractor}"
+
+    def open(self, pdf_path: str, sha: Optional[str] = None, extractor: str = PYPDF) -> CachedPdf:
+        """Returns the cached extraction of pdf_path, extracting it first on a miss."""
+        if extractor not in EXTRACTORS:
+            raise ValueError(f"Unknown PDF extractor '{extractor}' (expected one of {', '.join(EXTRACTORS)})")
+        sha = sha or file_sha256(pdf_path)
+        if sha is None:
+            raise FileNotFoundError(f"PDF not found: {pdf_path}")
+        entry = self._entry(sha, extractor)
+        if (entry / INDEX_FILE).exists():
+            with self._lock:
+                self.hits += 1
+            os.utime(entry / INDEX_FILE)
+            return CachedPdf(entry)
+
+        with self._lock:
+            self.misses += 1
+        self._extract(pdf_path, sha, entry, extractor)
+        self.evict(keep=entry)
+        return CachedPdf(entry)
+
+    def _extract(self, pdf_path: str, sha: str, entry: Path, extractor: str):
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = entry.with_name(f"{entry.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        try:
+            pages, offset = [], 0
+            with open(staging / TEXT_FILE, "wb") as out:
+                for page in _extract_pages(pdf_path, extractor):
+                    data = page["text"].encode("utf-8", "surrogatepass")
+                    out.write(data)
+                    pages.append({"start": offset, "end": offset + len(data), "images": page["images"]})
+                    offset += len(data)
+            with open(staging / INDEX_FILE, "w", encoding="utf-8") as f:
+                json.dump({"sha256": sha, "extractor": extractor, "pages": pages, "created": time.time()}, f)
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                pass  # another worker published the same content first
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        print(f"📄 PDF Cache: extracted {len(pages)} pages ({extractor}) for {sha[:12]}")
+
+    def evict(self, keep: Optional[Path] = None):
+        """Drops least-recently-used entries until the cache fits in its disk budget."""
+        if not self.root.exists():
+            return
+        entries = []
+        for entry in self.root.iterdir():
+            index = entry / INDEX_FILE
+            if entry.is_dir() and index.exists():
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                entries.append((index.stat().st_mtime, size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.budget_bytes:
+                break
+            if entry == keep:
+                continue
+            # Readers keep their mmap valid on POSIX even after the files are unlinked.
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+# Global instance shared by the doc analyst and the PDF chunker
+pdf_cache = PdfTextCache()
@@ -1,28 +1,90 @@
-from pypdf import PdfReader
+from typing import Any, Dict, Iterator, List, Tuple
+from src.utils.pdf_cache import CachedPdf, pdf_cache
+
+SECTION_BREAK = "\n\n"
+
+def _iter_sections(pdf: CachedPdf) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yields (section, first_page, last_page) exactly as splitting the '\\n'-joined pages on
+    blank lines would, but one page at a time. A section spanning pages is kept as parts.
+    """
+    parts: List[str] = []
+    first_page = 1
+    ends_with_newline = False
+    for page_no in range(1, pdf.page_count + 1):
+        text = pdf.page_text(page_no) + "\n"
+        start = 0
+        # A blank line can straddle the page boundary.
+        if ends_with_newline and text.startswith("\n"):
+            parts[-1] = parts[-1][:-1]
+            yield "".join(parts), first_page, page_no - 1
+            parts, first_page, start = [], page_no, 1
+        pos = text.find(SECTION_BREAK, start)
+        while pos != -1:
+            parts.append(text[start:pos])
+            yield "".join(parts), first_page, page_no
+            parts, first_page, start = [], page_no, pos + len(SECTION_BREAK)
+            pos = text.find(SECTION_BREAK, start)
+        remainder = text[start:]
+        if remainder:
+            if not parts:
+                first_page = page_no
+            parts.append(remainder)
+        ends_with_newline = remainder.endswith("\n")
+    if parts:
+        yield "".join(parts), first_page, pdf.page_count
+
+def iter_pdf_chunks(pdf_path: str, chunk_size: int = 1500, overlap: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    📄 Streaming PDF Ingestion
+    Yields each chunk as soon as it is complete, reading pages lazily from the PDF cache.
+    Sections (blank-line separated paragraphs) are packed up to chunk_size characters;
+    with overlap > 0, trailing sections of up to that many characters are repeated at the
+    start of the next chunk. Every chunk carries the pages it was drawn from.
+    """
+    sections: List[Tuple[str, int, int]] = []
+    length = 0  # len("\n\n".join(sections))
+    index = 0
+
+    def emit():
+        text = SECTION_BREAK.join(s for s, _, _ in sections).strip()
+        return {
+            "index": index,
+            "text": text,
+            "page_start": sections[0][1],
+            "page_end": sections[-1][2],
+            "char_count": len(text),
+        }
+
+    with pdf_cache.open(pdf_path) as pdf:
+        for section in _iter_sections(pdf):
+            added = len(section[0]) + (len(SECTION_BREAK) if sections else 0)
+            if sections and length + added >= chunk_size:
+                chunk = emit()
+                if chunk["text"]:
+                    yield chunk
+                    index += 1
+                # Carry the tail forward as the overlap window.
+                carried, carried_len = [], 0
+                for prior in reversed(sections if overlap > 0 else []):
+                    cost = len(prior[0]) + (len(SECTION_BREAK) if carried else 0)
+                    if carried_len + cost > overlap:
+                        break
+                    carried.insert(0, prior)
+                    carried_len += cost
+                sections, length = carried, carried_len
+                added = len(section[0]) + (len(SECTION_BREAK) if sections else 0)
+            sections.append(section)
+            length += added
+
+        if sections:
+            chunk = emit()
+            if chunk["text"]:
+                yield chunk
 
 def semantic_pdf_ingestion(pdf_path: str, chunk_size: int = 1500):
     """
     📄 Intelligent PDF Ingestion
     Chinks the rubric by logical sections to maintain criteria context.
     """
-    reader = PdfReader(pdf_path)
-    full_text = ""
-    for page in reader.pages:
-        full_text += page.extract_text() + "\n"
-    
-    # Split by double newlines to preserve rubric paragraphs
-    raw_chunks = full_text.split("\n\n")
-    chunks = []
-    current_chunk = ""
-    
-    for section in raw_chunks:
-        if len(current_chunk) + len(section) < chunk_size:
-            current_chunk += section + "\n\n"
-        else:
-            chunks.append(current_chunk.strip())
-            current_chunk = section + "\n\n"
-    
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-        
-    return chunks
\ No newline at end of file
+    return [chunk["text"] for chunk in iter_pdf_chunks(pdf_path, chunk_size=chunk_size)]